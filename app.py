@@ -1,15 +1,55 @@
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from io import BytesIO
-from dotenv import load_dotenv
 import os
-import json
-from datetime import datetime, timedelta, timezone
-import urllib.parse
+from datetime import date, datetime, timedelta
+from typing import Callable
+from html import escape as html_escape
 import pydeck as pdk  # untuk peta interaktif pin GPS
 
+from mitratel.auth_scheme import siss_auth_memory
+from mitratel import config
+from mitratel.availability import (
+    day_date,
+    day_number,
+    daily_availability,
+    region_availability,
+    site_availability,
+)
+from mitratel.cache import CacheResult
+from mitratel.collect import (
+    DOWN_STATUSES,
+    collect_siss,
+    collect_tower,
+    default_siss_dates,
+    history_siss_range,
+    persist_result,
+    update_status_history,
+)
+from mitratel.compact import memory_report
+from mitratel.delta import FrameDelta, compute_delta, site_key_column
+from mitratel.exports import FORMATS, XLSX_MAX_ROWS, default_format, export_bytes
+from mitratel.history import history_store
+from mitratel.map_layers import (
+    CLUSTER_LAYER_COLUMNS,
+    CLUSTER_LEVELS,
+    DEFAULT_CLUSTER_ZOOM,
+    PIN_ICON_MAPPING,
+    build_pin_frame,
+    cluster_level,
+    pin_atlas_data_uri,
+    pins_in_cell,
+)
+from mitratel.metrics import metrics, span
+from mitratel.poller import BackgroundPoller
+from mitratel.resilience import HALF_OPEN, OPEN, upstream_breaker
+from mitratel.search import FacetQuery, dataset_index, search_frame
+from mitratel.siss import load_siss_df, load_siss_df_chunked, siss_range
+from mitratel.siss_chunks import timings_to_df
+from mitratel.snapshots import snapshot_store
+from mitratel.timeutil import WIB, epoch_to_wib, format_duration, now_wib
+from mitratel.tower import load_tower_df
+from mitratel.views import cached_view, dataset_version, page_slice, status_counts
+
 # ============================================================
 #  CONFIG & UTIL
 # ============================================================
@@ -20,34 +60,52 @@ st.set_page_config(
     page_icon="📡",
 )
 
-def now_wib() -> datetime:
-    """Waktu sekarang dalam zona WIB (UTC+7)."""
-    return datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(
-        timezone(timedelta(hours=7))
+def source_badge_html(kind: str) -> str:
+    """Keterangan kecil di banner: data dari snapshot lokal, cache, atau baru diambil."""
+    snapshot = st.session_state.get(f"snapshot_{kind}")
+    if snapshot is not None:
+        range_info = snapshot.meta.get("range")
+        extra = f", range {range_info}" if range_info else ""
+        return (
+            f"<br>📦 Ditampilkan dari snapshot lokal{extra}. "
+            "Klik refresh untuk data terbaru."
+        )
+    result = st.session_state.get(f"cache_{kind}")
+    if result is None:
+        return ""
+    if result.from_cache:
+        return f"<br>⚡ Disajikan dari cache (umur {int(result.age)} detik)."
+    return "<br>🌐 Data baru diambil langsung dari web."
+
+def poller_badge_html(kind: str) -> str:
+    """Keterangan status poller latar belakang untuk satu sumber data."""
+    poller = background_poller
+    if poller is None or not poller.running:
+        return ""
+    job = poller.status.get(kind)
+    if job is None or job.last_finished is None:
+        return f"<br>🔁 Poller otomatis aktif tiap {int(poller.interval)} detik (belum selesai jalan)."
+    last = epoch_to_wib(job.last_finished).strftime("%H:%M:%S")
+    error = f" — error terakhir: {html_escape(job.last_error)}" if job.last_error else ""
+    return (
+        f"<br>🔁 Poller otomatis aktif tiap {int(poller.interval)} detik, "
+        f"terakhir jalan {last} WIB{error}."
     )
 
-def format_duration(delta: timedelta) -> str:
-    """Format timedelta jadi string 'X jam Y menit Z detik'."""
-    total_seconds = int(delta.total_seconds())
-    hours, rem = divmod(total_seconds, 3600)
-    minutes, seconds = divmod(rem, 60)
-
-    parts = []
-    if hours:
-        parts.append(f"{hours} jam")
-    if minutes:
-        parts.append(f"{minutes} menit")
-    if seconds or not parts:
-        parts.append(f"{seconds} detik")
-
-    return " ".join(parts)
-
-# Load credential dari secrets atau .env
-load_dotenv()
-USERNAME_1 = os.getenv("LOGIN_USERNAME_1")
-PASSWORD_1 = os.getenv("LOGIN_PASSWORD_1")
-USERNAME = os.getenv("LOGIN_USERNAME")
-PASSWORD = os.getenv("LOGIN_PASSWORD")
+def breaker_badge_html(kind: str) -> str:
+    """Keterangan circuit breaker upstream: kosong kalau normal (closed)."""
+    state = upstream_breaker(kind).state()
+    if state.state == OPEN:
+        retry = epoch_to_wib(state.retry_at).strftime("%H:%M:%S")
+        error = f" Error terakhir: {html_escape(state.last_error)}" if state.last_error else ""
+        return (
+            f"<br>🚧 Upstream sedang gangguan ({state.failures}x gagal beruntun); "
+            f"request ditahan sampai {retry} WIB, data yang tampil dari pengambilan "
+            f"terakhir yang berhasil.{error}"
+        )
+    if state.state == HALF_OPEN:
+        return "<br>🚧 Upstream baru pulih dari gangguan, koneksi sedang dicoba ulang."
+    return ""
 
 # ============================================================
 #  THEME / WARNA MITRATEL (MERAH PUTIH)
@@ -60,9 +118,7 @@ LIGHT_BG = "#FFF5F5"      # Putih dengan sedikit merah muda
 BLUE_SKY = "#2B74C8"
 GREEN_NORMAL = "#4CAF50"
 
-# ICON PIN UNTUK MAP
-RED_PIN_URL = "https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/marker-icon-red.png"
-GREEN_PIN_URL = "https://raw.githubusercontent.com/pointhi/leaflet-color-markers/master/img/marker-icon-green.png"
+# ICON PIN UNTUK MAP: atlas lokal assets/map_pins.png (lihat mitratel.map_layers)
 
 # CSS global
 st.markdown(
@@ -172,6 +228,7 @@ st.write("")
 # default nilai range tanggal SISS
 siss_start_date = None
 siss_end_date = None
+siss_chunk_mode = config.SISS_CHUNK_MODE
 
 with st.sidebar:
 
@@ -208,9 +265,8 @@ with st.sidebar:
             key="filter_siss"
         )
 
-        # 3b. Range tanggal untuk SISS (dari – sampai)
-        today = now_wib().date()
-        default_start = today - timedelta(days=7)  # default 7 hari ke belakang
+        # 3b. Range tanggal untuk SISS (dari – sampai), default = window poller
+        default_start, today = default_siss_dates()
         siss_start_date = st.date_input(
             "Tanggal awal (WIB)", value=default_start, key="siss_start_date"
         )
@@ -218,6 +274,39 @@ with st.sidebar:
             "Tanggal akhir (WIB)", value=today, key="siss_end_date"
         )
 
+        # 3c. Mode pengambilan untuk range panjang
+        chunk_options = {"off": "Satu request", "day": "Per hari", "week": "Per minggu"}
+        siss_chunk_mode = st.selectbox(
+            "Mode pengambilan SISS",
+            list(chunk_options),
+            index=list(chunk_options).index(config.SISS_CHUNK_MODE)
+            if config.SISS_CHUNK_MODE in chunk_options
+            else 0,
+            format_func=chunk_options.get,
+            key="siss_chunk_mode",
+        )
+
+    # 3d. Cari site & filter region (pakai index yang dibangun sekali per refresh)
+    data_kind = "tower" if page == "Tower Online / Offline" else "siss"
+    df_current = st.session_state.get(f"df_{data_kind}")
+    region_options, searched = [], "nama site"
+    if df_current is not None:
+        current_index = dataset_index(df_current)
+        region_options = current_index.values(current_index.region_col)
+        searched = " / ".join(current_index.search_cols) or searched
+    search_text = st.text_input(
+        "🔎 Cari site", key=f"search_{data_kind}", placeholder=f"{searched} (awalan atau potongan)"
+    )
+    region_key = f"region_{data_kind}"
+    if region_key in st.session_state:
+        # Region yang sudah tidak ada di data terbaru dibuang dari pilihan
+        st.session_state[region_key] = [
+            r for r in st.session_state[region_key] if r in region_options
+        ]
+    region_filter = st.multiselect(
+        "Region", region_options, key=region_key, disabled=not region_options
+    )
+
     st.markdown("---")
 
     # 4. Penjelasan singkat
@@ -253,69 +342,141 @@ with st.sidebar:
 #  COMMON: DOWNLOAD EXCEL
 # ============================================================
 
-def download_excel(df: pd.DataFrame, filename: str, label: str, key: str):
-    buf = BytesIO()
-    df.to_excel(buf, index=False)
-    st.download_button(
-        label=label,
-        data=buf.getvalue(),
-        file_name=filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+def export_format_picker(n_rows: int, key: str) -> str:
+    """Pilihan format export; tabel yang sangat besar default ke CSV."""
+    options = list(FORMATS)
+    return st.radio(
+        "Format file:",
+        options,
+        index=options.index(default_format(n_rows)),
+        format_func=lambda f: FORMATS[f][0],
+        horizontal=True,
         key=key,
     )
 
-# ============================================================
-#  BAGIAN 1 — TOWER ONLINE / OFFLINE
-# ============================================================
 
-LOGIN_URL_REPORT = "https://maiviewmitratel.id/Auth/login"
-REPORT_URL_REPORT = "https://maiviewmitratel.id/get-report"
+def download_table(
+    data: pd.DataFrame | Callable[[], pd.DataFrame],
+    filename: str,
+    label: str,
+    key: str,
+    fmt: str = "xlsx",
+    n_rows: int | None = None,
+):
+    """
+    Tombol download. File baru dibuat saat tombol diklik (bukan di setiap
+    rerun) dan di-cache berdasarkan isi data + format.
+    `data` boleh berupa fungsi supaya query datanya pun ditunda; berikan
+    `n_rows` supaya batas baris Excel tetap bisa dicek sebelum diklik.
+    """
+    if n_rows is None and isinstance(data, pd.DataFrame):
+        n_rows = len(data)
+    if fmt == "xlsx" and n_rows is not None and n_rows > XLSX_MAX_ROWS:
+        st.caption(f"{n_rows:,} baris melebihi batas Excel, diexport sebagai CSV.")
+        fmt = "csv"
 
-def fetch_report_html() -> str:
-    if not USERNAME or not PASSWORD:
-        raise RuntimeError(
-            "USERNAME/PASSWORD tidak ditemukan (LOGIN_USERNAME / LOGIN_PASSWORD)."
-        )
+    def build() -> bytes:
+        df = data() if callable(data) else data
+        return export_bytes(df, fmt)
 
-    session = requests.Session()
-    login_data = {"username": USERNAME, "password": PASSWORD}
+    stem, _ = os.path.splitext(filename)
+    st.download_button(
+        label=label,
+        data=build,
+        file_name=f"{stem}.{fmt}",
+        mime=FORMATS[fmt][1],
+        key=key,
+    )
 
-    login_response = session.post(LOGIN_URL_REPORT, data=login_data)
-    if login_response.status_code != 200 or "login" in login_response.url.lower():
-        raise RuntimeError("Login gagal ke server report tower.")
+# ============================================================
+#  COMMON: SNAPSHOT LOKAL
+# ============================================================
 
-    report_response = session.get(REPORT_URL_REPORT)
-    if report_response.status_code != 200:
-        raise RuntimeError("Gagal mengambil halaman report tower.")
+def sync_from_snapshot(kind: str, range_str: str | None = None) -> pd.DataFrame | None:
+    """
+    Pakai snapshot terbaru kalau lebih baru dari data sesi ini (mis. hasil
+    poller latar belakang). Kalau sesi sudah punya data dan `range_str`
+    diberikan, snapshot hanya dipakai bila range-nya sama.
+    Kembalikan DataFrame yang baru dipasang, atau None.
+    """
+    info = snapshot_store.latest(kind)
+    if info is None:
+        return None
+    current_ts = st.session_state.get(f"data_ts_{kind}")
+    if current_ts is not None and info.taken_at <= current_ts:
+        return None
+    try:
+        df = snapshot_store.load(info)
+    except (OSError, ValueError):
+        return None
+    if (
+        f"df_{kind}" in st.session_state
+        and range_str is not None
+        and info.meta.get("range") != range_str
+    ):
+        return None
 
-    return report_response.text
+    set_dataset(kind, df)
+    st.session_state[f"last_update_{kind}"] = epoch_to_wib(info.taken_at)
+    st.session_state[f"data_ts_{kind}"] = info.taken_at
+    st.session_state[f"snapshot_{kind}"] = info
+    return df
 
 
-def parse_report_to_df(html: str) -> pd.DataFrame:
-    soup = BeautifulSoup(html, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
-        raise RuntimeError("Tidak ada tabel di halaman report tower.")
+def set_dataset(kind: str, df: pd.DataFrame) -> FrameDelta | None:
+    """
+    Pasang dataset baru ke sesi dan hitung delta terhadap dataset sebelumnya
+    (site baru / hilang / status berubah). Delta disimpan di
+    `delta_{kind}` beserta versi dataset dasarnya di `delta_base_{kind}`.
+    """
+    prev = st.session_state.get(f"df_{kind}")
+    st.session_state[f"df_{kind}"] = df
+    if prev is df:
+        return st.session_state.get(f"delta_{kind}")
+
+    delta = None
+    key = site_key_column(df)
+    if prev is not None and key is not None and key in prev.columns:
+        base_version = dataset_version(prev)
+        delta = cached_view(
+            df, "delta", base_version, lambda: compute_delta(prev, df, key)
+        )
+        st.session_state[f"delta_base_{kind}"] = base_version
+    else:
+        st.session_state.pop(f"delta_base_{kind}", None)
+    st.session_state[f"delta_{kind}"] = delta
+    return delta
 
-    table = tables[0]
-    thead = table.find("thead")
-    tbody = table.find("tbody")
 
-    if thead is None or tbody is None:
-        raise RuntimeError("thead/tbody tidak ditemukan pada tabel tower.")
+def show_refresh_failure(kind: str, error: Exception, range_str: str | None = None):
+    """
+    Refresh gagal (timeout, upstream error, breaker open): pakai snapshot
+    terakhir kalau ada, lalu beri peringatan alih-alih halaman kosong.
+    """
+    sync_from_snapshot(kind, range_str)
+    last_update = st.session_state.get(f"last_update_{kind}")
+    if f"df_{kind}" not in st.session_state or last_update is None:
+        st.error(f"Terjadi kesalahan: {error}")
+        return
+    st.warning(
+        f"Refresh gagal: {error}\n\nMenampilkan data terakhir yang berhasil diambil "
+        f"({last_update.strftime('%Y-%m-%d %H:%M:%S')} WIB)."
+    )
 
-    headers = [th.text.strip() for th in thead.find_all("th")]
-    rows = [
-        [td.text.strip() for td in tr.find_all("td")]
-        for tr in tbody.find_all("tr")
-    ]
 
-    df = pd.DataFrame(rows, columns=headers)
-    if "#" in df.columns:
-        df = df.drop(columns=["#"])
+def save_snapshot(kind: str, result: CacheResult, meta: dict | None = None):
+    st.session_state.pop(f"snapshot_{kind}", None)
+    st.session_state[f"data_ts_{kind}"] = result.fetched_at
+    try:
+        persist_result(kind, result, meta)
+    except Exception as e:
+        st.warning(f"Snapshot lokal gagal disimpan: {e}")
 
-    return df
+# ============================================================
+#  BAGIAN 1 — TOWER ONLINE / OFFLINE
+# ============================================================
 
+# Login, fetch & parse report tower ada di mitratel/tower.py (tanpa Streamlit)
 
 def filter_by_status_tower(df: pd.DataFrame, status: str | None) -> pd.DataFrame:
     if status is None or "Status" not in df.columns:
@@ -342,236 +503,29 @@ def tower_sidebar_filters() -> str | None:
 #  BAGIAN 2 — SISS SITE STATUS
 # ============================================================
 
-LOGIN_URL_SISS = "https://siss-service.smartsol.id/Auth/login"
-REPORT_URL_SISS_BASE = (
-    "https://siss-service.smartsol.id/"
-    "v1/panels/59b7e0f9-2f83-45cb-bde4-a6f4d890022c/panelData"
-)
-
-def build_siss_url(start_dt: datetime, end_dt: datetime) -> str:
-    """Bangun URL SISS dengan range waktu (WIB) yang diinginkan."""
-    # Pastikan sudah ada timezone
-    if start_dt.tzinfo is None:
-        start_dt = start_dt.replace(tzinfo=timezone(timedelta(hours=7)))
-    if end_dt.tzinfo is None:
-        end_dt = end_dt.replace(tzinfo=timezone(timedelta(hours=7)))
-
-    def to_ms(dt: datetime) -> int:
-        # timestamp dalam milidetik
-        return int(dt.timestamp() * 1000)
-
-    payload = {
-        "beginTs": to_ms(start_dt),
-        "endTs": to_ms(end_dt),
-    }
-    encoded = urllib.parse.quote(json.dumps(payload))
-    return f"{REPORT_URL_SISS_BASE}?&requestOnDemand={encoded}"
-
-def extract_auth_token(login_response) -> str | None:
-    """Cari field yang mengandung kata 'token' di JSON hasil login."""
-    try:
-        data = login_response.json()
-    except Exception:
-        return None
-
-    if not isinstance(data, (dict, list)):
-        return None
-
-    stack = [data]
-    while stack:
-        cur = stack.pop()
-        if isinstance(cur, dict):
-            for k, v in cur.items():
-                if isinstance(v, (dict, list)):
-                    stack.append(v)
-                elif isinstance(v, str) and "token" in k.lower():
-                    return v
-        elif isinstance(cur, list):
-            for v in cur:
-                if isinstance(v, (dict, list)):
-                    stack.append(v)
-    return None
-
-
-def fetch_siss_raw(start_dt: datetime, end_dt: datetime) -> str:
-    if not USERNAME_1 or not PASSWORD_1:
-        raise RuntimeError(
-            "USERNAME_1/PASSWORD_1 tidak ditemukan (LOGIN_USERNAME_1 / LOGIN_PASSWORD_1)."
-        )
-
-    # Bangun URL dengan range waktu
-    report_url = build_siss_url(start_dt, end_dt)
-
-    session = requests.Session()
-
-    common_headers = {
-        "Accept": "application/json, text/plain, */*",
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Origin": "https://mitratel-siss.smartsol.id",
-        "Referer": "https://mitratel-siss.smartsol.id/",
-    }
-
-    # LOGIN
-    login_data = {"username": USERNAME_1, "password": PASSWORD_1}
-    login_headers = {**common_headers, "Content-Type": "application/json"}
-
-    login_response = session.post(
-        LOGIN_URL_SISS,
-        json=login_data,
-        headers=login_headers,
-    )
-    if login_response.status_code != 200:
-        raise RuntimeError(
-            f"Login gagal ke SISS (status {login_response.status_code})."
-        )
-
-    auth_token = extract_auth_token(login_response)
-
-    base_report_headers = {**common_headers, "Accept": "application/json"}
-
-    attempts = []
-    if auth_token:
-        bearer = auth_token if auth_token.lower().startswith("bearer ") else f"Bearer {auth_token}"
-        attempts.append({"Authorization": bearer})
-        attempts.append({"Authorization": auth_token})
-    attempts.append({})  # fallback tanpa Authorization
-
-    last_status = None
-    last_text = None
-    for extra in attempts:
-        headers = {**base_report_headers, **extra}
-        resp = session.get(report_url, headers=headers)
-        last_status = resp.status_code
-        last_text = resp.text
-        if resp.status_code == 200:
-            return resp.text
-
-    snippet = (last_text or "")[:200]
-    raise RuntimeError(
-        f"Gagal mengambil data SISS (status {last_status}). "
-        f"Cuplikan response: {snippet}"
-    )
-
-
-def parse_siss_to_df(raw_text: str) -> pd.DataFrame:
-    try:
-        data = json.loads(raw_text)
-    except json.JSONDecodeError:
-        raise RuntimeError("Respon SISS bukan JSON valid.")
-
-    if not isinstance(data, dict) or "responseDataValue" not in data:
-        raise RuntimeError("Field 'responseDataValue' tidak ditemukan di JSON SISS.")
-
-    items = data["responseDataValue"]
-    if not isinstance(items, list):
-        raise RuntimeError("'responseDataValue' bukan list.")
-
-    df = pd.DataFrame(items)
-
-    rename_map = {}
-    if "name" in df.columns:
-        rename_map["name"] = "Site Name"
-    if "region" in df.columns:
-        rename_map["region"] = "Region"
-    if "status" in df.columns:
-        rename_map["status"] = "Status"
-    df = df.rename(columns=rename_map)
-
-    # Filter hanya NORMAL & NOT INSTALLED dari sistem,
-    # lalu tampilkan NOT INSTALLED sebagai CRITICAL di dashboard
-        # Filter status yang relevan dari sistem,
-    # dan satukan NOT INSTALLED / CRITICAL jadi "CRITICAL" di dashboard
-    if "Status" in df.columns:
-        valid_status = ["NORMAL", "NOT INSTALLED", "CRITICAL"]
-        df = df[df["Status"].isin(valid_status)].copy()
-        df["Status"] = df["Status"].replace(
-            {
-                "NOT INSTALLED": "CRITICAL",
-                "Critical": "CRITICAL",      # kalau ada variasi huruf besar/kecil
-                "critical": "CRITICAL",
-            }
-        )
-
-    cols = [
-        c
-        for c in ["Site Name", "Region", "Status", "longitude", "latitude", "tenantId"]
-        if c in df.columns
-    ]
-    if cols:
-        df = df[cols]
-
-    return df
-
+# Login, fetch & decode SISS ada di mitratel/siss.py (tanpa Streamlit)
 
 def filter_by_status_siss(df: pd.DataFrame, status: str | None) -> pd.DataFrame:
     if status is None or "Status" not in df.columns:
         return df
     return df[df["Status"] == status].copy()
 
-def update_siss_status_history(df_new: pd.DataFrame):
-    """
-    Merekam perubahan status per site:
-    - Simpan kapan status NORMAL/CRITICAL mulai
-    - Jika terjadi perubahan, hitung durasi status sebelumnya
-      dan simpan ke log riwayat.
-    """
-    if "Site Name" not in df_new.columns or "Status" not in df_new.columns:
-        return
-
-    now = now_wib()
-
-    # mapping status terbaru per site
-    new_map = {
-        row["Site Name"]: row["Status"]
-        for _, row in df_new.iterrows()
-        if pd.notna(row.get("Site Name")) and pd.notna(row.get("Status"))
-    }
-
-    # state sebelumnya di session
-    prev_state = st.session_state.get("siss_status_state", {})
-    status_log = st.session_state.get("siss_status_log", [])
-
-    for site_name, new_status in new_map.items():
-        prev_info = prev_state.get(site_name)
-
-        if prev_info is None:
-            # pertama kali terlihat di sesi ini
-            prev_state[site_name] = {
-                "status": new_status,
-                "since": now,
-            }
-            continue
-
-        prev_status = prev_info["status"]
-        prev_since = prev_info["since"]
-
-        # Kalau status berubah -> catat periode lama
-        if prev_status != new_status:
-            duration = now - prev_since
-
-            log_entry = {
-                "Site Name": site_name,
-                "From Status": prev_status,
-                "To Status": new_status,
-                "Start Time (WIB)": prev_since.strftime("%Y-%m-%d %H:%M:%S"),
-                "End Time (WIB)": now.strftime("%Y-%m-%d %H:%M:%S"),
-                "Duration": format_duration(duration),
-            }
-            status_log.append(log_entry)
-
-            # update status baru dan waktu mulai status baru
-            prev_state[site_name] = {
-                "status": new_status,
-                "since": now,
-            }
-
-    # simpan kembali ke session_state
-    st.session_state["siss_status_state"] = prev_state
-    st.session_state["siss_status_log"] = status_log
+def fmt_ts(ts: float) -> str:
+    return epoch_to_wib(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_status_log(raw: pd.DataFrame, site_label: str = "Site Name") -> pd.DataFrame:
+    """Ubah log mentah dari history_store ke kolom tampilan (waktu WIB, durasi teks)."""
+    return pd.DataFrame(
+        {
+            site_label: raw["site"],
+            "From Status": raw["from_status"],
+            "To Status": raw["to_status"],
+            "Start Time (WIB)": raw["start_ts"].map(fmt_ts),
+            "End Time (WIB)": raw["end_ts"].map(fmt_ts),
+            "Duration": raw["duration_s"].map(lambda d: format_duration(timedelta(seconds=d))),
+        }
+    )
 
 # Fungsi lama (tidak dipakai lagi)
 def siss_sidebar_filters() -> str | None:
@@ -593,9 +547,309 @@ def siss_sidebar_filters() -> str | None:
 #  HALAMAN TOWER
 # ============================================================
 
-def page_tower(status_filter: str | None):
+TABLE_PAGE_SIZES = sorted({50, 100, 250, 500, config.TABLE_PAGE_SIZE})
+
+
+def show_table(df: pd.DataFrame, key: str, height: int = 350):
+    """
+    Tabel dipaginasi di server: sort & potong halaman dilakukan di pandas,
+    hanya baris halaman aktif yang diserialisasi ke browser.
+    """
+    if len(df) <= TABLE_PAGE_SIZES[0]:
+        st.dataframe(df, width="stretch", height=height)
+        return
+
+    sort_key = f"{key}_sort"
+    if st.session_state.get(sort_key) not in (None, *df.columns):
+        del st.session_state[sort_key]
+
+    col_sort, col_dir, col_size, col_page = st.columns([3, 1, 1, 1])
+    with col_sort:
+        sort_by = st.selectbox(
+            "Urutkan berdasarkan",
+            [None, *df.columns],
+            format_func=lambda c: "(urutan asli)" if c is None else str(c),
+            key=sort_key,
+        )
+    with col_dir:
+        descending = st.toggle("Menurun", key=f"{key}_desc", disabled=sort_by is None)
+    with col_size:
+        page_size = st.selectbox(
+            "Baris/halaman",
+            TABLE_PAGE_SIZES,
+            index=TABLE_PAGE_SIZES.index(config.TABLE_PAGE_SIZE),
+            key=f"{key}_size",
+        )
+    total_pages = max(1, -(-len(df) // page_size))
+    page_key = f"{key}_page"
+    # Nilai awal lewat session state saja (tanpa value= di widget)
+    st.session_state.setdefault(page_key, 1)
+    if st.session_state[page_key] > total_pages:
+        # Data/filter berubah dan halaman lama sudah tidak ada
+        st.session_state[page_key] = total_pages
+    with col_page:
+        page_no = st.number_input(
+            f"Halaman (1–{total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            step=1,
+            key=page_key,
+        )
+
+    start = (int(page_no) - 1) * page_size
+    st.dataframe(
+        page_slice(df, int(page_no), page_size, sort_by, descending),
+        width="stretch",
+        height=height,
+    )
+    st.caption(f"Baris {start + 1:,}–{min(start + page_size, len(df)):,} dari {len(df):,}.")
+
+
+def search_caption(query: FacetQuery, n_rows: int, search_cols: list[str]) -> str:
+    parts = []
+    if query.text:
+        parts.append(f"{' / '.join(search_cols)} mengandung “{query.text}”")
+    if query.regions:
+        parts.append("region " + ", ".join(query.regions))
+    return f"{n_rows:,} baris cocok ({'; '.join(parts)})."
+
+
+def show_memory_report(df: pd.DataFrame, key: str):
+    """Laporan memori per kolom, dihitung hanya kalau diminta."""
+    if st.toggle("🧮 Tampilkan laporan memori data", key=key):
+        report = cached_view(df, "memory_report", None, lambda: memory_report(df))
+        total = report.iloc[-1]
+        st.caption(
+            f"Total {total['Sekarang (KB)']:,.1f} KB "
+            f"(sebagai object string: {total['Sebagai object (KB)']:,.1f} KB)."
+        )
+        st.dataframe(report, width="stretch")
+
+
+def show_delta_panel(kind: str, filename_prefix: str, timestamp: str, fmt: str):
+    """Ringkasan perubahan dataset sesi ini dibanding refresh sebelumnya."""
+    delta: FrameDelta | None = st.session_state.get(f"delta_{kind}")
+    if delta is None:
+        return
+
+    with st.expander("🔄 Perubahan sejak refresh sebelumnya", expanded=not delta.is_empty):
+        if delta.is_empty:
+            st.caption("Tidak ada site baru, hilang, atau berubah status.")
+            return
+
+        summary = delta.summary()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Site baru", f"{summary['added']:,}")
+        c2.metric("Site hilang", f"{summary['removed']:,}")
+        c3.metric("Status berubah", f"{summary['changed']:,}")
+
+        tab_changed, tab_added, tab_removed = st.tabs(["Status berubah", "Site baru", "Site hilang"])
+        with tab_changed:
+            st.dataframe(delta.changed, width="stretch", height=250)
+            if not delta.changed.empty:
+                download_table(
+                    delta.changed,
+                    f"{filename_prefix}_perubahan_{timestamp}.xlsx",
+                    "Download Perubahan Status",
+                    key=f"dl_delta_{kind}",
+                    fmt=fmt,
+                )
+        with tab_added:
+            st.dataframe(delta.added, width="stretch", height=250)
+        with tab_removed:
+            st.dataframe(delta.removed, width="stretch", height=250)
+
+
+def show_transition_log(source: str, site_label: str, timestamp: str, fmt: str,
+                        download_label: str):
+    """Log perubahan status dari history_store, dipaginasi di SQLite."""
+    total_log = history_store.count_transitions(source)
+    if not total_log:
+        st.info("Belum ada perubahan status yang terekam.")
+        return
+
+    col_size, col_page = st.columns(2)
+    with col_size:
+        page_size = st.selectbox(
+            "Baris per halaman", [25, 50, 100, 250], key=f"{source}_log_page_size"
+        )
+    total_pages = max(1, -(-total_log // page_size))
+    with col_page:
+        page_no = st.number_input(
+            f"Halaman (1–{total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            step=1,
+            key=f"{source}_log_page",
+        )
+    log_page = history_store.query_transitions(
+        source, limit=page_size, offset=(int(page_no) - 1) * page_size
+    )
+    st.dataframe(format_status_log(log_page, site_label), width="stretch", height=250)
+    st.caption(f"Total {total_log} perubahan tercatat (terbaru di atas).")
+
+    download_table(
+        lambda: format_status_log(history_store.query_transitions(source), site_label),
+        f"riwayat_status_{source}_{timestamp}.xlsx",
+        download_label,
+        key=f"dl_{source}_history",
+        fmt=fmt,
+        n_rows=total_log,
+    )
+
+
+def format_downtime(raw: pd.DataFrame, site_label: str) -> pd.DataFrame:
+    """Downtime per site: detik mentah dipertahankan di samping teks durasi."""
+    return pd.DataFrame(
+        {
+            site_label: raw["site"],
+            "Jumlah Gangguan": raw["outages"],
+            "Downtime (detik)": raw["downtime_s"].round(0),
+            "Downtime": raw["downtime_s"].map(lambda d: format_duration(timedelta(seconds=d))),
+            "Terlama": raw["longest_s"].map(lambda d: format_duration(timedelta(seconds=d))),
+            "Masih Down": raw["ongoing"].map({True: "Ya", False: "Tidak"}),
+        }
+    )
+
+
+def show_downtime_table(source: str, site_label: str, timestamp: str, fmt: str):
+    """Downtime kumulatif per site dalam rentang tanggal, dari interval di history_store."""
+    down = DOWN_STATUSES[source]
+    with st.expander(f"📉 Downtime per Site ({' / '.join(down)})"):
+        today = now_wib().date()
+        dates = st.date_input(
+            "Rentang tanggal (WIB)",
+            value=(today - timedelta(days=7), today),
+            max_value=today,
+            key=f"{source}_downtime_range",
+        )
+        if not isinstance(dates, (list, tuple)) or len(dates) != 2:
+            st.caption("Pilih tanggal awal dan akhir.")
+            return
+        start_ts = datetime.combine(dates[0], datetime.min.time(), tzinfo=WIB).timestamp()
+        end_ts = datetime.combine(
+            dates[1] + timedelta(days=1), datetime.min.time(), tzinfo=WIB
+        ).timestamp()
+
+        raw = history_store.downtime_by_site(source, down, start_ts, end_ts)
+        if raw.empty:
+            st.info("Tidak ada gangguan terekam pada rentang ini.")
+            return
+        table = format_downtime(raw, site_label)
+        st.caption(
+            f"{len(table):,} site mengalami gangguan, total "
+            f"{format_duration(timedelta(seconds=float(raw['downtime_s'].sum())))}."
+        )
+        show_table(table, key=f"tbl_{source}_downtime", height=300)
+        download_table(
+            table,
+            f"downtime_{source}_{dates[0]}_{dates[1]}.xlsx",
+            "Download Downtime per Site",
+            key=f"dl_{source}_downtime",
+            fmt=fmt,
+        )
+
+
+SLA_PERIODS = ["Bulan ini", "Bulan lalu", "7 hari terakhir", "30 hari terakhir"]
+
+
+def sla_period(choice: str) -> tuple[date, date]:
+    """Rentang tanggal WIB (inklusif) untuk pilihan periode SLA."""
+    today = now_wib().date()
+    if choice == "Bulan ini":
+        return today.replace(day=1), today
+    if choice == "Bulan lalu":
+        last = today.replace(day=1) - timedelta(days=1)
+        return last.replace(day=1), last
+    days = 7 if choice == "7 hari terakhir" else 30
+    return today - timedelta(days=days - 1), today
+
+
+def with_duration_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Tambahkan kolom teks durasi di samping detik numerik (up_s/down_s)."""
+    out = df.copy()
+    for col, label in (("up_s", "Up"), ("down_s", "Down")):
+        out[label] = out[col].map(lambda d: format_duration(timedelta(seconds=float(d))))
+    return out.rename(
+        columns={
+            "up_s": "Up (detik)",
+            "down_s": "Down (detik)",
+            "observed_s": "Terobservasi (detik)",
+            "availability_pct": "Availability (%)",
+        }
+    )
+
+
+def show_availability(source: str, df: pd.DataFrame, site_label: str, timestamp: str, fmt: str):
+    """Availability per site / region / hari dari bucket harian history_store."""
+    down = DOWN_STATUSES[source]
+    with st.expander("📊 Availability / SLA"):
+        choice = st.selectbox("Periode", SLA_PERIODS, key=f"{source}_sla_period")
+        start, end = sla_period(choice)
+        now = now_wib().timestamp()
+        start_day, end_day = day_number(start), day_number(end)
+
+        per_site = site_availability(history_store, source, down, start_day, end_day, now)
+        if per_site.empty:
+            st.info("Belum ada riwayat status untuk periode ini.")
+            return
+
+        overall = per_site["up_s"].sum() / max(per_site["observed_s"].sum(), 1) * 100
+        st.caption(
+            f"{start} s/d {end} (WIB) · {len(per_site):,} site · "
+            f"availability keseluruhan {overall:.3f}% (status down: {', '.join(down)})."
+        )
+
+        tab_site, tab_region, tab_day = st.tabs(["Per Site", "Per Region", "Per Hari"])
+        with tab_site:
+            table = with_duration_text(per_site).rename(columns={"site": site_label})
+            show_table(table, key=f"tbl_{source}_sla", height=300)
+            download_table(
+                table,
+                f"sla_{source}_{start}_{end}.xlsx",
+                "Download SLA per Site",
+                key=f"dl_{source}_sla",
+                fmt=fmt,
+            )
+        with tab_region:
+            region_col = next((c for c in df.columns if "region" in str(c).lower()), None)
+            if region_col is None or site_label not in df.columns:
+                st.info("Kolom region tidak ditemukan di data.")
+            else:
+                sites = df[[site_label, region_col]].drop_duplicates(subset=site_label, keep="last")
+                regions = pd.Series(
+                    sites[region_col].astype(str).to_numpy(),
+                    index=sites[site_label].astype(str).to_numpy(),
+                )
+                per_region = region_availability(per_site, regions)
+                st.dataframe(
+                    with_duration_text(per_region).rename(columns={"region": "Region", "sites": "Jumlah Site"}),
+                    width="stretch",
+                )
+        with tab_day:
+            per_day = daily_availability(history_store, source, down, start_day, end_day, now)
+            per_day["Tanggal"] = per_day["day"].map(day_date)
+            st.line_chart(per_day.set_index("Tanggal")["availability_pct"])
+            st.dataframe(
+                with_duration_text(per_day.drop(columns="day")).set_index("Tanggal"),
+                width="stretch",
+            )
+
+
+def page_tower(query: FacetQuery):
     st.markdown('<div class="section-title">📡 Tower Online / Offline</div>', unsafe_allow_html=True)
     st.caption("Data tower online/offline dari web report internal (otomatis login).")
+    status_filter = query.status
+
+    df_synced = sync_from_snapshot("tower")
+    if df_synced is not None:
+        update_status_history(
+            "tower",
+            df_synced,
+            st.session_state.get("delta_tower"),
+            st.session_state.get("delta_base_tower"),
+        )
 
     banner_container = st.container()
 
@@ -603,19 +857,27 @@ def page_tower(status_filter: str | None):
 
     if refresh_clicked:
         try:
-            with st.spinner("Sedang login & mengambil report tower..."):
-                html = fetch_report_html()
-                df_report = parse_report_to_df(html)
+            with span("refresh", source="tower"):
+                with st.spinner("Sedang login & mengambil report tower..."):
+                    result = load_tower_df()
 
-            st.session_state["df_tower"] = df_report
-            st.session_state["last_update_tower"] = now_wib()
+                delta = set_dataset("tower", result.value)
+                update_status_history(
+                    "tower", result.value, delta, st.session_state.get("delta_base_tower")
+                )
+                st.session_state["last_update_tower"] = epoch_to_wib(result.fetched_at)
+                st.session_state["cache_tower"] = result
+                save_snapshot("tower", result)
             st.success("Data tower berhasil diambil.")
         except Exception as e:
-            st.error(f"Terjadi kesalahan: {e}")
+            show_refresh_failure("tower", e)
 
     with banner_container:
         last_update = st.session_state.get("last_update_tower")
         info_waktu = last_update.strftime("%Y-%m-%d %H:%M:%S") if last_update else "-"
+        info_cache = (
+            source_badge_html("tower") + poller_badge_html("tower") + breaker_badge_html("tower")
+        )
         banner_html = f"""
 <div style="
     background: linear-gradient(90deg,{PRIMARY_RED},#FF6B6B);
@@ -647,7 +909,7 @@ def page_tower(status_filter: str | None):
       Status Tower Online / Offline
     </div>
     <div style="font-size: 13px;">
-      Update terakhir: {info_waktu} (WIB). Klik tombol <b>Refresh Tower</b> untuk mengambil data terbaru.
+      Update terakhir: {info_waktu} (WIB). Klik tombol <b>Refresh Tower</b> untuk mengambil data terbaru.{info_cache}
     </div>
   </div>
 </div>
@@ -656,7 +918,7 @@ def page_tower(status_filter: str | None):
 
     if "df_tower" in st.session_state:
         df = st.session_state["df_tower"]
-        df_filtered = filter_by_status_tower(df, status_filter)
+        df_filtered = search_frame(df, query)
 
         last_update = st.session_state.get("last_update_tower")
         timestamp = (
@@ -666,14 +928,16 @@ def page_tower(status_filter: str | None):
         )
 
         st.markdown("### 💾 Export / Download")
+        export_fmt = export_format_picker(len(df), key="fmt_tower")
         col1, col2 = st.columns(2)
 
         with col1:
-            download_excel(
+            download_table(
                 df,
                 f"tower_semua_{timestamp}.xlsx",
                 "Download Semua Data Tower",
                 key="dl_tower_all",
+                fmt=export_fmt,
             )
 
         if status_filter is None:
@@ -687,38 +951,60 @@ def page_tower(status_filter: str | None):
             export_filename = f"tower_online_{timestamp}.xlsx"
 
         with col2:
-            download_excel(
+            download_table(
                 df_filtered,
                 export_filename,
                 export_label,
                 key="dl_tower_filtered",
+                fmt=export_fmt,
             )
 
+        show_delta_panel("tower", "tower", timestamp, export_fmt)
+
         st.write("---")
 
         st.subheader("📄 Data Tower (Semua)")
-        st.dataframe(df, width="stretch", height=350)
-
-        if status_filter is None:
-            title = "Data Tower Offline & Online"
-        elif status_filter == "Offline":
-            title = "Data Tower OFFLINE"
-        else:
-            title = "Data Tower ONLINE"
-
-        st.subheader(f"🔍 {title}")
-        st.dataframe(df_filtered, width="stretch", height=350)
+        show_table(df, key="tbl_tower_all")
+
+        # Tanpa filter aktif hasilnya sama dengan tabel di atas: tidak dikirim dua kali
+        if df_filtered is not df:
+            if status_filter is None:
+                title = "Data Tower Offline & Online"
+            elif status_filter == "Offline":
+                title = "Data Tower OFFLINE"
+            else:
+                title = "Data Tower ONLINE"
+
+            st.subheader(f"🔍 {title}")
+            if query.text or query.regions:
+                st.caption(search_caption(query, len(df_filtered), dataset_index(df).search_cols))
+            show_table(df_filtered, key="tbl_tower_filtered")
 
         # Grafik jumlah tower per status
+        show_memory_report(df, key="mem_tower")
+
         st.subheader("📈 Grafik Jumlah Tower per Status")
         if "Status" in df.columns:
-            counts = df["Status"].value_counts().reset_index()
-            counts.columns = ["Status", "Jumlah Tower"]
+            counts, chart_data = cached_view(
+                df, "status_counts", "Jumlah Tower", lambda: status_counts(df, "Jumlah Tower")
+            )
             st.dataframe(counts, width="stretch")
-            st.bar_chart(counts.set_index("Status")["Jumlah Tower"])
+            st.bar_chart(chart_data)
         else:
             st.info("Kolom 'Status' tidak ditemukan, grafik tidak bisa dibuat.")
 
+        # =================================================
+        # RIWAYAT ONLINE ↔ OFFLINE + DOWNTIME
+        # =================================================
+        st.subheader("⏱️ Riwayat Perubahan Status (Online ↔ Offline)")
+        site_label = site_key_column(df) or "Site"
+        show_transition_log(
+            "tower", site_label, timestamp, export_fmt,
+            "Download Riwayat Status Online/Offline",
+        )
+        show_downtime_table("tower", site_label, timestamp, export_fmt)
+        show_availability("tower", df, site_label, timestamp, export_fmt)
+
     else:
         st.info("Belum ada data tower. Klik tombol **🔄 Refresh Tower dari Web** terlebih dahulu.")
 
@@ -726,25 +1012,155 @@ def page_tower(status_filter: str | None):
 #  HALAMAN SISS
 # ============================================================
 
-def page_siss(status_filter: str | None, start_date, end_date):
-    st.markdown('<div class="section-title">🛰️ SISS Site Status</div>', unsafe_allow_html=True)
-    st.caption("Data Site List dari SISS (status NORMAL & CRITICAL, dengan range tanggal yang dipilih).")
+def siss_map_data(df: pd.DataFrame, df_filtered: pd.DataFrame, query: FacetQuery) -> pd.DataFrame:
+    """
+    Frame pin peta. Dihitung sekali per versi dataset + filter, bukan
+    dihitung ulang di setiap rerun.
+    """
+    # Hanya kolom yang dipakai layer & tooltip yang dikirim ke browser
+    return cached_view(df, "siss_map", query, lambda: build_pin_frame(df_filtered))
 
-    # Pastikan ada tanggal (fallback ke hari ini kalau None)
-    if start_date is None or end_date is None:
-        today = now_wib().date()
-        start_date = today
-        end_date = today
 
-    # Kalau user kebalik (end < start), kita tukar
-    if end_date < start_date:
-        start_date, end_date = end_date, start_date
+def render_pin_map(df_map: pd.DataFrame, zoom: int = 6):
+    view_state = pdk.ViewState(
+        latitude=df_map["lat"].mean(),
+        longitude=df_map["lon"].mean(),
+        zoom=zoom,
+        pitch=0,
+    )
 
-    # Konversi ke datetime WIB untuk beginTs & endTs
-    start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone(timedelta(hours=7)))
-    end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=timezone(timedelta(hours=7)))
+    # Icon dari atlas lokal: merah untuk CRITICAL, hijau untuk NORMAL
+    icon_layer = pdk.Layer(
+        "IconLayer",
+        data=df_map,
+        icon_atlas=pin_atlas_data_uri(),
+        icon_mapping=PIN_ICON_MAPPING,
+        get_icon="Status",
+        get_position=["lon", "lat"],
+        get_size=35,
+        pickable=True,
+    )
 
-    range_str = f"{start_date.strftime('%Y-%m-%d')} s.d. {end_date.strftime('%Y-%m-%d')}"
+    # Tooltip simple: muncul saat hover/klik pin
+    tooltip = {
+        "html": "<b>Site:</b> {Site Name}<br><b>Status:</b> {Status}",
+        "style": {"color": "white"}
+    }
+
+    st.pydeck_chart(
+        pdk.Deck(
+            layers=[icon_layer],
+            initial_view_state=view_state,
+            tooltip=tooltip,
+        )
+    )
+
+
+def render_cluster_map(df: pd.DataFrame, query: FacetQuery, pins: pd.DataFrame):
+    """
+    Peta agregat grid; klik satu cluster untuk drill-down ke pin per site.
+    Hanya level zoom yang dipilih yang dihitung (di-cache per dataset +
+    filter + level) dan hanya CLUSTER_LAYER_COLUMNS yang dikirim ke browser.
+    """
+    zoom = st.select_slider(
+        "Level cluster (zoom)",
+        options=list(CLUSTER_LEVELS),
+        value=DEFAULT_CLUSTER_ZOOM,
+        format_func=lambda z: f"{z} (sel {CLUSTER_LEVELS[z]}°)",
+        key="siss_cluster_zoom",
+    )
+    cells = cached_view(df, "siss_cluster", (query, zoom), lambda: cluster_level(pins, zoom))
+
+    # Sel yang punya site CRITICAL digambar merah, sisanya hijau
+    layers = [
+        pdk.Layer(
+            "ScatterplotLayer",
+            id=layer_id,
+            data=part[CLUSTER_LAYER_COLUMNS],
+            get_position=["lon", "lat"],
+            get_radius="radius",
+            radius_units="pixels",
+            get_fill_color=color,
+            get_line_color=[255, 255, 255],
+            line_width_min_pixels=1,
+            stroked=True,
+            pickable=True,
+        )
+        for layer_id, part, color in [
+            ("clusters_normal", cells[cells["critical"] == 0], [76, 175, 80, 190]),
+            ("clusters_critical", cells[cells["critical"] > 0], [227, 6, 19, 190]),
+        ]
+    ]
+    tooltip = {
+        "html": "<b>{total} site</b><br>🔴 CRITICAL: {critical}",
+        "style": {"color": "white"},
+    }
+    event = st.pydeck_chart(
+        pdk.Deck(
+            layers=layers,
+            initial_view_state=pdk.ViewState(
+                latitude=pins["lat"].mean(),
+                longitude=pins["lon"].mean(),
+                zoom=zoom,
+                pitch=0,
+            ),
+            tooltip=tooltip,
+        ),
+        on_select="rerun",
+        selection_mode="single-object",
+        key="siss_cluster_map",
+    )
+
+    selected = [
+        obj
+        for layer_objs in (event.selection.get("objects") or {}).values()
+        for obj in layer_objs
+    ]
+    st.caption(f"{len(cells)} cluster dari {len(pins)} site pada level zoom {zoom}.")
+    if not selected:
+        st.caption("Klik sebuah cluster untuk melihat pin per site di area tersebut.")
+        return
+
+    # Browser hanya tahu posisi sel; cari indeks selnya di frame server
+    picked = cells[
+        ((cells["lon"] - float(selected[0]["lon"])).abs() < 1e-9)
+        & ((cells["lat"] - float(selected[0]["lat"])).abs() < 1e-9)
+    ]
+    if picked.empty:
+        # Pilihan dari level zoom sebelumnya
+        st.caption("Klik sebuah cluster untuk melihat pin per site di area tersebut.")
+        return
+    cell = picked.iloc[0]
+    sub = pins_in_cell(pins, CLUSTER_LEVELS[zoom], int(cell["ix"]), int(cell["iy"]))
+    st.markdown(
+        f"**Drill-down cluster:** {len(sub)} site "
+        f"(🔴 {int((sub['Status'] == 'CRITICAL').sum())} CRITICAL)"
+    )
+    if not sub.empty:
+        render_pin_map(sub, zoom=min(zoom + 3, 12))
+
+
+def page_siss(query: FacetQuery, start_date, end_date, chunk_mode: str = "off"):
+    st.markdown('<div class="section-title">🛰️ SISS Site Status</div>', unsafe_allow_html=True)
+    st.caption("Data Site List dari SISS (status NORMAL & CRITICAL, dengan range tanggal yang dipilih).")
+    status_filter = query.status
+
+    start_dt, end_dt, range_str = siss_range(start_date, end_date)
+
+    df_synced = sync_from_snapshot("siss", range_str)
+    if df_synced is not None:
+        update_status_history(
+            "siss",
+            df_synced,
+            st.session_state.get("delta_siss"),
+            st.session_state.get("delta_base_siss"),
+            st.session_state["snapshot_siss"].meta.get("range"),
+        )
+    if range_str != history_siss_range():
+        st.caption(
+            f"ℹ️ Riwayat status SISS hanya direkam dari range bawaan "
+            f"({history_siss_range()}); range ini tidak ikut direkam."
+        )
 
     banner_container = st.container()
 
@@ -752,22 +1168,36 @@ def page_siss(status_filter: str | None, start_date, end_date):
 
     if refresh_clicked:
         try:
-            with st.spinner("Sedang login & mengambil data SISS..."):
-                raw = fetch_siss_raw(start_dt, end_dt)
-                df_report = parse_siss_to_df(raw)
-
-            # 🔹 Update riwayat status (ON/OFF + durasi)
-            update_siss_status_history(df_report)
+            with span("refresh", source="siss"):
+                with st.spinner("Sedang login & mengambil data SISS..."):
+                    if chunk_mode == "off":
+                        result = load_siss_df(start_dt, end_dt)
+                        timings = []
+                    else:
+                        result, timings = load_siss_df_chunked(start_dt, end_dt, chunk_mode)
+                    df_report = result.value
+
+                delta = set_dataset("siss", df_report)
+
+                # 🔹 Update riwayat status (ON/OFF + durasi), cukup baris yang berubah
+                update_status_history(
+                    "siss", df_report, delta, st.session_state.get("delta_base_siss"), range_str
+                )
 
-            st.session_state["df_siss"] = df_report
-            st.session_state["last_update_siss"] = now_wib()
+                st.session_state["last_update_siss"] = epoch_to_wib(result.fetched_at)
+                st.session_state["cache_siss"] = result
+                st.session_state["siss_chunk_timings"] = timings
+                save_snapshot("siss", result, {"range": range_str})
             st.success("Data SISS berhasil diambil.")
         except Exception as e:
-            st.error(f"Terjadi kesalahan: {e}")
+            show_refresh_failure("siss", e, range_str)
 
     with banner_container:
         last_update = st.session_state.get("last_update_siss")
         info_waktu = last_update.strftime("%Y-%m-%d %H:%M:%S") if last_update else "-"
+        info_cache = (
+            source_badge_html("siss") + poller_badge_html("siss") + breaker_badge_html("siss")
+        )
         banner_html = f"""
 <div style="
     background: linear-gradient(90deg,{PRIMARY_RED},#FF8A65);
@@ -800,7 +1230,7 @@ def page_siss(status_filter: str | None, start_date, end_date):
     </div>
     <div style="font-size: 13px;">
       Range data: {range_str} (WIB).<br>
-      Update terakhir: {info_waktu} (WIB). Klik tombol <b>Refresh Data SISS</b> untuk mengambil data sesuai range di sidebar.
+      Update terakhir: {info_waktu} (WIB). Klik tombol <b>Refresh Data SISS</b> untuk mengambil data sesuai range di sidebar.{info_cache}
     </div>
   </div>
 </div>
@@ -809,60 +1239,28 @@ def page_siss(status_filter: str | None, start_date, end_date):
 
     if "df_siss" in st.session_state:
         df = st.session_state["df_siss"]
-        df_filtered = filter_by_status_siss(df, status_filter)
+        df_filtered = search_frame(df, query)
 
         # ==== PETA INTERAKTIF DENGAN PIN GPS (DI ATAS TABEL) ====
         st.subheader("🗺️ Peta Lokasi Site (Pin GPS – CRITICAL = MERAH)")
         if {"latitude", "longitude", "Status"}.issubset(df_filtered.columns):
-            df_map = df_filtered.dropna(subset=["latitude", "longitude"]).copy()
-            df_map["lat"] = df_map["latitude"].astype(float)
-            df_map["lon"] = df_map["longitude"].astype(float)
-
-            # Icon URL: merah untuk CRITICAL, hijau untuk NORMAL
-            df_map["icon_url"] = df_map["Status"].apply(
-                lambda x: RED_PIN_URL if x == "CRITICAL" else GREEN_PIN_URL
-            )
-
-            df_map["icon_data"] = df_map.apply(
-                lambda row: {
-                    "url": row["icon_url"],
-                    "width": 128,
-                    "height": 128,
-                    "anchorY": 128,
-                    "anchorX": 64,
-                },
-                axis=1,
-            )
-
-            view_state = pdk.ViewState(
-                latitude=df_map["lat"].mean(),
-                longitude=df_map["lon"].mean(),
-                zoom=6,
-                pitch=0,
-            )
-
-            icon_layer = pdk.Layer(
-                "IconLayer",
-                data=df_map,
-                get_icon="icon_data",
-                get_position=["lon", "lat"],
-                get_size=35,
-                pickable=True,
+            pins = siss_map_data(df, df_filtered, query)
+
+            map_modes = ["Pin per site", "Cluster (agregat)"]
+            map_mode = st.radio(
+                "Tampilan peta",
+                map_modes,
+                index=1 if len(pins) > config.MAP_CLUSTER_THRESHOLD else 0,
+                horizontal=True,
+                key="siss_map_mode",
             )
 
-            # Tooltip simple: muncul saat hover/klik pin
-            tooltip = {
-                "html": "<b>Site:</b> {Site Name}<br><b>Status:</b> {Status}",
-                "style": {"color": "white"}
-            }
-
-            st.pydeck_chart(
-                pdk.Deck(
-                    layers=[icon_layer],
-                    initial_view_state=view_state,
-                    tooltip=tooltip,
-                )
-            )
+            if pins.empty:
+                st.info("Tidak ada site dengan koordinat valid untuk ditampilkan.")
+            elif map_mode == map_modes[0]:
+                render_pin_map(pins)
+            else:
+                render_cluster_map(df, query, pins)
 
             st.markdown(
                 "🟢 <b>NORMAL</b> &nbsp;&nbsp; 🔴 <b>CRITICAL</b>",
@@ -883,14 +1281,16 @@ def page_siss(status_filter: str | None, start_date, end_date):
         )
 
         st.markdown("### 💾 Export / Download")
+        export_fmt = export_format_picker(len(df), key="fmt_siss")
         col1, col2 = st.columns(2)
 
         with col1:
-            download_excel(
+            download_table(
                 df,
                 f"siss_semua_{timestamp}.xlsx",
                 "Download Semua Data SISS",
                 key="dl_siss_all",
+                fmt=export_fmt,
             )
 
         if status_filter is None:
@@ -904,35 +1304,45 @@ def page_siss(status_filter: str | None, start_date, end_date):
             export_filename = f"siss_critical_{timestamp}.xlsx"
 
         with col2:
-            download_excel(
+            download_table(
                 df_filtered,
                 export_filename,
                 export_label,
                 key="dl_siss_filtered",
+                fmt=export_fmt,
             )
 
+        show_delta_panel("siss", "siss", timestamp, export_fmt)
+
         st.write("---")
 
         st.subheader("📄 Data Site SISS (NORMAL & CRITICAL)")
-        st.dataframe(df, width="stretch", height=350)
-
-        if status_filter is None:
-            title = "Semua Status (NORMAL + CRITICAL)"
-        elif status_filter == "NORMAL":
-            title = "Status NORMAL"
-        else:
-            title = "Status CRITICAL"
-
-        st.subheader(f"🔍 {title}")
-        st.dataframe(df_filtered, width="stretch", height=350)
+        show_table(df, key="tbl_siss_all")
+
+        # Tanpa filter aktif hasilnya sama dengan tabel di atas: tidak dikirim dua kali
+        if df_filtered is not df:
+            if status_filter is None:
+                title = "Semua Status (NORMAL + CRITICAL)"
+            elif status_filter == "NORMAL":
+                title = "Status NORMAL"
+            else:
+                title = "Status CRITICAL"
+
+            st.subheader(f"🔍 {title}")
+            if query.text or query.regions:
+                st.caption(search_caption(query, len(df_filtered), dataset_index(df).search_cols))
+            show_table(df_filtered, key="tbl_siss_filtered")
 
         # Grafik jumlah site per status
+        show_memory_report(df, key="mem_siss")
+
         st.subheader("📈 Grafik Jumlah Site per Status")
         if "Status" in df.columns:
-            counts = df["Status"].value_counts().reset_index()
-            counts.columns = ["Status", "Jumlah Site"]
+            counts, chart_data = cached_view(
+                df, "status_counts", "Jumlah Site", lambda: status_counts(df, "Jumlah Site")
+            )
             st.dataframe(counts, width="stretch")
-            st.bar_chart(counts.set_index("Status")["Jumlah Site"])
+            st.bar_chart(chart_data)
         else:
             st.info("Kolom 'Status' tidak ditemukan, grafik tidak bisa dibuat.")
 
@@ -941,23 +1351,50 @@ def page_siss(status_filter: str | None, start_date, end_date):
         # =================================================
         st.subheader("⏱️ Riwayat Perubahan Status (NORMAL ↔ CRITICAL)")
 
-        status_log = st.session_state.get("siss_status_log", [])
-
-        if status_log:
-            log_df = pd.DataFrame(status_log)
-            st.dataframe(log_df, width="stretch", height=250)
-
-            download_excel(
-                log_df,
-                f"riwayat_status_siss_{timestamp}.xlsx",
-                "Download Riwayat Status NORMAL/CRITICAL",
-                key="dl_siss_history",
+        show_transition_log(
+            "siss", "Site Name", timestamp, export_fmt,
+            "Download Riwayat Status NORMAL/CRITICAL",
+        )
+        show_downtime_table("siss", "Site Name", timestamp, export_fmt)
+        show_availability("siss", df, "Site Name", timestamp, export_fmt)
+
+        chunk_timings = st.session_state.get("siss_chunk_timings")
+        if chunk_timings:
+            with st.expander(f"🧩 Waktu per Potongan Range ({len(chunk_timings)} request)"):
+                st.dataframe(timings_to_df(chunk_timings), width="stretch")
+
+        with st.expander("🔐 Statistik Autentikasi SISS"):
+            auth_stats = siss_auth_memory.stats()
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Total GET panelData", auth_stats["requests_total"])
+            c2.metric("GET gagal (401/403/lainnya)", auth_stats["requests_failed"])
+            c3.metric("GET terhemat", auth_stats["requests_avoided"])
+            st.caption(
+                "Varian Authorization yang diingat per penerbit token: "
+                + (", ".join(f"{k} → {v}" for k, v in auth_stats["learned"].items()) or "-")
             )
-        else:
-            st.info("Belum ada perubahan status yang terekam pada sesi ini.")
     else:
         st.info("Belum ada data SISS. Klik tombol **🔄 Refresh Data SISS** terlebih dahulu.")
 
+# ============================================================
+#  POLLER LATAR BELAKANG (SATU PER PROSES SERVER)
+# ============================================================
+
+@st.cache_resource
+def get_background_poller() -> BackgroundPoller | None:
+    """Start poller sekali per proses kalau POLL_INTERVAL_SECONDS > 0."""
+    if config.POLL_INTERVAL_SECONDS <= 0:
+        return None
+    poller = BackgroundPoller(
+        {"tower": collect_tower, "siss": collect_siss},
+        interval=config.POLL_INTERVAL_SECONDS,
+    )
+    poller.start()
+    return poller
+
+
+background_poller = get_background_poller()
+
 # ============================================================
 #  ROUTING HALAMAN (PAKAI FILTER DARI SIDEBAR UTAMA)
 # ============================================================
@@ -969,7 +1406,7 @@ if page == "Tower Online / Offline":
         sf = "Offline"
     else:
         sf = "Online"
-    page_tower(sf)
+    page_tower(FacetQuery(sf, tuple(region_filter), search_text.strip().lower()))
 else:
     if status_filter_label == "Semua":
         sf = None
@@ -977,7 +1414,49 @@ else:
         sf = "NORMAL"
     else:
         sf = "CRITICAL"
-    page_siss(sf, siss_start_date, siss_end_date)
+    page_siss(
+        FacetQuery(sf, tuple(region_filter), search_text.strip().lower()),
+        siss_start_date,
+        siss_end_date,
+        siss_chunk_mode,
+    )
+
+# ============================================================
+#  PANEL ADMIN: WAKTU PER TAHAP (METRICS_PANEL=1)
+# ============================================================
+
+def show_metrics_panel():
+    """p50/p95 per tahap fetch (login, GET, parse, DataFrame, riwayat, export) di proses ini."""
+    if not st.toggle("⏱️ Waktu per tahap (admin)", key="metrics_panel"):
+        return
+    summary = metrics.summary()
+    if summary.empty:
+        st.caption("Belum ada tahap yang tercatat di proses ini.")
+        return
+    table = summary.assign(
+        last_at=summary["last_at"].map(fmt_ts),
+        last_kb=(summary["last_bytes"] / 1024).round(1),
+        total_kb=(summary["total_bytes"] / 1024).round(1),
+    ).drop(columns=["last_bytes", "total_bytes"])
+    st.dataframe(
+        table.round({"last_s": 3, "p50_s": 3, "p95_s": 3, "max_s": 3}),
+        hide_index=True,
+        width="stretch",
+    )
+    st.download_button(
+        "Export metrik (Prometheus)",
+        data=metrics.prometheus_text(),
+        file_name="mitratel_metrics.prom",
+        mime="text/plain",
+        key="metrics_export",
+    )
+
+
+if config.METRICS_PANEL:
+    # Dirender setelah halaman supaya tahap refresh barusan sudah tercatat
+    with st.sidebar:
+        st.markdown("---")
+        show_metrics_panel()
 
 # Footer di bawah konten utama (tengah)
 st.markdown(
@@ -0,0 +1,107 @@
+"""
+Benchmark deteksi perubahan status: loop per baris (cara lama di
+update_siss_status_history) vs diff tervektorisasi (mitratel.history).
+
+Jalankan dari root repo:
+    python benchmarks/bench_history_diff.py
+    python benchmarks/bench_history_diff.py --sizes 10000 50000 100000 --change-rate 0.05
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mitratel.history import StatusHistoryStore, diff_status, latest_status  # noqa: E402
+
+STATUSES = np.array(["NORMAL", "CRITICAL"])
+
+
+def make_frames(n: int, change_rate: float, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    sites = np.array([f"SITE-{i:06d}" for i in range(n)])
+    status = STATUSES[rng.integers(0, 2, n)]
+    before = pd.DataFrame({"Site Name": sites, "Status": status})
+    flip = rng.random(n) < change_rate
+    after = before.copy()
+    after.loc[flip, "Status"] = np.where(status[flip] == "NORMAL", "CRITICAL", "NORMAL")
+    return before, after
+
+
+def legacy_diff(prev_state: dict, df_new: pd.DataFrame, now: float) -> list:
+    """Salinan logika lama: iterrows -> dict -> loop per site."""
+    new_map = {
+        row["Site Name"]: row["Status"]
+        for _, row in df_new.iterrows()
+        if pd.notna(row.get("Site Name")) and pd.notna(row.get("Status"))
+    }
+    log = []
+    for site_name, new_status in new_map.items():
+        prev_info = prev_state.get(site_name)
+        if prev_info is None:
+            prev_state[site_name] = {"status": new_status, "since": now}
+            continue
+        if prev_info["status"] != new_status:
+            log.append((site_name, prev_info["status"], new_status, prev_info["since"], now))
+            prev_state[site_name] = {"status": new_status, "since": now}
+    return log
+
+
+def timed(fn, repeat: int = 3) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench(n: int, change_rate: float):
+    before, after = make_frames(n, change_rate)
+
+    def run_legacy():
+        state = {}
+        legacy_diff(state, before, 0.0)
+        return legacy_diff(state, after, 60.0)
+
+    prev = latest_status(before, "Site Name", "Status").to_frame()
+    prev["since"] = 0.0
+
+    def run_vector():
+        return diff_status(prev, latest_status(after, "Site Name", "Status"), 60.0)[1]
+
+    t_legacy, log_legacy = timed(run_legacy, repeat=1)
+    t_vector, log_vector = timed(run_vector)
+    assert len(log_legacy) == len(log_vector)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StatusHistoryStore(os.path.join(tmp, "bench.sqlite3"))
+        store.record("bench", before, "Site Name", "Status", now=0.0)
+        t_store, _ = timed(
+            lambda: store.record("bench", after, "Site Name", "Status", now=60.0), repeat=1
+        )
+
+    print(
+        f"{n:>8} site | perubahan {len(log_vector):>6} | "
+        f"loop lama {t_legacy * 1000:9.1f} ms | vektor {t_vector * 1000:7.1f} ms | "
+        f"speedup {t_legacy / t_vector:6.1f}x | record() SQLite {t_store * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--change-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    for n in args.sizes:
+        bench(n, args.change_rate)
+
+
+if __name__ == "__main__":
+    main()
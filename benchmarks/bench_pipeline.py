@@ -0,0 +1,264 @@
+"""
+Benchmark offline pipeline tower & SISS dengan data sintetis dan server
+upstream lokal (benchmarks/fake_upstream.py), tanpa kredensial asli.
+
+Per ukuran (jumlah site) diukur:
+- fetch + parse report tower (waktu, peak memori parse)
+- fetch SISS streaming vs body utuh + json.loads (waktu, peak memori)
+- diff riwayat status: record() penuh vs compute_delta() + record_incremental()
+- ukuran payload peta SISS (pin & cluster, JSON)
+- export CSV / Parquet / Excel
+
+Jalankan dari root repo:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 1000 50000 200000 --json hasil.json
+    python benchmarks/bench_pipeline.py --baseline hasil.json --tolerance 0.25
+
+Dengan --baseline, exit code 1 kalau ada metrik yang lebih buruk dari
+baseline melebihi toleransi (untuk dicek sebelum deploy).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Semua state mitratel (riwayat, snapshot, memori auth) ke direktori sementara;
+# cache export & fetch dimatikan supaya setiap pengukuran benar-benar bekerja.
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="mitratel-bench-")
+os.environ["EXPORT_CACHE_MB"] = "0"
+os.environ.setdefault("LOGIN_USERNAME", "bench")
+os.environ.setdefault("LOGIN_PASSWORD", "bench")
+os.environ.setdefault("LOGIN_USERNAME_1", "bench")
+os.environ.setdefault("LOGIN_PASSWORD_1", "bench")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_upstream import FakeUpstream  # noqa: E402
+from fixtures import (  # noqa: E402
+    refreshed, siss_items, siss_panel_json, tower_frame, tower_report_html,
+)
+
+from mitratel.compact import compact_frame  # noqa: E402
+from mitratel.delta import compute_delta  # noqa: E402
+from mitratel.exports import export_bytes  # noqa: E402
+from mitratel.history import StatusHistoryStore  # noqa: E402
+from mitratel.map_layers import (  # noqa: E402
+    CLUSTER_LAYER_COLUMNS, DEFAULT_CLUSTER_ZOOM, build_pin_frame, cluster_level,
+)
+from mitratel.siss import fetch_siss_df_stream, fetch_siss_raw, parse_siss_to_df  # noqa: E402
+from mitratel.timeutil import now_wib  # noqa: E402
+from mitratel.tower import fetch_report_html, parse_report_to_df  # noqa: E402
+from mitratel.views import dataset_version  # noqa: E402
+
+EXPORT_FORMATS = ("csv", "parquet", "xlsx")
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    """Waktu terbaik (ms) dari `repeat` kali jalan + hasil terakhir."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, out
+
+
+def peak_mb(fn) -> float:
+    """Peak alokasi Python/numpy (MB) selama `fn` (tracemalloc; buffer Arrow tidak terhitung)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_tower(upstream: FakeUpstream, n: int, repeat: int) -> dict:
+    df = tower_frame(n)
+    html = tower_report_html(df)
+    upstream.set_tower_html(html)
+    fetch_report_html()  # login sekali, di luar pengukuran
+
+    fetch_ms, body = timed(fetch_report_html, repeat)
+    parse_ms, parsed = timed(lambda: parse_report_to_df(body), repeat)
+    assert len(parsed) == n, (len(parsed), n)
+    compact_ms, _ = timed(lambda: compact_frame(parsed), repeat)
+    return {
+        "tower_html_kb": len(html) / 1024,
+        "tower_fetch_ms": fetch_ms,
+        "tower_parse_ms": parse_ms,
+        "tower_parse_peak_mb": peak_mb(lambda: parse_report_to_df(body)),
+        "tower_compact_ms": compact_ms,
+    }
+
+
+def bench_siss(upstream: FakeUpstream, n: int, repeat: int) -> tuple[dict, object]:
+    body = siss_panel_json(siss_items(n))
+    upstream.set_siss_body(body)
+    end = now_wib()
+    start = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    fetch_siss_raw(start, end)  # login + pilih varian Authorization, di luar pengukuran
+
+    stream_ms, df = timed(lambda: fetch_siss_df_stream(start, end), repeat)
+    full_ms, df_full = timed(lambda: parse_siss_to_df(fetch_siss_raw(start, end)), repeat)
+    assert len(df) == len(df_full)
+    return {
+        "siss_json_kb": len(body) / 1024,
+        "siss_stream_ms": stream_ms,
+        "siss_stream_peak_mb": peak_mb(lambda: fetch_siss_df_stream(start, end)),
+        "siss_full_ms": full_ms,
+        "siss_full_peak_mb": peak_mb(lambda: parse_siss_to_df(fetch_siss_raw(start, end))),
+    }, compact_frame(df)
+
+
+def bench_history(df, repeat: int) -> dict:
+    after = refreshed(df, "Status", ("NORMAL", "CRITICAL"), rate=0.05)
+    base, new = dataset_version(df), dataset_version(after)
+
+    def run(mode: str) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                store = StatusHistoryStore(os.path.join(tmp, "bench.sqlite3"))
+                store.record("bench", df, "Site Name", "Status", now=0.0, version=base)
+                delta = compute_delta(df, after, "Site Name") if mode == "incremental" else None
+                t0 = time.perf_counter()
+                if mode == "full":
+                    store.record("bench", after, "Site Name", "Status", now=60.0, version=new)
+                else:
+                    # "delta_incremental" = jalur refresh lengkap; "incremental" =
+                    # delta sudah ada (dihitung set_dataset untuk panel perubahan)
+                    if delta is None:
+                        delta = compute_delta(df, after, "Site Name")
+                    store.record_incremental(
+                        "bench", after, delta.touched_rows(after), "Site Name", "Status",
+                        new, base, now=60.0,
+                    )
+                best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    delta_ms, delta = timed(lambda: compute_delta(df, after, "Site Name"), repeat)
+    return {
+        "history_changed": len(delta.changed),
+        "history_delta_ms": delta_ms,
+        "history_full_ms": run("full"),
+        "history_incremental_ms": run("incremental"),
+        "history_delta_incremental_ms": run("delta_incremental"),
+    }
+
+
+def bench_map(df, repeat: int) -> dict:
+    pins_ms, pins = timed(lambda: build_pin_frame(df), repeat)
+    # Satu level (yang dipilih di slider) per render, seperti di aplikasi
+    cluster_ms, cells = timed(lambda: cluster_level(pins, DEFAULT_CLUSTER_ZOOM), repeat)
+    return {
+        "map_pins_ms": pins_ms,
+        "map_pins_kb": len(pins.to_json(orient="records")) / 1024,
+        "map_cluster_ms": cluster_ms,
+        "map_cluster_kb": len(cells[CLUSTER_LAYER_COLUMNS].to_json(orient="records")) / 1024,
+    }
+
+
+def bench_export(df, formats: list[str], xlsx_max: int) -> dict:
+    out = {}
+    for fmt in formats:
+        if fmt == "xlsx" and len(df) > xlsx_max:
+            continue
+        ms, data = timed(lambda: export_bytes(df, fmt), 1)
+        out[f"export_{fmt}_ms"] = ms
+        out[f"export_{fmt}_kb"] = len(data) / 1024
+    return out
+
+
+def bench_size(upstream: FakeUpstream, n: int, args) -> dict:
+    result = {"sites": n}
+    result.update(bench_tower(upstream, n, args.repeat))
+    siss_metrics, siss_df = bench_siss(upstream, n, args.repeat)
+    result.update(siss_metrics)
+    result.update(bench_history(siss_df, args.repeat))
+    result.update(bench_map(siss_df, args.repeat))
+    result.update(bench_export(siss_df, args.export, args.xlsx_max))
+    return result
+
+
+def print_result(result: dict):
+    print(f"\n== {result['sites']:,} site ==")
+    for name, value in result.items():
+        if name != "sites":
+            print(f"  {name:<30} {value:>12,.1f}")
+
+
+# Ukuran input fixture tidak dibandingkan; metrik lain (waktu, memori, ukuran
+# payload peta/export) dianggap makin kecil makin baik.
+IGNORED_IN_COMPARE = ("sites", "history_changed", "tower_html_kb", "siss_json_kb")
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float,
+            min_ms: float) -> list[str]:
+    """Daftar regresi: metrik yang naik > tolerance dibanding baseline (ukuran sama)."""
+    by_size = {b["sites"]: b for b in baseline}
+    regressions = []
+    for result in results:
+        base = by_size.get(result["sites"])
+        if base is None:
+            continue
+        for name, value in result.items():
+            old = base.get(name)
+            if name in IGNORED_IN_COMPARE or not old:
+                continue
+            # Waktu sangat kecil terlalu berisik untuk dibandingkan
+            if name.endswith("_ms") and max(old, value) < min_ms:
+                continue
+            if value > old * (1 + tolerance):
+                regressions.append(
+                    f"{result['sites']:,} site {name}: {old:,.1f} -> {value:,.1f} "
+                    f"(+{(value / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3, help="ambil waktu terbaik dari N kali")
+    parser.add_argument("--export", nargs="*", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS))
+    parser.add_argument("--xlsx-max", type=int, default=50_000,
+                        help="lewati export Excel di atas jumlah site ini (lambat)")
+    parser.add_argument("--json", help="simpan hasil ke file JSON (jadi baseline berikutnya)")
+    parser.add_argument("--baseline", help="file JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="kenaikan relatif yang dianggap regresi (default 0.25 = 25%%)")
+    parser.add_argument("--min-ms", type=float, default=20.0,
+                        help="abaikan perbandingan waktu di bawah nilai ini")
+    args = parser.parse_args()
+
+    results = []
+    with FakeUpstream() as upstream, upstream.patch_urls():
+        for n in args.sizes:
+            result = bench_size(upstream, n, args)
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nhasil disimpan ke {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_ms)
+        if regressions:
+            print("\nREGRESI dibanding baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\ntidak ada regresi dibanding baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
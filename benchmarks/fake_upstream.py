@@ -0,0 +1,129 @@
+"""
+Server HTTP lokal pengganti upstream untuk benchmark offline.
+
+Satu port melayani kedua upstream dengan path yang sama seperti aslinya:
+- POST /Auth/login (form)  -> login report tower: redirect + cookie sesi
+- GET  /get-report          -> HTML tower (tanpa cookie: redirect ke login)
+- POST /Auth/login (JSON)   -> login SISS: JSON berisi accessToken
+- GET  /v1/panels/<id>/panelData -> JSON SISS (tanpa Authorization: 401)
+
+`patch_urls()` mengarahkan konstanta URL di mitratel.tower / mitratel.siss
+ke server ini selama blok `with`.
+"""
+
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+TOKEN = "bench-token"
+SESSION_COOKIE = "bench_session=ok"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, seperti session requests di aplikasi
+
+    def _reply(self, status: int, body: bytes = b"", content_type: str = "text/html",
+               headers: dict[str, str] | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if self.path != "/Auth/login":
+            return self._reply(404)
+        self.server.counters["login"] += 1
+        if "json" in self.headers.get("Content-Type", ""):
+            body = ('{"status": "ok", "data": {"accessToken": "%s"}}' % TOKEN).encode()
+            return self._reply(200, body, "application/json")
+        self._reply(302, headers={"Location": "/dashboard", "Set-Cookie": f"{SESSION_COOKIE}; Path=/"})
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/dashboard":
+            return self._reply(200, b"<html>dashboard</html>")
+        if path == "/Auth/login":
+            return self._reply(200, b"<html>login</html>")
+        if path == "/get-report":
+            if SESSION_COOKIE not in self.headers.get("Cookie", ""):
+                return self._reply(302, headers={"Location": "/Auth/login"})
+            self.server.counters["report"] += 1
+            return self._reply(200, self.server.tower_body)
+        if path.startswith("/v1/panels/") and path.endswith("/panelData"):
+            if TOKEN not in self.headers.get("Authorization", ""):
+                return self._reply(401, b'{"message": "unauthorized"}', "application/json")
+            self.server.counters["panel"] += 1
+            return self._reply(200, self.server.siss_body, "application/json")
+        self._reply(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeUpstream:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.tower_body = b""
+        self.server.siss_body = b""
+        self.server.counters = {"login": 0, "report": 0, "panel": 0}
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return self.server.counters
+
+    def set_tower_html(self, html: str):
+        self.server.tower_body = html.encode("utf-8")
+
+    def set_siss_body(self, body: bytes):
+        self.server.siss_body = body
+
+    def start(self) -> "FakeUpstream":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeUpstream":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _local(self, url: str) -> str:
+        parts = urlsplit(url)
+        return self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+    @contextmanager
+    def patch_urls(self):
+        """Arahkan URL login/report tower & SISS ke server ini."""
+        from mitratel import siss, tower
+
+        targets = [
+            (tower, "LOGIN_URL_REPORT"), (tower, "REPORT_URL_REPORT"),
+            (siss, "LOGIN_URL_SISS"), (siss, "REPORT_URL_SISS_BASE"),
+        ]
+        saved = [(mod, name, getattr(mod, name)) for mod, name in targets]
+        try:
+            for mod, name, url in saved:
+                setattr(mod, name, self._local(url))
+            yield self
+        finally:
+            for mod, name, url in saved:
+                setattr(mod, name, url)
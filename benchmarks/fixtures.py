@@ -0,0 +1,93 @@
+"""
+Data sintetis untuk benchmark offline (tanpa kredensial upstream):
+halaman get-report tower (tabel HTML) dan JSON panelData SISS
+(`responseDataValue`) untuk 1k – 200k site.
+
+Semua generator deterministik per seed, jadi hasil antar run bisa
+dibandingkan. `refreshed()` membuat versi "refresh berikutnya" dengan
+sebagian status berubah untuk mengukur deteksi perubahan riwayat.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+REGIONS = np.array([
+    "SUMBAGUT", "SUMBAGTENG", "SUMBAGSEL", "JABODETABEK", "JABAR",
+    "JATENG", "JATIM", "BALINUSRA", "KALIMANTAN", "SULAWESI", "PAPUA",
+])
+TOWER_COLUMNS = ["#", "Site ID", "Site Name", "Region", "Status", "Last Update"]
+# Sebagian kecil status di luar yang ditampilkan dashboard (ikut difilter normalize)
+SISS_STATUSES = np.array(["NORMAL", "CRITICAL", "NOT INSTALLED", "MAINTENANCE"])
+
+
+def _sites(n: int) -> np.ndarray:
+    return np.char.add("SITE-", np.char.zfill(np.arange(n).astype(str), 6))
+
+
+def tower_frame(n: int, seed: int = 0, offline_rate: float = 0.1) -> pd.DataFrame:
+    """Isi report tower sebagai DataFrame (kolom sama dengan tabel HTML, tanpa '#')."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Site ID": np.char.add("ID", np.char.zfill(np.arange(n).astype(str), 7)),
+        "Site Name": _sites(n),
+        "Region": REGIONS[rng.integers(0, len(REGIONS), n)],
+        "Status": np.where(rng.random(n) < offline_rate, "Offline", "Online"),
+        "Last Update": "2025-01-01 07:00:00",
+    })
+
+
+def tower_report_html(df: pd.DataFrame) -> str:
+    """Halaman get-report: navigasi + satu tabel data (dengan kolom nomor '#')."""
+    cells = [pd.Series(np.arange(1, len(df) + 1)).astype(str)] + [df[c].astype(str) for c in df.columns]
+    rows = "<tr><td>" + cells[0]
+    for col in cells[1:]:
+        rows = rows + "</td><td>" + col
+    rows = rows + "</td></tr>"
+    header = "".join(f"<th>{c}</th>" for c in ["#", *df.columns])
+    return (
+        "<!DOCTYPE html><html><head><title>Report</title></head><body>"
+        "<nav><a href='/dashboard'>Dashboard</a> | <a href='/get-report'>Report</a></nav>"
+        f"<table class='table'><thead><tr>{header}</tr></thead><tbody>\n"
+        + "\n".join(rows.tolist())
+        + "\n</tbody></table></body></html>"
+    )
+
+
+def siss_items(n: int, seed: int = 0, critical_rate: float = 0.1) -> pd.DataFrame:
+    """Item mentah panelData SISS (termasuk field yang dibuang dashboard)."""
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random(n) < critical_rate, "CRITICAL", "NORMAL")
+    other = rng.random(n)
+    status = np.where(other < 0.02, "NOT INSTALLED", np.where(other > 0.99, "MAINTENANCE", status))
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "name": _sites(n),
+        "region": REGIONS[rng.integers(0, len(REGIONS), n)],
+        "status": status,
+        "longitude": rng.uniform(95.0, 141.0, n).round(6),
+        "latitude": rng.uniform(-11.0, 6.0, n).round(6),
+        "tenantId": rng.integers(1, 40, n),
+        "lastUpdate": "2025-01-01T00:00:00.000Z",
+        "description": "synthetic site",
+    })
+
+
+def siss_panel_json(items: pd.DataFrame) -> bytes:
+    """Body response panelData: {"responseCode": ..., "responseDataValue": [...]}."""
+    records = items.to_json(orient="records")
+    head = json.dumps({"responseCode": 200, "responseMessage": "OK"})[:-1]
+    return f'{head}, "responseDataValue": {records}}}'.encode("utf-8")
+
+
+def refreshed(df: pd.DataFrame, status_col: str, values: tuple[str, str],
+              rate: float, seed: int = 1) -> pd.DataFrame:
+    """Salinan `df` dengan sekitar `rate` baris berganti status (values[0] <-> values[1])."""
+    rng = np.random.default_rng(seed)
+    flip = rng.random(len(df)) < rate
+    out = df.copy()
+    status = out[status_col].astype(str).to_numpy()
+    swapped = np.where(status == values[0], values[1], np.where(status == values[1], values[0], status))
+    out[status_col] = np.where(flip, swapped, status)
+    return out
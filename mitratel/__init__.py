@@ -0,0 +1 @@
+"""Komponen inti Mitratel Monitoring Dashboard (tanpa dependensi Streamlit)."""
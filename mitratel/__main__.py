@@ -0,0 +1,5 @@
+"""`python -m mitratel ...` — lihat mitratel/cli.py."""
+
+from .cli import main
+
+raise SystemExit(main())
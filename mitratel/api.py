@@ -0,0 +1,338 @@
+"""
+HTTP API lokal (stdlib, tanpa Streamlit) untuk data tower/SISS terbaru.
+
+Data dibaca dari snapshot lokal yang sama dengan dashboard (ditulis oleh
+refresh halaman, poller, atau `python -m mitratel collect`), jadi berapa pun
+konsumennya, upstream tetap hanya di-fetch sekali per refresh.
+
+    GET /v1/{tower|siss}               tabel; format=json|ndjson|arrow,
+                                       filter status=, region= (boleh berulang), q=
+    GET /v1/{tower|siss}/counts        jumlah site per Status
+    GET /v1/{tower|siss}/transitions   riwayat perubahan status (limit, offset, site)
+    GET /v1/snapshots                  snapshot terbaru per sumber
+    GET /metrics                       waktu per tahap (format teks Prometheus)
+    GET /healthz                       status proses + circuit breaker upstream
+
+HEAD didukung untuk semua endpoint (header sama, tanpa body). Format juga bisa dipilih lewat header Accept. Respons memakai ETag lemah
+(If-None-Match -> 304) dan gzip kalau diminta; body yang sudah di-encode
+disimpan di cache per (snapshot, varian) sehingga konsumen berikutnya
+tidak meng-encode ulang.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from . import config
+from .exports import ExportCache
+from .history import history_store
+from .map_layers import COORD_DECIMALS
+from .metrics import metrics
+from .resilience import upstream_breaker
+from .search import FacetQuery, search_frame
+from .snapshots import snapshot_store
+from .timeutil import epoch_to_wib
+from .views import cached_view, status_counts
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("tower", "siss")
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+GZIP_MIN_BYTES = 1024
+ARROW_BATCH_ROWS = 10_000
+TRANSITIONS_DEFAULT_LIMIT = 1000
+TRANSITIONS_MAX_LIMIT = 100_000
+
+body_cache = ExportCache(int(config.API_CACHE_MB * 1024 * 1024))
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def negotiate_format(params: dict[str, list[str]], accept: str) -> str:
+    """Format dari ?format=..., lalu header Accept, default JSON."""
+    fmt = params.get("format", [None])[0]
+    if fmt:
+        if fmt not in MEDIA_TYPES:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"format tidak dikenal: {fmt}")
+        return fmt
+    for name, media in MEDIA_TYPES.items():
+        if media in accept:
+            return name
+    return "json"
+
+
+def _widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Kolom float32 (koordinat dari compact_frame) -> float64 yang dibulatkan,
+    supaya JSON tidak berisi noise seperti 129.8386535645.
+    """
+    narrow = [c for c in df.columns if df[c].dtype == np.float32]
+    if not narrow:
+        return df
+    return df.assign(**{
+        str(c): df[c].astype("float64").round(COORD_DECIMALS) for c in narrow
+    })
+
+
+def encode_frame(df: pd.DataFrame, fmt: str) -> bytes:
+    """Encode DataFrame: array JSON, NDJSON (satu record per baris) atau Arrow IPC stream."""
+    if fmt != "arrow":
+        df = _widen_float32(df)
+    if fmt == "arrow":
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=ARROW_BATCH_ROWS)
+        return sink.getvalue().to_pybytes()
+    if fmt == "ndjson":
+        if df.empty:
+            return b""
+        text = df.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+        return (text if text.endswith("\n") else text + "\n").encode("utf-8")
+    return df.to_json(orient="records", force_ascii=False, date_format="iso").encode("utf-8")
+
+
+def _etag(key: tuple) -> str:
+    return 'W/"' + hashlib.sha1(repr(key).encode()).hexdigest()[:24] + '"'
+
+
+def _int_param(params: dict[str, list[str]], name: str, default: int, maximum: int) -> int:
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} harus bilangan bulat")
+    return max(0, min(value, maximum))
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "MitratelAPI/1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            if parts == ["healthz"]:
+                self._healthz()
+            elif parts == ["metrics"]:
+                body = metrics.prometheus_text().encode("utf-8")
+                self._send(HTTPStatus.OK, body, PROMETHEUS_TEXT, {"Cache-Control": "no-store"})
+            elif parts == ["v1", "snapshots"]:
+                self._snapshots()
+            elif len(parts) >= 2 and parts[0] == "v1" and parts[1] in KINDS:
+                kind, rest = parts[1], parts[2:]
+                if rest == []:
+                    self._table(kind, params)
+                elif rest == ["counts"]:
+                    self._counts(kind)
+                elif rest == ["transitions"]:
+                    self._transitions(kind, params)
+                else:
+                    raise ApiError(HTTPStatus.NOT_FOUND, "endpoint tidak ditemukan")
+            else:
+                raise ApiError(HTTPStatus.NOT_FOUND, "endpoint tidak ditemukan")
+        except ApiError as e:
+            self._send_json({"error": str(e)}, status=e.status, cacheable=False)
+        except (OSError, ValueError) as e:
+            self._send_json(
+                {"error": f"gagal membaca data: {e}"},
+                status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                cacheable=False,
+            )
+        except Exception as e:
+            # Error tak terduga (KeyError dari query, error pyarrow, ...): tetap
+            # balas 500 JSON, jangan putuskan koneksi tanpa respons
+            logger.exception("API %s %s gagal", self.command, self.path)
+            self._send_json(
+                {"error": f"kesalahan internal: {type(e).__name__}"},
+                status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                cacheable=False,
+            )
+
+    do_HEAD = do_GET
+
+    # ---- endpoint -------------------------------------------------------
+
+    def _latest(self, kind: str):
+        loaded = snapshot_store.load_latest(kind)
+        if loaded is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"belum ada snapshot {kind}")
+        return loaded
+
+    def _snapshot_headers(self, info) -> dict[str, str]:
+        headers = {
+            "Last-Modified": formatdate(info.taken_at, usegmt=True),
+            "X-Snapshot-Taken-At": epoch_to_wib(info.taken_at).isoformat(),
+        }
+        if info.meta.get("range"):
+            headers["X-Snapshot-Range"] = str(info.meta["range"])
+        return headers
+
+    def _healthz(self):
+        breakers = {kind: upstream_breaker(kind).state() for kind in KINDS}
+        self._send_json({
+            "status": "ok",
+            "upstream": {
+                kind: {"state": b.state, "failures": b.failures, "last_error": b.last_error}
+                for kind, b in breakers.items()
+            },
+        }, cacheable=False)
+
+    def _snapshots(self):
+        out = {}
+        for kind in KINDS:
+            info = snapshot_store.latest(kind)
+            out[kind] = None if info is None else {
+                "taken_at": epoch_to_wib(info.taken_at).isoformat(),
+                "size": info.size,
+                "file": os.path.basename(info.path),
+            }
+        self._send_json(out, cacheable=False)
+
+    def _table(self, kind: str, params: dict[str, list[str]]):
+        fmt = negotiate_format(params, self.headers.get("Accept", ""))
+        query = FacetQuery(
+            params.get("status", [None])[0],
+            tuple(params.get("region", [])),
+            params.get("q", [""])[0].strip().lower(),
+        )
+        df, info = self._latest(kind)
+        key = ("table", info.path, info.taken_at, fmt, query)
+        self._send_cached(
+            key,
+            lambda: encode_frame(search_frame(df, query), fmt),
+            MEDIA_TYPES[fmt],
+            self._snapshot_headers(info),
+        )
+
+    def _counts(self, kind: str):
+        df, info = self._latest(kind)
+        if "Status" not in df.columns:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"kolom Status tidak ada di data {kind}")
+
+        def build() -> bytes:
+            counts, _ = cached_view(df, "status_counts", "count", lambda: status_counts(df, "count"))
+            payload = {
+                "kind": kind,
+                "taken_at": epoch_to_wib(info.taken_at).isoformat(),
+                "total": int(len(df)),
+                "counts": {str(s): int(n) for s, n in zip(counts["Status"], counts["count"])},
+            }
+            return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        key = ("counts", info.path, info.taken_at)
+        self._send_cached(key, build, MEDIA_TYPES["json"], self._snapshot_headers(info))
+
+    def _transitions(self, kind: str, params: dict[str, list[str]]):
+        fmt = negotiate_format(params, self.headers.get("Accept", ""))
+        limit = _int_param(params, "limit", TRANSITIONS_DEFAULT_LIMIT, TRANSITIONS_MAX_LIMIT)
+        offset = _int_param(params, "offset", 0, 2**62)
+        site = params.get("site", [None])[0]
+        # Log transisi hanya bertambah: jumlahnya cukup sebagai versi
+        version = history_store.count_transitions(kind)
+        key = ("transitions", kind, version, fmt, limit, offset, site)
+        self._send_cached(
+            key,
+            lambda: encode_frame(
+                history_store.query_transitions(kind, limit=limit, offset=offset, site=site), fmt
+            ),
+            MEDIA_TYPES[fmt],
+            {"X-Total-Transitions": str(version)},
+        )
+
+    # ---- respons --------------------------------------------------------
+
+    def _send_cached(self, key: tuple, build, content_type: str, headers: dict[str, str]):
+        etag = _etag(key)
+        headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self._send(HTTPStatus.NOT_MODIFIED, b"", content_type, headers)
+            return
+
+        body = body_cache.get(key)
+        if body is None:
+            body = build()
+            body_cache.put(key, body)
+
+        if "gzip" in self.headers.get("Accept-Encoding", "") and len(body) >= GZIP_MIN_BYTES:
+            gz_key = key + ("gzip",)
+            compressed = body_cache.get(gz_key)
+            if compressed is None:
+                compressed = gzip.compress(body, compresslevel=6)
+                body_cache.put(gz_key, compressed)
+            body = compressed
+            headers["Content-Encoding"] = "gzip"
+        self._send(HTTPStatus.OK, body, content_type, headers)
+
+    def _send_json(self, payload, status: HTTPStatus = HTTPStatus.OK, cacheable: bool = True):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {} if cacheable else {"Cache-Control": "no-store"}
+        self._send(status, body, MEDIA_TYPES["json"], headers)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers: dict[str, str]):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if config.API_ACCESS_LOG:
+            super().log_message(format, *args)
+
+
+def make_server(host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str, port: int, poll_interval: float = 0.0):
+    """Jalankan API (blocking). Dengan poll_interval > 0, snapshot ikut diperbarui di proses ini."""
+    poller = None
+    if poll_interval > 0:
+        from .collect import collect_siss, collect_tower
+        from .poller import BackgroundPoller
+
+        poller = BackgroundPoller(
+            {"tower": collect_tower, "siss": collect_siss}, interval=poll_interval
+        )
+        poller.start()
+
+    server = make_server(host, port)
+    print(f"Mitratel API di http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if poller is not None:
+            poller.stop()
@@ -0,0 +1,126 @@
+"""
+Ingatan varian header Authorization SISS yang berhasil.
+
+SISS kadang menerima `Bearer <token>`, kadang token mentah, kadang tanpa
+header sama sekali. Varian yang terakhir berhasil disimpan per penerbit
+token (claim `iss` JWT, atau host login) ke file JSON, lalu dicoba pertama
+kali pada refresh berikutnya. Varian lain hanya dicoba kalau dapat 401/403.
+"""
+
+import base64
+import json
+import os
+import threading
+import urllib.parse
+
+from . import config
+
+# Urutan default, sama seperti percobaan lama di fetch_siss_raw()
+VARIANTS = ("bearer", "raw", "none")
+FALLBACK_STATUSES = (401, 403)
+
+
+def token_issuer(token: str | None, default: str) -> str:
+    """Ambil claim `iss` dari token JWT; kalau bukan JWT pakai `default`."""
+    if not token:
+        return default
+    raw = token[7:] if token.lower().startswith("bearer ") else token
+    parts = raw.split(".")
+    if len(parts) != 3:
+        return default
+    try:
+        padded = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        return default
+    iss = claims.get("iss") if isinstance(claims, dict) else None
+    return iss if isinstance(iss, str) and iss else default
+
+
+def url_host(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc
+
+
+def auth_header(variant: str, token: str | None) -> dict:
+    """Header Authorization untuk satu varian."""
+    if variant == "none" or not token:
+        return {}
+    if variant == "bearer":
+        bearer = token if token.lower().startswith("bearer ") else f"Bearer {token}"
+        return {"Authorization": bearer}
+    return {"Authorization": token}
+
+
+class AuthSchemeMemory:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._learned: dict[str, str] = self._load()
+        self.requests_total = 0
+        self.requests_failed = 0
+        self.requests_avoided = 0
+
+    def _load(self) -> dict[str, str]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if v in VARIANTS}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._learned, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def learned(self, issuer: str) -> str | None:
+        with self._lock:
+            return self._learned.get(issuer)
+
+    def ordered_variants(self, issuer: str, token: str | None) -> list[str]:
+        """Varian yang masuk akal untuk token ini, yang pernah berhasil di depan."""
+        variants = list(VARIANTS) if token else ["none"]
+        known = self.learned(issuer)
+        if known in variants:
+            variants.remove(known)
+            variants.insert(0, known)
+        return variants
+
+    def record(self, issuer: str, variant: str | None, attempts: int, token: str | None):
+        """
+        Catat hasil satu fetch: `variant` yang berhasil (None kalau gagal semua)
+        dan jumlah GET yang dipakai.
+        """
+        with self._lock:
+            self.requests_total += attempts
+            if variant is None:
+                self.requests_failed += attempts
+                return
+            self.requests_failed += attempts - 1
+            default_order = list(VARIANTS) if token else ["none"]
+            baseline = default_order.index(variant) + 1
+            self.requests_avoided += max(0, baseline - attempts)
+            if self._learned.get(issuer) != variant:
+                self._learned[issuer] = variant
+                try:
+                    self._save()
+                except OSError:
+                    pass  # tetap jalan walau folder data tidak bisa ditulis
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests_total": self.requests_total,
+                "requests_failed": self.requests_failed,
+                "requests_avoided": self.requests_avoided,
+                "learned": dict(self._learned),
+            }
+
+
+siss_auth_memory = AuthSchemeMemory(
+    os.path.join(config.DATA_DIR, "siss_auth_scheme.json")
+)
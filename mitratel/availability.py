@@ -0,0 +1,191 @@
+"""
+Rollup availability / SLA dari riwayat status.
+
+Setiap interval status yang selesai (baris `transitions`) dipecah per hari
+WIB lalu dijumlahkan ke tabel `daily_status` dan `monthly_status` saat
+direkam — lihat StatusHistoryStore.record(). Tabel SLA cukup menjumlahkan
+bucket yang sudah jadi (bulan penuh dari bucket bulanan, sisa hari di tepi
+rentang dari bucket harian), ditambah interval yang masih berjalan dari
+`site_state`; tidak perlu memutar ulang seluruh transisi.
+
+`day` adalah nomor hari sejak epoch dalam WIB (integer, mudah di-index);
+`month` adalah nomor hari tanggal 1 bulan tersebut.
+Durasi disimpan numerik (detik); format teks hanya untuk tampilan.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+DAY_SECONDS = 86400
+TZ_OFFSET_SECONDS = 7 * 3600  # WIB
+EPOCH_DAY = date(1970, 1, 1)
+
+BUCKET_COLUMNS = ["site", "day", "status", "seconds"]
+SITE_SLA_COLUMNS = ["site", "up_s", "down_s", "observed_s", "availability_pct"]
+
+
+def day_number(d: date) -> int:
+    return (d - EPOCH_DAY).days
+
+
+def day_date(n: int) -> date:
+    return EPOCH_DAY + timedelta(days=int(n))
+
+
+def month_start(day: np.ndarray) -> np.ndarray:
+    """Nomor hari tanggal 1 dari bulan tiap `day`."""
+    return (
+        np.asarray(day, dtype="datetime64[D]").astype("datetime64[M]")
+        .astype("datetime64[D]").astype(np.int64)
+    )
+
+
+def month_spans(start_day: int, end_day: int) -> tuple[list[int], list[tuple[int, int]]]:
+    """
+    Pecah start_day..end_day (inklusif) menjadi bulan penuh (nomor hari
+    tanggal 1) dan rentang hari sisa di tepi yang tidak mencakup bulan penuh.
+    """
+    months: list[int] = []
+    edges: list[tuple[int, int]] = []
+    cursor = start_day
+    while cursor <= end_day:
+        m = int(month_start(cursor))
+        next_m = int(month_start(m + 31))
+        if cursor == m and next_m - 1 <= end_day:
+            months.append(m)
+        else:
+            edges.append((cursor, min(end_day, next_m - 1)))
+        cursor = next_m
+    return months, edges
+
+
+def day_bounds(start_day: int, end_day: int) -> tuple[float, float]:
+    """Epoch [awal start_day, akhir end_day) dalam WIB."""
+    return (
+        start_day * DAY_SECONDS - TZ_OFFSET_SECONDS,
+        (end_day + 1) * DAY_SECONDS - TZ_OFFSET_SECONDS,
+    )
+
+
+def split_daily(intervals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pecah interval (site, status, start_ts, end_ts) per hari WIB dan jumlahkan
+    per (site, day, status). Vektor: setiap interval diulang sebanyak hari
+    yang dilewatinya, tanpa loop Python.
+    """
+    iv = intervals[intervals["end_ts"] > intervals["start_ts"]]
+    if iv.empty:
+        return pd.DataFrame(columns=BUCKET_COLUMNS)
+
+    start = iv["start_ts"].to_numpy(dtype=float)
+    end = iv["end_ts"].to_numpy(dtype=float)
+    first = np.floor((start + TZ_OFFSET_SECONDS) / DAY_SECONDS).astype(np.int64)
+    # Akhir eksklusif: interval yang berakhir tepat tengah malam tidak menyentuh hari berikutnya
+    last = np.ceil((end + TZ_OFFSET_SECONDS) / DAY_SECONDS).astype(np.int64) - 1
+    n_days = last - first + 1
+
+    rep = np.repeat(np.arange(len(iv)), n_days)
+    offset = np.arange(len(rep)) - np.repeat(np.cumsum(n_days) - n_days, n_days)
+    day = first[rep] + offset
+    day_start = day * DAY_SECONDS - TZ_OFFSET_SECONDS
+    seconds = np.minimum(end[rep], day_start + DAY_SECONDS) - np.maximum(start[rep], day_start)
+
+    pieces = pd.DataFrame(
+        {
+            "site": iv["site"].to_numpy()[rep],
+            "day": day,
+            "status": iv["status"].to_numpy()[rep],
+            "seconds": seconds,
+        }
+    )
+    return pieces.groupby(["site", "day", "status"], as_index=False, sort=False)["seconds"].sum()
+
+
+def _ongoing(store, source: str, start_ts: float, end_ts: float, now: float) -> pd.DataFrame:
+    """Interval yang masih berjalan (dari site_state), dipotong ke rentang."""
+    state = store.open_intervals(source)
+    iv = pd.DataFrame(
+        {
+            "site": state["site"],
+            "status": state["status"],
+            "start_ts": state["since"].clip(lower=start_ts),
+            "end_ts": min(end_ts, now),
+        }
+    )
+    return iv[iv["end_ts"] > iv["start_ts"]]
+
+
+def site_availability(store, source: str, down_statuses: tuple[str, ...],
+                      start_day: int, end_day: int, now: float) -> pd.DataFrame:
+    """
+    Availability per site untuk hari start_day..end_day (inklusif):
+    detik up/down, total terobservasi, dan persentase up.
+    """
+    start_ts, end_ts = day_bounds(start_day, end_day)
+    # Belum ada bucket setelah hari ini: rentang yang berakhir hari ini boleh
+    # diperluas ke akhir bulan supaya bulan berjalan terbaca dari bucket bulanan
+    today = int((now + TZ_OFFSET_SECONDS) // DAY_SECONDS)
+    bucket_end = end_day
+    if end_day >= today:
+        bucket_end = max(end_day, int(month_start(today + 31)) - 1)
+    closed = store.bucket_totals(source, start_day, bucket_end)
+    ongoing = _ongoing(store, source, start_ts, end_ts, now)
+    ongoing = ongoing.assign(seconds=ongoing["end_ts"] - ongoing["start_ts"])
+
+    totals = pd.concat(
+        [closed, ongoing[["site", "status", "seconds"]]], ignore_index=True
+    )
+    if totals.empty:
+        return pd.DataFrame(columns=SITE_SLA_COLUMNS)
+
+    is_down = totals["status"].isin(down_statuses)
+    per_site = pd.DataFrame(
+        {
+            "site": totals["site"],
+            "up_s": totals["seconds"].where(~is_down, 0.0),
+            "down_s": totals["seconds"].where(is_down, 0.0),
+        }
+    ).groupby("site", as_index=False, sort=False).sum()
+    return _with_pct(per_site).sort_values(
+        ["availability_pct", "down_s"], ascending=[True, False], ignore_index=True
+    )[SITE_SLA_COLUMNS]
+
+
+def region_availability(per_site: pd.DataFrame, regions: pd.Series) -> pd.DataFrame:
+    """Jumlahkan availability per site ke region (`regions`: Series site -> region)."""
+    region = per_site["site"].map(regions).fillna("(tidak diketahui)")
+    grouped = per_site.assign(region=region).groupby("region", as_index=False, sort=True).agg(
+        sites=("site", "size"), up_s=("up_s", "sum"), down_s=("down_s", "sum")
+    )
+    return _with_pct(grouped)
+
+
+def daily_availability(store, source: str, down_statuses: tuple[str, ...],
+                       start_day: int, end_day: int, now: float) -> pd.DataFrame:
+    """Availability seluruh jaringan per hari (kolom: day, up_s, down_s, observed_s, availability_pct)."""
+    start_ts, end_ts = day_bounds(start_day, end_day)
+    closed = store.daily_totals(source, start_day, end_day)
+    ongoing = split_daily(_ongoing(store, source, start_ts, end_ts, now))
+    totals = pd.concat([closed, ongoing[["day", "status", "seconds"]]], ignore_index=True)
+    if totals.empty:
+        return pd.DataFrame(columns=["day", "up_s", "down_s", "observed_s", "availability_pct"])
+
+    is_down = totals["status"].isin(down_statuses)
+    per_day = pd.DataFrame(
+        {
+            "day": totals["day"].astype(np.int64),
+            "up_s": totals["seconds"].where(~is_down, 0.0),
+            "down_s": totals["seconds"].where(is_down, 0.0),
+        }
+    ).groupby("day", as_index=False).sum()
+    return _with_pct(per_day)
+
+
+def _with_pct(df: pd.DataFrame) -> pd.DataFrame:
+    observed = df["up_s"] + df["down_s"]
+    return df.assign(
+        observed_s=observed,
+        availability_pct=(100.0 * df["up_s"] / observed.where(observed > 0)).round(3),
+    )
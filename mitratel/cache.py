@@ -0,0 +1,115 @@
+"""
+Cache hasil fetch yang dipakai bersama oleh semua sesi Streamlit.
+
+Modul ini hanya di-import sekali per proses server, jadi objek di level
+modul tetap hidup antar rerun dan antar sesi browser. Request yang sama
+(key sama) dalam rentang TTL dilayani dari cache, dan refresh yang terjadi
+bersamaan menunggu satu request yang sedang berjalan (single-flight).
+Entry yang kedaluwarsa dibuang, dan jumlah entry dibatasi
+(CACHE_MAX_ENTRIES, yang paling lama diambil dibuang dulu) supaya setiap
+range SISS / window harian tidak tertahan di memori selamanya.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from . import config
+
+
+@dataclass
+class CacheResult:
+    value: Any
+    fetched_at: float        # epoch detik saat data diambil dari upstream
+    from_cache: bool
+    age: float               # umur data (detik) saat dilayani
+
+
+class _Flight:
+    """Satu request upstream yang sedang berjalan untuk sebuah key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.fetched_at: float = 0.0
+        self.error: BaseException | None = None
+
+
+class FetchCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Urut waktu fetch (paling lama di depan)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+
+    def get_or_fetch(self, key: Hashable, fetch_fn: Callable[[], Any]) -> CacheResult:
+        """
+        Ambil nilai untuk `key` dari cache kalau masih segar; kalau tidak,
+        jalankan `fetch_fn` sekali saja walaupun dipanggil banyak thread.
+        Error dari `fetch_fn` tidak di-cache dan diteruskan ke semua penunggu.
+        """
+        with self._lock:
+            now = time.time()
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                return CacheResult(entry[0], entry[1], True, now - entry[1])
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return CacheResult(
+                flight.value, flight.fetched_at, True, time.time() - flight.fetched_at
+            )
+
+        try:
+            flight.value = fetch_fn()
+            flight.fetched_at = time.time()
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (flight.value, flight.fetched_at)
+                self._evict(flight.fetched_at)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+        return CacheResult(flight.value, flight.fetched_at, False, 0.0)
+
+    def _evict(self, now: float):
+        """Buang entry kedaluwarsa lalu yang paling lama sampai <= max_entries (lock dipegang)."""
+        while self._entries:
+            key, (_, fetched_at) = next(iter(self._entries.items()))
+            if now - fetched_at < self.ttl and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def invalidate(self, key: Hashable | None = None):
+        """Hapus satu key (atau semua kalau None) dari cache."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Instance bersama untuk seluruh proses server
+shared_cache = FetchCache(ttl=config.CACHE_TTL_SECONDS, max_entries=config.CACHE_MAX_ENTRIES)
@@ -0,0 +1,117 @@
+"""
+Entry point command-line (tanpa Streamlit) untuk cron/batch:
+
+    python -m mitratel collect --source siss --from 2025-01-01 --to 2025-01-07 \
+        --chunk week --output siss.parquet
+    python -m mitratel collect --source tower --output tower.csv
+    python -m mitratel serve --port 8765 --poll-interval 300
+
+Setiap collect menyimpan snapshot lokal & riwayat status yang sama dengan
+dashboard (bisa dimatikan dengan --no-snapshot / --no-history); `serve`
+menyajikan snapshot terbaru lewat HTTP API lokal (lihat mitratel.api).
+Modul berat (pandas, requests, ...) baru diimpor saat perintah dijalankan.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet")
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal tidak valid (format YYYY-MM-DD): {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m mitratel",
+        description="Mitratel Monitoring: ambil & export data tanpa UI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    collect = commands.add_parser(
+        "collect", help="ambil data upstream, simpan snapshot & riwayat, opsional export ke file"
+    )
+    collect.add_argument("--source", choices=("tower", "siss"), required=True)
+    collect.add_argument("--from", dest="start", type=_date,
+                         help="tanggal awal WIB, YYYY-MM-DD (SISS; default POLL_SISS_DAYS terakhir)")
+    collect.add_argument("--to", dest="end", type=_date, help="tanggal akhir WIB, YYYY-MM-DD (SISS)")
+    collect.add_argument("--chunk", choices=("off", "day", "week"),
+                         help="pecah range SISS per hari/minggu (default SISS_CHUNK_MODE)")
+    collect.add_argument("-o", "--output", help="file export (.xlsx / .csv / .parquet)")
+    collect.add_argument("--format", choices=EXPORT_FORMATS,
+                         help="format export kalau tidak bisa ditebak dari ekstensi")
+    collect.add_argument("--no-snapshot", action="store_true", help="jangan simpan snapshot lokal")
+    collect.add_argument("--no-history", action="store_true", help="jangan rekam riwayat status")
+    collect.set_defaults(func=cmd_collect)
+
+    serve = commands.add_parser("serve", help="HTTP API JSON/Arrow untuk snapshot tower & SISS terbaru")
+    serve.add_argument("--host", help="alamat bind (default API_HOST)")
+    serve.add_argument("--port", type=int, help="port (default API_PORT)")
+    serve.add_argument("--poll-interval", type=float,
+                       help="detik antar refresh upstream di proses ini (default POLL_INTERVAL_SECONDS; 0 = mati)")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def cmd_collect(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if (args.start is None) != (args.end is None):
+        parser.error("--from dan --to harus diisi bersamaan")
+    if args.source == "tower" and (args.start or args.chunk):
+        parser.error("--from/--to/--chunk hanya berlaku untuk --source siss")
+
+    from .exports import export_file, format_from_path
+
+    if args.output and not (args.format or format_from_path(args.output)):
+        parser.error(f"format export tidak bisa ditebak dari {args.output!r}; pakai --format")
+
+    from .collect import collect_siss, collect_tower
+
+    started = time.perf_counter()
+    options = {"snapshot": not args.no_snapshot, "history": not args.no_history}
+    if args.source == "tower":
+        collected = collect_tower(**options)
+    else:
+        collected = collect_siss(args.start, args.end, args.chunk, **options)
+    df = collected.result.value
+
+    range_info = f" (range {collected.range_str})" if collected.range_str else ""
+    print(
+        f"{args.source}: {len(df):,} baris diambil dalam "
+        f"{time.perf_counter() - started:.1f} detik{range_info}"
+    )
+    if collected.snapshot is not None:
+        print(f"snapshot: {collected.snapshot.path}")
+    if options["history"]:
+        print(f"riwayat: {collected.transitions:,} perubahan status tercatat")
+
+    if args.output:
+        started = time.perf_counter()
+        fmt = export_file(df, args.output, args.format)
+        print(f"export: {args.output} ({fmt}, {time.perf_counter() - started:.1f} detik)")
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    from . import config
+    from .api import serve
+
+    interval = config.POLL_INTERVAL_SECONDS if args.poll_interval is None else args.poll_interval
+    serve(args.host or config.API_HOST, args.port or config.API_PORT, interval)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args, parser)
+    except (RuntimeError, ValueError, OSError) as e:
+        # requests.RequestException turunan OSError
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,127 @@
+"""
+Pipeline pengambilan data tanpa UI: fetch -> snapshot lokal -> riwayat status.
+
+Dipakai poller latar belakang di dashboard dan CLI (`python -m mitratel
+collect ...`); modul ini (dan semua yang diimpornya) tidak mengimpor
+Streamlit.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import pandas as pd
+
+from . import config
+from .cache import CacheResult
+from .delta import FrameDelta, site_key_column
+from .history import history_store
+from .metrics import span
+from .siss import load_siss_df, load_siss_df_chunked, siss_range
+from .siss_chunks import CHUNK_MODES, ChunkTiming
+from .snapshots import SnapshotInfo, snapshot_store
+from .timeutil import now_wib
+from .tower import load_tower_df
+from .views import dataset_version
+
+
+@dataclass
+class Collected:
+    kind: str
+    result: CacheResult
+    range_str: str | None = None
+    timings: list[ChunkTiming] = field(default_factory=list)
+    snapshot: SnapshotInfo | None = None
+    transitions: int = 0
+
+
+# Kolom identitas site & status "down" per sumber untuk riwayat status
+HISTORY_SITE_COLUMNS = {"siss": "Site Name"}
+DOWN_STATUSES = {"siss": ("CRITICAL",), "tower": ("Offline",)}
+
+
+def default_siss_dates() -> tuple[date, date]:
+    """Rentang SISS bawaan (poller & sidebar): POLL_SISS_DAYS hari terakhir s.d. hari ini WIB."""
+    today = now_wib().date()
+    return today - timedelta(days=config.POLL_SISS_DAYS), today
+
+
+def history_siss_range() -> str:
+    """Label range SISS yang direkam ke riwayat bersama (window bawaan poller)."""
+    return siss_range(*default_siss_dates())[2]
+
+
+def update_status_history(kind: str, df_new: pd.DataFrame, delta: FrameDelta | None = None,
+                          base_version: str | None = None, range_str: str | None = None) -> int:
+    """
+    Merekam perubahan status per site ke riwayat bersama (SQLite):
+    - Simpan kapan status (NORMAL/CRITICAL, Online/Offline) mulai
+    - Jika terjadi perubahan, hitung durasi status sebelumnya
+      dan simpan ke log riwayat.
+    Kalau ada delta terhadap dataset yang terakhir direkam, hanya baris
+    yang berubah yang diproses. Kembalikan jumlah perubahan yang tercatat.
+
+    Riwayat SISS adalah satu aliran untuk semua sesi, jadi hanya data dari
+    range bawaan poller (`range_str` == history_siss_range()) yang direkam;
+    range lain pilihan sesi akan memunculkan transisi & downtime palsu.
+    """
+    if kind == "siss" and range_str != history_siss_range():
+        return 0
+    site_col = HISTORY_SITE_COLUMNS.get(kind) or site_key_column(df_new)
+    if site_col is None:
+        return 0
+    version = dataset_version(df_new)
+    incremental = delta is not None and base_version is not None
+    with span("history", source=kind, incremental=incremental):
+        if incremental:
+            return history_store.record_incremental(
+                kind, df_new, delta.touched_rows(df_new), site_col, "Status",
+                version, base_version,
+            )
+        return history_store.record(kind, df_new, site_col, "Status", version=version)
+
+
+def persist_result(kind: str, result: CacheResult, meta: dict | None = None) -> SnapshotInfo | None:
+    """Simpan hasil fetch ke disk (sekali per fetch upstream, bukan per sesi)."""
+    if result.from_cache:
+        return None
+    with span("snapshot", source=kind) as s:
+        info = snapshot_store.save(kind, result.value, meta, taken_at=result.fetched_at)
+        s.bytes = info.size
+    return info
+
+
+def collect_tower(snapshot: bool = True, history: bool = True) -> Collected:
+    """Ambil report tower, simpan snapshot dan rekam riwayat Online/Offline."""
+    result = load_tower_df()
+    collected = Collected("tower", result)
+    if snapshot:
+        collected.snapshot = persist_result("tower", result)
+    if history:
+        collected.transitions = update_status_history("tower", result.value)
+    return collected
+
+
+def collect_siss(start_date: date | None = None, end_date: date | None = None,
+                 chunk_mode: str | None = None, snapshot: bool = True,
+                 history: bool = True) -> Collected:
+    """
+    Ambil SISS untuk rentang tanggal (default: POLL_SISS_DAYS terakhir),
+    simpan snapshot dan rekam riwayat NORMAL/CRITICAL.
+    """
+    if start_date is None or end_date is None:
+        start_date, end_date = default_siss_dates()
+    mode = config.SISS_CHUNK_MODE if chunk_mode is None else chunk_mode
+    start_dt, end_dt, range_str = siss_range(start_date, end_date)
+
+    timings: list[ChunkTiming] = []
+    if mode in CHUNK_MODES:
+        result, timings = load_siss_df_chunked(start_dt, end_dt, mode)
+    else:
+        result = load_siss_df(start_dt, end_dt)
+
+    collected = Collected("siss", result, range_str, timings)
+    if snapshot:
+        collected.snapshot = persist_result("siss", result, {"range": range_str})
+    if history:
+        collected.transitions = update_status_history("siss", result.value, range_str=range_str)
+    return collected
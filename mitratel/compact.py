@@ -0,0 +1,96 @@
+"""
+Normalisasi tipe kolom supaya frame tower/SISS hemat memori.
+
+Dijalankan sekali saat data masuk (setelah parse), bukan di setiap render:
+- kolom teks dengan nilai unik sedikit (Status, Region, ...) -> category
+- koordinat (latitude/longitude/lat/lon/long) -> float32
+- kolom ID (tenantId, *id) yang numerik -> integer terkecil; kalau teks
+  dengan sedikit nilai unik -> category
+- kolom teks lain yang masih object -> string Arrow
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    # String ber-backend Arrow dengan NaN sebagai nilai kosong (perilaku
+    # perbandingan sama seperti object, tapi jauh lebih hemat memori)
+    ARROW_STRING = pd.StringDtype(storage="pyarrow", na_value=np.nan)
+except (TypeError, ImportError):
+    ARROW_STRING = None
+
+COORD_NAMES = {"latitude", "longitude", "lat", "lon", "long", "lng"}
+# Kolom teks dijadikan category kalau rasio nilai unik <= ini
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MIN_ROWS = 50
+
+
+def _is_text(series: pd.Series) -> bool:
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _to_float32(series: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(series, errors="coerce")
+    # Jangan konversi kalau ada nilai non-kosong yang bukan angka
+    if (numeric.isna() & series.notna() & (series.astype(str).str.strip() != "")).any():
+        return series
+    return numeric.astype("float32")
+
+
+def _is_id_column(name: str) -> bool:
+    lowered = name.lower()
+    return lowered == "id" or lowered.endswith("id") or lowered.endswith("_id")
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Kembalikan frame baru dengan tipe kolom yang lebih ringkas."""
+    out = {}
+    n = len(df)
+    for col in df.columns:
+        s = df[col]
+        name = str(col)
+
+        if name.lower() in COORD_NAMES and not isinstance(s.dtype, pd.CategoricalDtype):
+            if _is_text(s) or pd.api.types.is_float_dtype(s.dtype):
+                s = _to_float32(s)
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="float") if _is_id_column(name) else s
+        elif _is_text(s) and (
+            (n >= CATEGORY_MIN_ROWS and s.nunique(dropna=True) <= CATEGORY_MAX_RATIO * n)
+            or (n and name in ("Status", "Region"))
+        ):
+            s = s.astype("category")
+        elif s.dtype == object and ARROW_STRING is not None:
+            if s.map(lambda v: isinstance(v, str) or v is None or v != v).all():
+                s = s.astype(ARROW_STRING)
+        out[col] = s
+
+    return pd.DataFrame(out, index=df.index)
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memori per kolom: tipe sekarang vs representasi lama (semua kolom object
+    string Python), dalam KB.
+    """
+    current = df.memory_usage(index=False, deep=True)
+    as_object = df.astype(object).memory_usage(index=False, deep=True)
+    report = pd.DataFrame(
+        {
+            "Kolom": [str(c) for c in df.columns],
+            "Tipe": [str(t) for t in df.dtypes],
+            "Sekarang (KB)": (current.to_numpy() / 1024).round(1),
+            "Sebagai object (KB)": (as_object.to_numpy() / 1024).round(1),
+        }
+    )
+    total = pd.DataFrame(
+        {
+            "Kolom": ["TOTAL"],
+            "Tipe": [""],
+            "Sekarang (KB)": [round(current.sum() / 1024, 1)],
+            "Sebagai object (KB)": [round(as_object.sum() / 1024, 1)],
+        }
+    )
+    return pd.concat([report, total], ignore_index=True)
@@ -0,0 +1,94 @@
+"""Konfigurasi bersama dashboard, dibaca dari environment / file .env."""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_float(name: str, default: float) -> float:
+    """Baca angka dari environment, pakai default kalau kosong/tidak valid."""
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+# Kredensial login: report tower (LOGIN_USERNAME/PASSWORD) dan SISS (..._1).
+LOGIN_USERNAME = os.getenv("LOGIN_USERNAME")
+LOGIN_PASSWORD = os.getenv("LOGIN_PASSWORD")
+LOGIN_USERNAME_1 = os.getenv("LOGIN_USERNAME_1")
+LOGIN_PASSWORD_1 = os.getenv("LOGIN_PASSWORD_1")
+
+# Umur maksimum data di cache bersama (detik) sebelum diambil ulang dari web.
+CACHE_TTL_SECONDS = env_float("CACHE_TTL_SECONDS", 300.0)
+# Jumlah maksimum hasil fetch (per endpoint + range/window) yang ditahan di memori.
+CACHE_MAX_ENTRIES = max(1, int(env_float("CACHE_MAX_ENTRIES", 64)))
+
+# Jumlah koneksi keep-alive per host di session login yang dipakai ulang.
+HTTP_POOL_MAXSIZE = int(env_float("HTTP_POOL_MAXSIZE", 16))
+
+# Folder lokal untuk file state/snapshot yang perlu bertahan antar restart.
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.getcwd(), "data"))
+
+# Parser tabel report tower: auto / lxml / stream / bs4 (lihat report_parser).
+REPORT_PARSER = os.getenv("REPORT_PARSER", "auto").strip().lower()
+
+# Download + decode SISS panelData secara streaming (1) atau sekaligus (0).
+SISS_STREAMING = os.getenv("SISS_STREAMING", "1").strip().lower() not in ("0", "false", "no")
+SISS_STREAM_CHUNK_BYTES = int(env_float("SISS_STREAM_CHUNK_BYTES", 256 * 1024))
+
+# Pecah range tanggal SISS jadi beberapa request: off / day / week.
+SISS_CHUNK_MODE = os.getenv("SISS_CHUNK_MODE", "off").strip().lower()
+# Jumlah request potongan SISS yang boleh jalan bersamaan.
+SISS_CHUNK_WORKERS = max(1, int(env_float("SISS_CHUNK_WORKERS", 4)))
+
+# Snapshot lokal hasil refresh (Parquet) + batas retensi.
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(DATA_DIR, "snapshots"))
+SNAPSHOT_MAX_AGE_DAYS = env_float("SNAPSHOT_MAX_AGE_DAYS", 14.0)
+SNAPSHOT_MAX_TOTAL_MB = env_float("SNAPSHOT_MAX_TOTAL_MB", 500.0)
+
+# Poller latar belakang: interval (detik, 0 = mati) dan range hari untuk SISS.
+POLL_INTERVAL_SECONDS = env_float("POLL_INTERVAL_SECONDS", 0.0)
+POLL_SISS_DAYS = int(env_float("POLL_SISS_DAYS", 7))
+
+# Database SQLite bersama untuk riwayat perubahan status.
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", os.path.join(DATA_DIR, "history.sqlite3"))
+
+# Di atas jumlah site ini peta SISS default tampil sebagai cluster agregat.
+MAP_CLUSTER_THRESHOLD = int(env_float("MAP_CLUSTER_THRESHOLD", 3000))
+
+# Cache hasil export (MB) dan batas baris sebelum default beralih ke CSV.
+EXPORT_CACHE_MB = env_float("EXPORT_CACHE_MB", 256.0)
+EXPORT_XLSX_MAX_ROWS = int(env_float("EXPORT_XLSX_MAX_ROWS", 200_000))
+
+# Jumlah hasil filter/agregasi yang disimpan di cache view bersama.
+VIEW_CACHE_ENTRIES = int(env_float("VIEW_CACHE_ENTRIES", 64))
+
+# Baris per halaman default untuk tabel data besar (dipaginasi di server).
+TABLE_PAGE_SIZE = int(env_float("TABLE_PAGE_SIZE", 100))
+
+# HTTP API lokal (python -m mitratel serve) dan cache body respons (MB).
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(env_float("API_PORT", 8765))
+API_CACHE_MB = env_float("API_CACHE_MB", 128.0)
+API_ACCESS_LOG = os.getenv("API_ACCESS_LOG", "0").strip().lower() in ("1", "true", "yes")
+
+# Metrik waktu per tahap: jumlah sampel per tahap untuk p50/p95, log JSON
+# per span, dan panel admin di sidebar dashboard.
+METRICS_WINDOW = max(1, int(env_float("METRICS_WINDOW", 200)))
+METRICS_LOG = os.getenv("METRICS_LOG", "0").strip().lower() in ("1", "true", "yes")
+METRICS_PANEL = os.getenv("METRICS_PANEL", "0").strip().lower() in ("1", "true", "yes")
+
+# Timeout (detik) koneksi & baca untuk semua request upstream, retry GET
+# dengan backoff eksponensial + jitter, dan circuit breaker per upstream.
+HTTP_CONNECT_TIMEOUT = env_float("HTTP_CONNECT_TIMEOUT", 10.0)
+HTTP_READ_TIMEOUT = env_float("HTTP_READ_TIMEOUT", 60.0)
+HTTP_RETRIES = max(0, int(env_float("HTTP_RETRIES", 3)))
+HTTP_BACKOFF_SECONDS = env_float("HTTP_BACKOFF_SECONDS", 0.5)
+BREAKER_FAILURES = max(1, int(env_float("BREAKER_FAILURES", 3)))
+BREAKER_RESET_SECONDS = env_float("BREAKER_RESET_SECONDS", 120.0)
@@ -0,0 +1,102 @@
+"""
+Delta antara dua dataset berturut-turut (refresh sebelumnya vs sekarang).
+
+Dibandingkan berdasarkan kolom identitas site:
+- added   : site yang baru muncul
+- removed : site yang hilang
+- changed : site yang statusnya berubah (kolom key, From Status, To Status)
+Konsumen hilir (riwayat status, export, dsb.) cukup memproses delta ini
+alih-alih seluruh tabel.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Kandidat kolom identitas site, urut prioritas (dicocokkan tanpa beda huruf besar/kecil)
+KEY_CANDIDATES = ("site id", "siteid", "site_id", "site name", "sitename", "site", "tenantid")
+
+
+@dataclass
+class FrameDelta:
+    key: str
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    changed: pd.DataFrame
+
+    @property
+    def is_empty(self) -> bool:
+        return self.added.empty and self.removed.empty and self.changed.empty
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+        }
+
+    def touched_rows(self, new: pd.DataFrame) -> pd.DataFrame:
+        """Baris `new` yang baru atau berubah status (input minimal untuk riwayat)."""
+        small = pd.concat([self.added[self.key], self.changed[self.key]], ignore_index=True)
+        (small_codes, new_codes), uniques = _shared_codes(small, new[self.key])
+        return new[_present(small_codes, len(uniques))[new_codes]]
+
+
+def site_key_column(df: pd.DataFrame) -> str | None:
+    """Tebak kolom identitas site dari nama kolom."""
+    lowered = {str(c).strip().lower(): c for c in df.columns}
+    for cand in KEY_CANDIDATES:
+        if cand in lowered:
+            return lowered[cand]
+    return None
+
+
+def _shared_codes(*cols: pd.Series) -> tuple[list[np.ndarray], np.ndarray]:
+    """Kode integer bersama untuk beberapa kolom key (nilai sama -> kode sama) + nilai uniknya."""
+    codes, uniques = pd.factorize(pd.concat([c.astype(str) for c in cols], ignore_index=True))
+    return np.split(codes, np.cumsum([len(c) for c in cols])[:-1]), np.asarray(uniques, dtype=object)
+
+
+def _present(codes: np.ndarray, n: int) -> np.ndarray:
+    """Mask boolean panjang `n`: kode mana yang muncul di `codes`."""
+    mask = np.zeros(n, dtype=bool)
+    mask[codes] = True
+    return mask
+
+
+def compute_delta(prev: pd.DataFrame, new: pd.DataFrame, key: str,
+                  status_col: str = "Status") -> FrameDelta:
+    """Hitung delta `prev` -> `new` secara vektor (tanpa loop per site)."""
+    prev_u = prev.dropna(subset=[key]).drop_duplicates(subset=key, keep="last")
+    new_u = new.dropna(subset=[key]).drop_duplicates(subset=key, keep="last")
+
+    # Satu factorize atas gabungan key: tiap site dapat kode integer yang sama
+    # di kedua frame, jadi keanggotaan & perbandingan status cukup indexing
+    # array (isin pada Index string Arrow jauh lebih lambat).
+    (prev_codes, new_codes), uniques = _shared_codes(prev_u[key], new_u[key])
+    in_prev = _present(prev_codes, len(uniques))
+    in_new = _present(new_codes, len(uniques))
+
+    added = new_u[~in_prev[new_codes]]
+    removed = prev_u[~in_new[prev_codes]]
+
+    if status_col in prev_u.columns and status_col in new_u.columns:
+        before = np.empty(len(uniques), dtype=object)
+        before[prev_codes] = prev_u[status_col].astype(str).to_numpy(dtype=object)
+        common = in_prev[new_codes]
+        common_codes = new_codes[common]
+        a = new_u[status_col].astype(str).to_numpy(dtype=object)[common]
+        b = before[common_codes]
+        diff = b != a
+        changed = pd.DataFrame(
+            {
+                key: uniques[common_codes[diff]],
+                "From Status": b[diff],
+                "To Status": a[diff],
+            }
+        )
+    else:
+        changed = pd.DataFrame(columns=[key, "From Status", "To Status"])
+
+    return FrameDelta(key=key, added=added, removed=removed, changed=changed)
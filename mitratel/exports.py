@@ -0,0 +1,174 @@
+"""
+Export tabel ke Excel/CSV/Parquet dengan memoization.
+
+File hanya dibuat saat tombol download diklik (lihat `download_table` di
+app.py), lalu disimpan di cache proses berdasarkan hash isi DataFrame +
+format, sehingga klik berikutnya (dari sesi mana pun) untuk data yang sama
+langsung dilayani tanpa menulis ulang workbook.
+
+CLI/batch memakai `export_file` yang menulis langsung ke path tujuan
+(tanpa cache dan tanpa menampung seluruh file di memori).
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import BinaryIO
+
+import pandas as pd
+
+from . import config
+from .metrics import span
+
+FORMATS = {
+    "xlsx": ("Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+XLSX_MAX_ROWS = 1_048_575  # batas baris Excel dikurangi header
+XLSX_BLOCK_ROWS = 20_000
+
+try:
+    import xlsxwriter
+    XLSX_ENGINE = "xlsxwriter"
+except ImportError:  # xlsxwriter opsional, fallback ke openpyxl
+    XLSX_ENGINE = "openpyxl"
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash isi + nama kolom + dtype DataFrame (vektor, tanpa loop per baris)."""
+    h = hashlib.sha1()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _write_xlsx(df: pd.DataFrame, target: str | BinaryIO):
+    if len(df) > XLSX_MAX_ROWS:
+        raise ValueError(
+            f"{len(df)} baris melebihi batas Excel; gunakan format CSV atau Parquet."
+        )
+    if XLSX_ENGINE != "xlsxwriter":
+        df.to_excel(target, index=False)
+        return
+
+    # constant_memory: setiap baris langsung di-flush ke file sementara, jadi
+    # baris wajib ditulis berurutan (pandas.to_excel menulis per kolom).
+    workbook = xlsxwriter.Workbook(
+        target,
+        {
+            "constant_memory": True,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        },
+    )
+    sheet = workbook.add_worksheet("Sheet1")
+    bold = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    sheet.write_row(0, 0, [str(c) for c in df.columns], bold)
+
+    row_no = 1
+    for start in range(0, len(df), XLSX_BLOCK_ROWS):
+        block = df.iloc[start:start + XLSX_BLOCK_ROWS].astype(object)
+        block = block.where(block.notna(), None)  # NaN -> sel kosong, seperti to_excel
+        for row in block.itertuples(index=False, name=None):
+            sheet.write_row(row_no, 0, row)
+            row_no += 1
+    workbook.close()
+
+
+def _write_csv(df: pd.DataFrame, target: str | BinaryIO):
+    # utf-8-sig supaya Excel langsung mengenali encoding
+    df.to_csv(target, index=False, encoding="utf-8-sig")
+
+
+def _write_parquet(df: pd.DataFrame, target: str | BinaryIO):
+    df.to_parquet(target, index=False, compression="zstd")
+
+
+_WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+
+class ExportCache:
+    """LRU sederhana dibatasi total ukuran bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: OrderedDict[tuple, bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return data
+
+    def put(self, key: tuple, data: bytes):
+        with self._lock:
+            if len(data) > self.max_bytes:
+                return
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+export_cache = ExportCache(int(config.EXPORT_CACHE_MB * 1024 * 1024))
+
+
+def export_bytes(df: pd.DataFrame, fmt: str) -> bytes:
+    """Isi file export untuk `df` dalam format `fmt` (memoized per isi data)."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    key = (frame_fingerprint(df), fmt)
+    data = export_cache.get(key)
+    if data is None:
+        with span("export", format=fmt) as s:
+            buf = BytesIO()
+            _WRITERS[fmt](df, buf)
+            data = buf.getvalue()
+            s.bytes = len(data)
+        export_cache.put(key, data)
+    return data
+
+
+def format_from_path(path: str) -> str | None:
+    """Tebak format export dari ekstensi file (.xlsx/.csv/.parquet)."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in _WRITERS else None
+
+
+def export_file(df: pd.DataFrame, path: str, fmt: str | None = None) -> str:
+    """Tulis `df` langsung ke `path` (atomik lewat file sementara). Kembalikan format."""
+    fmt = fmt or format_from_path(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format export tidak dikenal untuk {path!r}: {fmt}")
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"  # ekstensi dipertahankan (openpyxl memilih engine dari ekstensi)
+    try:
+        with span("export", format=fmt) as s:
+            _WRITERS[fmt](df, tmp)
+            s.bytes = os.path.getsize(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return fmt
+
+
+def default_format(n_rows: int) -> str:
+    return "xlsx" if n_rows <= config.EXPORT_XLSX_MAX_ROWS else "csv"
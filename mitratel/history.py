@@ -0,0 +1,475 @@
+"""
+Riwayat perubahan status yang tahan restart dan dipakai bersama semua sesi.
+
+Disimpan di SQLite (mode WAL, jadi banyak pembaca + satu penulis bisa jalan
+bersamaan):
+- `site_state`  : status terakhir tiap site + sejak kapan
+- `transitions` : log perubahan status (dari, ke, mulai, akhir, durasi)
+- `daily_status` / `monthly_status`: total detik per (hari/bulan WIB, site,
+  status) dari transisi yang sudah selesai, untuk rollup availability
+  (lihat availability.py); `daily_network` sama tapi dijumlah semua site
+- `record_meta` : versi dataset terakhir yang direkam per source (dasar
+  rekam incremental dari delta)
+Kolom `source` memisahkan sumber data ("siss", "tower").
+
+Interval gangguan (outage) diturunkan langsung dari `transitions` (yang
+sudah selesai) dan `site_state` (yang masih berlangsung), jadi downtime per
+rentang waktu cukup satu query berindeks — tanpa membaca ulang snapshot.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from . import config
+from .availability import month_spans, month_start, split_daily
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS site_state (
+    source  TEXT NOT NULL,
+    site    TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    since   REAL NOT NULL,
+    PRIMARY KEY (source, site)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    source      TEXT NOT NULL,
+    site        TEXT NOT NULL,
+    from_status TEXT NOT NULL,
+    to_status   TEXT NOT NULL,
+    start_ts    REAL NOT NULL,
+    end_ts      REAL NOT NULL,
+    duration_s  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_site ON transitions (source, site, end_ts);
+CREATE INDEX IF NOT EXISTS idx_transitions_time ON transitions (source, end_ts);
+CREATE INDEX IF NOT EXISTS idx_transitions_from ON transitions (source, from_status, end_ts);
+CREATE TABLE IF NOT EXISTS daily_status (
+    source  TEXT NOT NULL,
+    day     INTEGER NOT NULL,
+    site    TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (source, day, site, status)
+);
+CREATE TABLE IF NOT EXISTS daily_network (
+    source  TEXT NOT NULL,
+    day     INTEGER NOT NULL,
+    status  TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (source, day, status)
+);
+CREATE TABLE IF NOT EXISTS monthly_status (
+    source  TEXT NOT NULL,
+    month   INTEGER NOT NULL,
+    site    TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (source, month, site, status)
+);
+CREATE TABLE IF NOT EXISTS record_meta (
+    source  TEXT PRIMARY KEY,
+    version TEXT
+);
+"""
+
+# Jumlah hasil bucket_totals() yang diingat (per rentang & id transisi terakhir)
+TOTALS_CACHE_ENTRIES = 32
+
+TRANSITION_COLUMNS = ["site", "from_status", "to_status", "start_ts", "end_ts", "duration_s"]
+OUTAGE_COLUMNS = ["site", "status", "start_ts", "end_ts", "duration_s", "ongoing"]
+DOWNTIME_COLUMNS = ["site", "outages", "downtime_s", "longest_s", "ongoing"]
+
+
+def latest_status(df: pd.DataFrame, site_col: str, status_col: str) -> pd.Series:
+    """Series site -> status terbaru (baris kosong dibuang, site dobel ambil yang terakhir)."""
+    cur = df[[site_col, status_col]].dropna()
+    cur = cur.drop_duplicates(subset=site_col, keep="last")
+    return pd.Series(
+        cur[status_col].astype(str).to_numpy(),
+        index=pd.Index(cur[site_col].astype(str).to_numpy(), name="site"),
+        name="status",
+    )
+
+
+def diff_status(prev: pd.DataFrame, new: pd.Series, now: float) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Bandingkan state lama (index site, kolom status & since) dengan status
+    baru (Series site -> status) sekaligus, tanpa loop per site.
+
+    Kembalikan (site_baru, perubahan):
+    - site_baru : site yang belum pernah terlihat (site, status)
+    - perubahan : kolom TRANSITION_COLUMNS untuk site yang statusnya berubah
+    """
+    joined = new.to_frame("status").join(prev, how="left", rsuffix="_prev")
+    prev_status = joined["status_prev"]
+    is_new = prev_status.isna()
+    changed = ~is_new & (joined["status"] != prev_status)
+
+    new_sites = pd.DataFrame(
+        {"site": joined.index[is_new.to_numpy()], "status": joined["status"][is_new].to_numpy()}
+    )
+    ch = joined[changed]
+    since = ch["since"].to_numpy(dtype=float)
+    changes = pd.DataFrame(
+        {
+            "site": ch.index,
+            "from_status": ch["status_prev"].to_numpy(),
+            "to_status": ch["status"].to_numpy(),
+            "start_ts": since,
+            "end_ts": now,
+            "duration_s": now - since,
+        },
+        columns=TRANSITION_COLUMNS,
+    )
+    return new_sites, changes
+
+
+class StatusHistoryStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._totals_lock = threading.Lock()
+        self._totals_cache: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Satu koneksi per thread (sqlite3 tidak boleh dipakai lintas thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._backfill_daily(conn)
+                    self._initialized = True
+        return conn
+
+    def record(self, source: str, df: pd.DataFrame, site_col: str, status_col: str,
+               now: float | None = None, version: str | None = None) -> int:
+        """
+        Bandingkan status terbaru di `df` dengan state tersimpan, catat
+        perubahan ke `transitions`, dan perbarui `site_state`.
+        Kembalikan jumlah perubahan yang tercatat.
+        """
+        if site_col not in df.columns or status_col not in df.columns:
+            return 0
+        new = latest_status(df, site_col, status_col)
+        return self._record(source, new, now, version)
+
+    def record_incremental(self, source: str, df: pd.DataFrame, touched: pd.DataFrame,
+                           site_col: str, status_col: str, version: str,
+                           base_version: str, now: float | None = None) -> int:
+        """
+        Seperti record(), tapi kalau dataset terakhir yang direkam adalah
+        `base_version`, cukup proses baris `touched` (site baru/berubah dari
+        delta). Kalau tidak, jatuh ke rekam penuh supaya tidak ada perubahan
+        yang terlewat.
+        """
+        if site_col not in df.columns or status_col not in df.columns:
+            return 0
+        new = latest_status(touched, site_col, status_col)
+        return self._record(
+            source, new, now, version, base_version,
+            full=lambda: latest_status(df, site_col, status_col),
+        )
+
+    def _record(self, source: str, new: pd.Series, now: float | None, version: str | None,
+                base_version: str | None = None, full=None) -> int:
+        now = time.time() if now is None else now
+        conn = self._conn()
+        # BEGIN IMMEDIATE: sesi lain yang merekam snapshot yang sama menunggu,
+        # lalu melihat state yang sudah diperbarui (tidak ada log ganda).
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Versi terakhir dibaca & ditulis di transaksi yang sama: kalau proses
+            # lain sudah merekam dataset lain sejak `base_version`, delta tidak
+            # lagi mencakup semua perubahan -> rekam penuh.
+            sites = None
+            if full is not None:
+                if base_version is None or self._recorded_version(conn, source) != base_version:
+                    new = full()
+                else:
+                    # Cukup state site yang disentuh delta (baca per primary key)
+                    sites = new.index.tolist()
+            prev = self._load_state(conn, source, sites)
+            new_sites, changes = diff_status(prev, new, now)
+
+            conn.executemany(
+                "INSERT INTO site_state (source, site, status, since) VALUES (?, ?, ?, ?)",
+                zip(
+                    [source] * len(new_sites),
+                    new_sites["site"].tolist(),
+                    new_sites["status"].tolist(),
+                    [now] * len(new_sites),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO transitions "
+                "(source, site, from_status, to_status, start_ts, end_ts, duration_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    [source] * len(changes),
+                    *(changes[c].tolist() for c in TRANSITION_COLUMNS),
+                ),
+            )
+            self._add_daily(conn, source, changes)
+            conn.executemany(
+                "UPDATE site_state SET status = ?, since = ? WHERE source = ? AND site = ?",
+                zip(
+                    changes["to_status"].tolist(),
+                    [now] * len(changes),
+                    [source] * len(changes),
+                    changes["site"].tolist(),
+                ),
+            )
+            conn.execute(
+                "INSERT INTO record_meta (source, version) VALUES (?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET version = excluded.version",
+                (source, version),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(changes)
+
+    @staticmethod
+    def _recorded_version(conn: sqlite3.Connection, source: str) -> str | None:
+        row = conn.execute("SELECT version FROM record_meta WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _add_daily(conn: sqlite3.Connection, source: str, changes: pd.DataFrame):
+        """Tambahkan interval yang baru selesai ke bucket harian & bulanan."""
+        daily = split_daily(changes.rename(columns={"from_status": "status"}))
+        monthly = (
+            daily.assign(day=month_start(daily["day"].to_numpy()))
+            .groupby(["site", "day", "status"], as_index=False, sort=False)["seconds"].sum()
+        )
+        network = daily.groupby(["day", "status"], as_index=False, sort=False)["seconds"].sum()
+        conn.executemany(
+            "INSERT INTO daily_network (source, day, status, seconds) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (source, day, status) DO UPDATE SET seconds = seconds + excluded.seconds",
+            zip(
+                [source] * len(network),
+                network["day"].tolist(),
+                network["status"].tolist(),
+                network["seconds"].tolist(),
+            ),
+        )
+        for table, col, buckets in (("daily_status", "day", daily), ("monthly_status", "month", monthly)):
+            conn.executemany(
+                f"INSERT INTO {table} (source, {col}, site, status, seconds) "
+                f"VALUES (?, ?, ?, ?, ?) "
+                f"ON CONFLICT (source, {col}, site, status) "
+                f"DO UPDATE SET seconds = seconds + excluded.seconds",
+                zip(
+                    [source] * len(buckets),
+                    buckets["day"].tolist(),
+                    buckets["site"].tolist(),
+                    buckets["status"].tolist(),
+                    buckets["seconds"].tolist(),
+                ),
+            )
+
+    def _backfill_daily(self, conn: sqlite3.Connection):
+        """
+        Isi bucket harian/bulanan dari transisi lama (database sebelum tabel ini ada).
+
+        Cek, hapus dan bangun ulang dalam satu BEGIN IMMEDIATE: proses lain yang
+        membuka database bersamaan (aplikasi + `collect`) atau sedang merekam
+        menunggu, lalu melihat bucket yang sudah terisi dan tidak mengulanginya.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not conn.execute("SELECT 1 FROM monthly_status LIMIT 1").fetchone():
+                conn.execute("DELETE FROM daily_status")
+                conn.execute("DELETE FROM daily_network")
+                for (source,) in conn.execute("SELECT DISTINCT source FROM transitions").fetchall():
+                    rows = conn.execute(
+                        "SELECT site, from_status, start_ts, end_ts FROM transitions "
+                        "WHERE source = ?",
+                        (source,),
+                    ).fetchall()
+                    changes = pd.DataFrame(rows, columns=["site", "from_status", "start_ts", "end_ts"])
+                    self._add_daily(conn, source, changes)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _load_state(conn: sqlite3.Connection, source: str,
+                    sites: list[str] | None = None) -> pd.DataFrame:
+        """State tersimpan (index site); kalau `sites` diberikan hanya site itu."""
+        sql = "SELECT site, status, since FROM site_state WHERE source = ?"
+        params: list = [source]
+        if sites is not None:
+            sql += " AND site IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(sites))
+        rows = conn.execute(sql, params).fetchall()
+        state = pd.DataFrame(rows, columns=["site", "status", "since"])
+        return state.set_index("site")
+
+    def count_transitions(self, source: str, site: str | None = None) -> int:
+        sql = "SELECT COUNT(*) FROM transitions WHERE source = ?"
+        params: list = [source]
+        if site:
+            sql += " AND site = ?"
+            params.append(site)
+        return self._conn().execute(sql, params).fetchone()[0]
+
+    def query_transitions(self, source: str, limit: int | None = None, offset: int = 0,
+                          site: str | None = None) -> pd.DataFrame:
+        """Log perubahan (terbaru dulu) dengan nilai mentah: epoch & detik."""
+        sql = f"SELECT {', '.join(TRANSITION_COLUMNS)} FROM transitions WHERE source = ?"
+        params: list = [source]
+        if site:
+            sql += " AND site = ?"
+            params.append(site)
+        sql += " ORDER BY end_ts DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        rows = self._conn().execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=TRANSITION_COLUMNS)
+
+
+    def open_intervals(self, source: str) -> pd.DataFrame:
+        """Status yang sedang berjalan per site (kolom: site, status, since)."""
+        rows = self._conn().execute(
+            "SELECT site, status, since FROM site_state WHERE source = ?", (source,)
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["site", "status", "since"])
+
+    def bucket_totals(self, source: str, start_day: int, end_day: int) -> pd.DataFrame:
+        """
+        Total detik per (site, status) dari bucket start_day..end_day: bulan
+        penuh dari `monthly_status`, hari di tepi rentang dari `daily_status`.
+        Hasil diingat sampai ada transisi baru.
+        """
+        return self._memo_totals(
+            ("site", source, start_day, end_day),
+            lambda conn: self._bucket_totals(conn, source, start_day, end_day),
+        )
+
+    def _memo_totals(self, key: tuple, compute) -> pd.DataFrame:
+        """Ingat hasil agregasi bucket sampai ada transisi baru (id terakhir berubah)."""
+        conn = self._conn()
+        last_id = conn.execute("SELECT MAX(id) FROM transitions").fetchone()[0]
+        key = key + (last_id,)
+        with self._totals_lock:
+            if key in self._totals_cache:
+                self._totals_cache.move_to_end(key)
+                return self._totals_cache[key]
+
+        totals = compute(conn)
+        with self._totals_lock:
+            self._totals_cache[key] = totals
+            while len(self._totals_cache) > TOTALS_CACHE_ENTRIES:
+                self._totals_cache.popitem(last=False)
+        return totals
+
+    @staticmethod
+    def _bucket_totals(conn: sqlite3.Connection, source: str, start_day: int,
+                       end_day: int) -> pd.DataFrame:
+        months, edges = month_spans(start_day, end_day)
+        parts = []
+        if months:
+            marks = ", ".join("?" * len(months))
+            parts.append(conn.execute(
+                f"SELECT site, status, SUM(seconds) FROM monthly_status "
+                f"WHERE source = ? AND month IN ({marks}) GROUP BY site, status",
+                [source, *months],
+            ).fetchall())
+        for lo, hi in edges:
+            parts.append(conn.execute(
+                "SELECT site, status, SUM(seconds) FROM daily_status "
+                "WHERE source = ? AND day BETWEEN ? AND ? GROUP BY site, status",
+                (source, lo, hi),
+            ).fetchall())
+        rows = [row for part in parts for row in part]
+        totals = pd.DataFrame(rows, columns=["site", "status", "seconds"])
+        if len(parts) > 1:
+            totals = totals.groupby(["site", "status"], as_index=False, sort=False)["seconds"].sum()
+        return totals
+
+    def daily_totals(self, source: str, start_day: int, end_day: int) -> pd.DataFrame:
+        """Total detik per (day, status) seluruh site dari `daily_network`."""
+        rows = self._conn().execute(
+            "SELECT day, status, seconds FROM daily_network "
+            "WHERE source = ? AND day BETWEEN ? AND ?",
+            (source, start_day, end_day),
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["day", "status", "seconds"])
+
+    def outage_intervals(self, source: str, down_statuses: tuple[str, ...],
+                         start_ts: float, end_ts: float, site: str | None = None,
+                         now: float | None = None) -> pd.DataFrame:
+        """
+        Interval saat site berstatus salah satu `down_statuses` yang beririsan
+        dengan [start_ts, end_ts), dipotong ke rentang itu. Gangguan yang
+        masih berlangsung diambil dari `site_state` (ongoing=True, akhir = now).
+        """
+        now = time.time() if now is None else now
+        marks = ", ".join("?" * len(down_statuses))
+        site_sql = " AND site = ?" if site else ""
+        site_param = [site] if site else []
+
+        conn = self._conn()
+        closed = conn.execute(
+            f"SELECT site, from_status, start_ts, end_ts FROM transitions "
+            f"WHERE source = ? AND from_status IN ({marks}) AND end_ts > ? AND start_ts < ?"
+            f"{site_sql}",
+            [source, *down_statuses, start_ts, end_ts, *site_param],
+        ).fetchall()
+        open_ = conn.execute(
+            f"SELECT site, status, since FROM site_state "
+            f"WHERE source = ? AND status IN ({marks}) AND since < ?{site_sql}",
+            [source, *down_statuses, min(end_ts, now), *site_param],
+        ).fetchall()
+
+        cols = ["site", "status", "start_ts", "end_ts"]
+        df = pd.concat(
+            [
+                pd.DataFrame(closed, columns=cols).assign(ongoing=False),
+                pd.DataFrame(
+                    [(s, st, since, now) for s, st, since in open_], columns=cols
+                ).assign(ongoing=True),
+            ],
+            ignore_index=True,
+        )
+        df["start_ts"] = df["start_ts"].astype(float).clip(lower=start_ts)
+        df["end_ts"] = df["end_ts"].astype(float).clip(upper=end_ts)
+        df["duration_s"] = df["end_ts"] - df["start_ts"]
+        df = df[df["duration_s"] > 0]
+        return df.sort_values("start_ts", ascending=False, ignore_index=True)[OUTAGE_COLUMNS]
+
+    def downtime_by_site(self, source: str, down_statuses: tuple[str, ...],
+                         start_ts: float, end_ts: float,
+                         now: float | None = None) -> pd.DataFrame:
+        """Total downtime, jumlah & gangguan terpanjang per site dalam rentang (urut downtime terbesar)."""
+        iv = self.outage_intervals(source, down_statuses, start_ts, end_ts, now=now)
+        agg = iv.groupby("site", sort=False).agg(
+            outages=("duration_s", "size"),
+            downtime_s=("duration_s", "sum"),
+            longest_s=("duration_s", "max"),
+            ongoing=("ongoing", "any"),
+        )
+        agg = agg.reset_index().sort_values("downtime_s", ascending=False, ignore_index=True)
+        return agg[DOWNTIME_COLUMNS]
+
+
+history_store = StatusHistoryStore(config.HISTORY_DB_PATH)
@@ -0,0 +1,110 @@
+"""
+Data peta SISS untuk pydeck.
+
+Payload peta dibuat dengan operasi kolom (tanpa apply per baris) dan hanya
+berisi kolom yang dipakai layer/tooltip. Ikon pin diambil dari atlas lokal
+`assets/map_pins.png` yang dikirim sekali sebagai data URI, jadi browser
+tidak perlu mengunduh PNG dari GitHub.
+"""
+
+import base64
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+PIN_ATLAS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "map_pins.png"
+)
+
+# Posisi tiap ikon di atlas (128x64: merah kiri, hijau kanan), ujung pin di bawah
+PIN_ICON_MAPPING = {
+    "CRITICAL": {"x": 0, "y": 0, "width": 64, "height": 64, "anchorY": 64, "mask": False},
+    "NORMAL": {"x": 64, "y": 0, "width": 64, "height": 64, "anchorY": 64, "mask": False},
+}
+
+# 5 desimal ~ 1 meter, cukup untuk pin dan memangkas ukuran JSON
+COORD_DECIMALS = 5
+
+
+@lru_cache(maxsize=1)
+def pin_atlas_data_uri() -> str:
+    with open(PIN_ATLAS_PATH, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
+
+
+def build_pin_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame minimal untuk IconLayer: lon, lat, Site Name, Status.
+    Status selain CRITICAL digambar sebagai NORMAL (pin hijau).
+    """
+    # float64 sebelum dibulatkan: float32 akan jadi desimal panjang di JSON
+    lat = pd.to_numeric(df["latitude"], errors="coerce").astype("float64")
+    lon = pd.to_numeric(df["longitude"], errors="coerce").astype("float64")
+    valid = lat.notna() & lon.notna()
+
+    status = df["Status"][valid].astype(str)
+    out = pd.DataFrame(
+        {
+            "lon": lon[valid].round(COORD_DECIMALS).to_numpy(),
+            "lat": lat[valid].round(COORD_DECIMALS).to_numpy(),
+            "Status": status.where(status == "CRITICAL", "NORMAL").to_numpy(),
+        }
+    )
+    if "Site Name" in df.columns:
+        out.insert(0, "Site Name", df["Site Name"][valid].astype(str).to_numpy())
+    return out
+
+
+# ============================================================
+#  CLUSTER / AGREGAT GRID UNTUK PETA NASIONAL
+# ============================================================
+
+# Level zoom peta -> ukuran sel grid (derajat). Makin dekat, sel makin kecil.
+# st.pydeck_chart tidak mengirim viewport (pan/zoom) balik ke Python, jadi
+# level dipilih lewat slider dan hanya level itu yang dihitung & dikirim.
+CLUSTER_LEVELS = {4: 2.0, 5: 1.0, 6: 0.5, 7: 0.25, 8: 0.1}
+DEFAULT_CLUSTER_ZOOM = 5
+
+# Kolom sel yang dibaca layer (posisi, radius) & tooltip (total, critical);
+# ix/iy untuk drill-down tetap di server
+CLUSTER_LAYER_COLUMNS = ["lon", "lat", "radius", "total", "critical"]
+
+
+def cluster_pins(pins: pd.DataFrame, cell_deg: float) -> pd.DataFrame:
+    """
+    Kelompokkan pin ke sel grid berukuran `cell_deg` derajat.
+    Hasil per sel: indeks sel (ix, iy), posisi rata-rata, jumlah total &
+    CRITICAL, radius tampilan.
+    """
+    ix = (pins["lon"] // cell_deg).astype("int64")
+    iy = (pins["lat"] // cell_deg).astype("int64")
+    is_critical = pins["Status"] == "CRITICAL"
+
+    grouped = pd.DataFrame(
+        {"ix": ix, "iy": iy, "lon": pins["lon"], "lat": pins["lat"], "critical": is_critical}
+    ).groupby(["ix", "iy"], sort=False)
+    cells = grouped.agg(
+        lon=("lon", "mean"),
+        lat=("lat", "mean"),
+        total=("critical", "size"),
+        critical=("critical", "sum"),
+    ).reset_index()
+
+    cells["critical"] = cells["critical"].astype("int64")
+    cells["radius"] = (6 + cells["total"] ** 0.5 * 2).clip(upper=60).round(1)
+    cells["lon"] = cells["lon"].round(COORD_DECIMALS)
+    cells["lat"] = cells["lat"].round(COORD_DECIMALS)
+    return cells
+
+
+def cluster_level(pins: pd.DataFrame, zoom: int) -> pd.DataFrame:
+    """Cluster untuk satu level zoom (CLUSTER_LEVELS)."""
+    return cluster_pins(pins, CLUSTER_LEVELS[zoom])
+
+
+def pins_in_cell(pins: pd.DataFrame, cell_deg: float, ix: int, iy: int) -> pd.DataFrame:
+    """Pin individual di dalam satu sel grid (untuk drill-down)."""
+    mask = ((pins["lon"] // cell_deg) == ix) & ((pins["lat"] // cell_deg) == iy)
+    return pins[mask]
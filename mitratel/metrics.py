@@ -0,0 +1,160 @@
+"""
+Span waktu per tahap pipeline fetch + metrik bergulir di memori.
+
+    with span("report_get", source="siss") as s:
+        resp = ...
+        s.bytes = len(resp.content)
+
+Setiap span dicatat ke `metrics` per (stage, label): N durasi terakhir
+(METRICS_WINDOW) untuk p50/p95, plus total kumulatif sejak proses mulai.
+Dibaca panel admin di sidebar dan endpoint /metrics API (format teks
+Prometheus); dengan METRICS_LOG=1 setiap span juga ditulis ke log sebagai
+satu baris JSON.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = [
+    "stage", "labels", "count", "errors", "last_s", "p50_s", "p95_s", "max_s",
+    "last_bytes", "total_bytes", "last_at",
+]
+
+
+@dataclass
+class Span:
+    stage: str
+    labels: dict[str, str]
+    started_at: float = 0.0          # epoch detik
+    seconds: float = 0.0
+    bytes: int | None = None         # byte yang ditransfer/dihasilkan (kalau relevan)
+    ok: bool = True
+
+
+@dataclass
+class _Series:
+    durations: deque
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    total_bytes: int = 0
+    last: Span | None = None
+
+
+class MetricsStore:
+    def __init__(self, window: int):
+        self.window = window
+        self._lock = threading.Lock()
+        self._series: dict[tuple, _Series] = {}
+
+    def record(self, s: Span):
+        key = (s.stage, tuple(sorted(s.labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(deque(maxlen=self.window))
+            series.durations.append(s.seconds)
+            series.count += 1
+            series.errors += not s.ok
+            series.total_seconds += s.seconds
+            series.total_bytes += s.bytes or 0
+            series.last = s
+        if config.METRICS_LOG:
+            logger.info(json.dumps({
+                "stage": s.stage, **s.labels, "started_at": round(s.started_at, 3),
+                "seconds": round(s.seconds, 4), "bytes": s.bytes, "ok": s.ok,
+            }))
+
+    def _snapshot(self) -> list[tuple[tuple, _Series, np.ndarray]]:
+        with self._lock:
+            return [
+                (key, series, np.fromiter(series.durations, dtype=float))
+                for key, series in sorted(self._series.items())
+            ]
+
+    def summary(self) -> pd.DataFrame:
+        """Satu baris per (stage, label): jumlah, error, durasi terakhir, p50/p95/max jendela."""
+        rows = []
+        for (stage, labels), series, durations in self._snapshot():
+            p50, p95 = np.percentile(durations, [50, 95])
+            rows.append({
+                "stage": stage,
+                "labels": ", ".join(f"{k}={v}" for k, v in labels),
+                "count": series.count,
+                "errors": series.errors,
+                "last_s": series.last.seconds,
+                "p50_s": p50,
+                "p95_s": p95,
+                "max_s": durations.max(),
+                "last_bytes": series.last.bytes,
+                "total_bytes": series.total_bytes,
+                "last_at": series.last.started_at,
+            })
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+    def prometheus_text(self) -> str:
+        """Metrik dalam format eksposisi teks Prometheus (summary + counter)."""
+        lines = [
+            "# HELP mitratel_stage_seconds Durasi tahap pipeline (kuantil dari jendela terakhir).",
+            "# TYPE mitratel_stage_seconds summary",
+        ]
+        bytes_lines, error_lines = [], []
+        for (stage, labels), series, durations in self._snapshot():
+            base = _label_text({"stage": stage, **dict(labels)})
+            for q, value in zip(("0.5", "0.95"), np.percentile(durations, [50, 95])):
+                q_labels = _label_text({"stage": stage, **dict(labels), "quantile": q})
+                lines.append(f"mitratel_stage_seconds{q_labels} {value:.6f}")
+            lines.append(f"mitratel_stage_seconds_sum{base} {series.total_seconds:.6f}")
+            lines.append(f"mitratel_stage_seconds_count{base} {series.count}")
+            bytes_lines.append(f"mitratel_stage_bytes_total{base} {series.total_bytes}")
+            error_lines.append(f"mitratel_stage_errors_total{base} {series.errors}")
+        lines += [
+            "# HELP mitratel_stage_bytes_total Byte yang ditransfer/dihasilkan per tahap.",
+            "# TYPE mitratel_stage_bytes_total counter",
+            *bytes_lines,
+            "# HELP mitratel_stage_errors_total Span yang berakhir dengan exception.",
+            "# TYPE mitratel_stage_errors_total counter",
+            *error_lines,
+        ]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _label_text(labels: dict[str, str]) -> str:
+    def esc(v) -> str:
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """Ukur satu tahap; exception tetap diteruskan tapi dicatat sebagai error."""
+    s = Span(stage, {k: str(v) for k, v in labels.items()}, started_at=time.time())
+    t0 = time.perf_counter()
+    try:
+        yield s
+    except BaseException:
+        s.ok = False
+        raise
+    finally:
+        s.seconds = time.perf_counter() - t0
+        metrics.record(s)
+
+
+metrics = MetricsStore(config.METRICS_WINDOW)
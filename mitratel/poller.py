@@ -0,0 +1,80 @@
+"""
+Poller latar belakang yang mengambil data upstream secara berkala.
+
+Poller berjalan di thread daemon terpisah dari script Streamlit, menjalankan
+setiap job (fetch + simpan snapshot) tiap `interval` detik. Halaman cukup
+membaca snapshot terbaru, jadi waktu render tidak lagi bergantung pada
+lambatnya upstream.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobStatus:
+    name: str
+    runs: int = 0
+    failures: int = 0
+    last_started: float | None = None
+    last_finished: float | None = None
+    last_duration: float | None = None
+    last_error: str | None = None
+
+
+class BackgroundPoller:
+    def __init__(self, jobs: dict[str, Callable[[], None]], interval: float):
+        self.jobs = jobs
+        self.interval = interval
+        self.status = {name: JobStatus(name) for name in jobs}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="mitratel-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """Jalankan semua job sekali (berurutan); error satu job tidak menghentikan yang lain."""
+        for name, job in self.jobs.items():
+            if self._stop.is_set():
+                return
+            st = self.status[name]
+            st.last_started = time.time()
+            try:
+                job()
+                st.last_error = None
+            except Exception as e:
+                st.failures += 1
+                st.last_error = str(e)
+                logger.warning("Poller job %s gagal: %s", name, e)
+            finally:
+                st.runs += 1
+                st.last_finished = time.time()
+                st.last_duration = st.last_finished - st.last_started
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.run_once()
+            elapsed = time.monotonic() - started
+            self._stop.wait(max(0.0, self.interval - elapsed))
@@ -0,0 +1,189 @@
+"""
+Ekstraktor tabel pertama dari halaman get-report tower.
+
+Ada tiga jalur yang menghasilkan header + baris teks yang sudah di-strip:
+- "lxml"   : parser C dari lxml (tercepat, butuh paket lxml)
+- "stream" : HTMLParser bawaan Python berbasis event, hanya menyimpan isi
+             tabel pertama dan berhenti membaca begitu tabel itu selesai
+- "bs4"    : cara lama, BeautifulSoup + html.parser
+Mode "auto" memakai lxml kalau terpasang, kalau tidak "stream".
+
+Output ketiganya hanya dijamin identik untuk HTML yang well-formed. Pada HTML
+rusak (mis. <td> tidak ditutup, tabel bersarang di dalam sel) tiap parser
+memperbaiki markup dengan caranya sendiri, sehingga sel/baris bisa berbeda.
+"""
+
+from html.parser import HTMLParser
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml opsional
+    lxml_html = None
+
+PARSERS = ("auto", "lxml", "stream", "bs4")
+FEED_CHUNK_SIZE = 1 << 16
+
+
+class TableNotFound(RuntimeError):
+    pass
+
+
+def extract_table_bs4(html: str) -> tuple[list[str], list[list[str]]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    tables = soup.find_all("table")
+    if not tables:
+        raise TableNotFound("Tidak ada tabel di halaman report tower.")
+
+    table = tables[0]
+    thead = table.find("thead")
+    tbody = table.find("tbody")
+
+    if thead is None or tbody is None:
+        raise TableNotFound("thead/tbody tidak ditemukan pada tabel tower.")
+
+    headers = [th.text.strip() for th in thead.find_all("th")]
+    rows = [
+        [td.text.strip() for td in tr.find_all("td")]
+        for tr in tbody.find_all("tr")
+    ]
+    return headers, rows
+
+
+def extract_table_lxml(html: str) -> tuple[list[str], list[list[str]]]:
+    if lxml_html is None:
+        raise ImportError("Paket lxml tidak terpasang.")
+
+    doc = lxml_html.fromstring(html)
+    table = doc if doc.tag == "table" else doc.find(".//table")
+    if table is None:
+        raise TableNotFound("Tidak ada tabel di halaman report tower.")
+
+    thead = table.find(".//thead")
+    tbody = table.find(".//tbody")
+    if thead is None or tbody is None:
+        raise TableNotFound("thead/tbody tidak ditemukan pada tabel tower.")
+
+    headers = [th.text_content().strip() for th in thead.iter("th")]
+    rows = [
+        [td.text_content().strip() for td in tr.iter("td")]
+        for tr in tbody.iter("tr")
+    ]
+    return headers, rows
+
+
+class _FirstTableParser(HTMLParser):
+    """Parser event-driven: kumpulkan th (di thead) & td (di tbody) tabel pertama."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headers: list[str] = []
+        self.rows: list[list[str]] = []
+        self.found_table = False
+        self.seen_thead = False
+        self.seen_tbody = False
+        self.done = False
+        self._table_depth = 0
+        self._section = None       # "thead" / "tbody" / None
+        self._row: list[str] | None = None
+        self._cell: list[str] | None = None
+
+    def _close_cell(self):
+        if self._cell is None:
+            return
+        text = "".join(self._cell).strip()
+        self._cell = None
+        if self._section == "thead":
+            self.headers.append(text)
+        elif self._row is not None:
+            self._row.append(text)
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self._table_depth += 1
+            self.found_table = True
+            return
+        if self._table_depth == 0:
+            return
+        if tag == "thead" and not self.seen_thead:
+            self.seen_thead = True
+            self._section = "thead"
+        elif tag == "tbody" and not self.seen_tbody:
+            self._close_cell()
+            self.seen_tbody = True
+            self._section = "tbody"
+        elif tag == "tr" and self._section == "tbody":
+            self._close_row()
+            self._row = []
+        elif (tag == "th" and self._section == "thead") or (
+            tag == "td" and self._section == "tbody" and self._row is not None
+        ):
+            self._close_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or self._table_depth == 0:
+            return
+        if tag in ("th", "td"):
+            self._close_cell()
+        elif tag == "tr" and self._section == "tbody":
+            self._close_row()
+        elif tag in ("thead", "tbody") and tag == self._section:
+            self._close_row()
+            self._section = None
+        elif tag == "table":
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self._close_row()
+                self._section = None
+                self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def extract_table_stream(html: str) -> tuple[list[str], list[list[str]]]:
+    parser = _FirstTableParser()
+    for start in range(0, len(html), FEED_CHUNK_SIZE):
+        parser.feed(html[start:start + FEED_CHUNK_SIZE])
+        if parser.done:
+            break
+    else:
+        parser.close()
+        parser._close_row()
+
+    if not parser.found_table:
+        raise TableNotFound("Tidak ada tabel di halaman report tower.")
+    if not parser.seen_thead or not parser.seen_tbody:
+        raise TableNotFound("thead/tbody tidak ditemukan pada tabel tower.")
+    return parser.headers, parser.rows
+
+
+def extract_report_table(html: str, parser: str = "auto") -> tuple[list[str], list[list[str]]]:
+    """
+    Ambil (headers, rows) tabel pertama dengan parser pilihan. Kalau jalur
+    cepat gagal karena alasan apa pun, ulangi dengan BeautifulSoup.
+    """
+    if parser not in PARSERS:
+        parser = "auto"
+    if parser == "auto":
+        parser = "lxml" if lxml_html is not None else "stream"
+
+    if parser == "bs4":
+        return extract_table_bs4(html)
+
+    fast = extract_table_lxml if parser == "lxml" else extract_table_stream
+    try:
+        return fast(html)
+    except Exception:
+        return extract_table_bs4(html)
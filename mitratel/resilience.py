@@ -0,0 +1,136 @@
+"""
+Ketahanan fetch upstream: retry GET dengan backoff + circuit breaker.
+
+- `retry_policy()`: retry urllib3 untuk adapter session login — gagal
+  koneksi, read error dan 429/5xx dicoba ulang dengan backoff eksponensial
+  + jitter; hanya method idempotent (GET/HEAD), login POST tidak diulang
+  kecuali koneksinya belum tersambung sama sekali.
+- `CircuitBreaker`: setelah BREAKER_FAILURES kegagalan beruntun, fetch ke
+  upstream itu langsung ditolak (CircuitOpenError) selama
+  BREAKER_RESET_SECONDS, jadi sesi/poller tidak ikut menunggu timeout dan
+  dashboard menampilkan snapshot terakhir. Setelah jeda itu satu request
+  percobaan dibiarkan lewat (half-open): berhasil -> closed, gagal -> open lagi.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from urllib3.util import Retry
+
+from . import config
+from .timeutil import epoch_to_wib
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def retry_policy() -> Retry:
+    return Retry(
+        total=config.HTTP_RETRIES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=config.HTTP_BACKOFF_SECONDS,
+        backoff_jitter=config.HTTP_BACKOFF_SECONDS,
+        backoff_max=30.0,
+        respect_retry_after_header=True,
+        # Status akhir dikembalikan apa adanya; pemanggil yang memeriksa status
+        raise_on_status=False,
+    )
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+@dataclass
+class BreakerState:
+    name: str
+    state: str
+    failures: int                    # kegagalan beruntun
+    opened_at: float | None = None
+    retry_at: float | None = None
+    last_error: str | None = None
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._last_error: str | None = None
+        self._trial_running = False
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.time() >= self._opened_at + self.reset_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Jalankan `fn` lewat breaker; kalau open, tolak tanpa menghubungi upstream."""
+        if not self._allow():
+            state = self.state()
+            retry = epoch_to_wib(state.retry_at).strftime("%H:%M:%S") if state.retry_at else "-"
+            raise CircuitOpenError(
+                f"Upstream {self.name} sedang gangguan ({state.failures}x gagal beruntun), "
+                f"dicoba lagi setelah {retry} WIB. Error terakhir: {state.last_error}"
+            )
+        try:
+            value = fn()
+        except BaseException as e:
+            self.record_failure(e)
+            raise
+        self._record_success()
+        return value
+
+    def _record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._last_error = None
+            self._trial_running = False
+
+    def record_failure(self, error: BaseException):
+        """Catat kegagalan yang terjadi di luar call() (mis. body stream putus)."""
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error) or type(error).__name__
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.time()
+            self._trial_running = False
+
+    def state(self) -> BreakerState:
+        with self._lock:
+            retry_at = None
+            if self._state != CLOSED and self._opened_at is not None:
+                retry_at = self._opened_at + self.reset_timeout
+            return BreakerState(
+                self.name, self._state, self._failures, self._opened_at, retry_at, self._last_error
+            )
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def upstream_breaker(name: str) -> CircuitBreaker:
+    """Ambil (atau buat sekali) breaker bersama untuk upstream `name` ("tower" / "siss")."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, config.BREAKER_FAILURES, config.BREAKER_RESET_SECONDS)
+            _breakers[name] = breaker
+        return breaker
@@ -0,0 +1,151 @@
+"""
+Index pencarian & filter facet untuk tabel tower/SISS.
+
+Dibangun sekali per versi dataset (lihat views.cached_view), lalu setiap
+rerun karena ketikan di sidebar cukup memakai index ini:
+- facet (Status, Region): nilai -> posisi baris (array int terurut)
+- teks: kolom nama site (plus ID site kalau ada, lihat `search_columns`)
+  sebagai array lowercase terurut untuk prefix (searchsorted) dan array
+  Arrow lowercase untuk substring (pyarrow.compute, tanpa lower() ulang
+  per ketikan). Nilai semua kolom digabung jadi satu array dengan posisi
+  barisnya, jadi satu pencarian mencakup nama & ID sekaligus.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .delta import site_key_column
+from .views import cached_view
+
+# Kandidat kolom nama site, urut prioritas (dicocokkan tanpa beda huruf besar/kecil)
+NAME_CANDIDATES = ("site name", "sitename", "name")
+
+
+@dataclass(frozen=True)
+class FacetQuery:
+    status: str | None = None
+    regions: tuple[str, ...] = ()
+    text: str = ""
+
+    @property
+    def is_empty(self) -> bool:
+        return self.status is None and not self.regions and not self.text
+
+
+def region_column(df: pd.DataFrame) -> str | None:
+    """Kolom region (nama mengandung 'region', tanpa beda huruf besar/kecil)."""
+    return next((c for c in df.columns if "region" in str(c).lower()), None)
+
+
+def search_columns(df: pd.DataFrame) -> list[str]:
+    """Kolom yang dicari teks: nama site dulu, lalu kolom ID site kalau berbeda."""
+    lowered = {str(c).strip().lower(): c for c in df.columns}
+    name = next((lowered[c] for c in NAME_CANDIDATES if c in lowered), None)
+    return list(dict.fromkeys(c for c in (name, site_key_column(df)) if c is not None))
+
+
+class FrameIndex:
+    def __init__(self, df: pd.DataFrame, search_cols: list[str],
+                 status_col: str | None = "Status", region_col: str | None = None):
+        self.n = len(df)
+        self.status_col = status_col if status_col in df.columns else None
+        self.region_col = region_col if region_col in df.columns else None
+        self.facets = {
+            col: self._facet(df[col]) for col in (self.status_col, self.region_col) if col
+        }
+
+        self.search_cols = [c for c in search_cols if c in df.columns]
+        if not self.search_cols:
+            return
+        names = np.concatenate([self._lowered(df[c]) for c in self.search_cols])
+        # Posisi baris tiap nilai (kolom ke-k menempati blok ke-k)
+        self._rows = np.tile(np.arange(self.n), len(self.search_cols))
+        self._sorted_order = np.argsort(names, kind="stable")
+        self._sorted_names = names[self._sorted_order].astype(str)
+        self._names = pa.array(names, type=pa.string())
+
+    @staticmethod
+    def _lowered(series: pd.Series) -> np.ndarray:
+        names = series.astype(str).str.lower().to_numpy(dtype=object)
+        return np.where(pd.isna(series).to_numpy(), "", names)
+
+    @staticmethod
+    def _facet(series: pd.Series) -> dict[str, np.ndarray]:
+        codes, uniques = pd.factorize(series, sort=True)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {
+            str(value): order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+        }
+
+    def values(self, col: str | None) -> list[str]:
+        """Nilai facet yang tersedia (terurut)."""
+        return list(self.facets.get(col, {})) if col else []
+
+    def prefix(self, text: str) -> np.ndarray:
+        """Posisi baris yang nama/ID site-nya diawali `text` (urut nama, tanpa dobel)."""
+        lo = np.searchsorted(self._sorted_names, text, side="left")
+        hi = np.searchsorted(self._sorted_names, text + "\U0010ffff", side="left")
+        rows = self._rows[self._sorted_order[lo:hi]]
+        if len(self.search_cols) == 1:
+            return rows
+        _, first = np.unique(rows, return_index=True)
+        return rows[np.sort(first)]
+
+    def substring(self, text: str) -> np.ndarray:
+        """Posisi baris yang nama/ID site-nya mengandung `text` (urut baris)."""
+        hits = pc.match_substring(self._names, text)
+        return np.unique(self._rows[hits.to_numpy(zero_copy_only=False)])
+
+    def search(self, text: str) -> np.ndarray:
+        """Kecocokan prefix dulu (urut nama), lalu sisa kecocokan substring."""
+        text = text.strip().lower()
+        if not text or not self.search_cols:
+            return np.arange(self.n)
+        first = self.prefix(text)
+        rest = np.setdiff1d(self.substring(text), first, assume_unique=True)
+        return np.concatenate([first, rest])
+
+    def _facet_mask(self, col: str | None, selected) -> np.ndarray | None:
+        if not col or not selected:
+            return None
+        mask = np.zeros(self.n, dtype=bool)
+        for value in selected:
+            mask[self.facets[col].get(str(value), [])] = True
+        return mask
+
+    def positions(self, query: FacetQuery) -> np.ndarray | None:
+        """Posisi baris hasil query (status x region x teks); None = semua baris."""
+        if query.is_empty:
+            return None
+        rows = self.search(query.text) if query.text else np.arange(self.n)
+        for mask in (
+            self._facet_mask(self.status_col, [query.status] if query.status else ()),
+            self._facet_mask(self.region_col, query.regions),
+        ):
+            if mask is not None:
+                rows = rows[mask[rows]]
+        return rows
+
+    def filter(self, df: pd.DataFrame, query: FacetQuery) -> pd.DataFrame:
+        rows = self.positions(query)
+        return df if rows is None else df.iloc[rows]
+
+
+def dataset_index(df: pd.DataFrame) -> FrameIndex:
+    """Index pencarian/facet `df`, dibangun sekali per versi dataset."""
+    return cached_view(
+        df, "index", None,
+        lambda: FrameIndex(df, search_columns(df), "Status", region_column(df)),
+    )
+
+
+def search_frame(df: pd.DataFrame, query: FacetQuery) -> pd.DataFrame:
+    """Baris `df` yang cocok dengan `query` (hasil di-cache per versi dataset + query)."""
+    if query.is_empty:
+        return df
+    return cached_view(df, "filter", query, lambda: dataset_index(df).filter(df, query))
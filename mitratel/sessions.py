@@ -0,0 +1,109 @@
+"""
+Session login yang dipakai ulang antar refresh.
+
+Setiap upstream (report tower, SISS) punya satu `LoginSession` per proses:
+cookie, token hasil login dan koneksi keep-alive disimpan, lalu login ulang
+hanya dilakukan kalau response menandakan sesi sudah kedaluwarsa.
+Setiap request memakai timeout default (HTTP_CONNECT_TIMEOUT /
+HTTP_READ_TIMEOUT) dan retry GET dari mitratel.resilience.
+"""
+
+import threading
+from typing import Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import config
+from .resilience import retry_policy
+
+LoginFn = Callable[[requests.Session], str | None]
+SendFn = Callable[[requests.Session, str | None], requests.Response]
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session dengan timeout (connect, read) default untuk setiap request."""
+
+    def __init__(self, timeout: tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class LoginSession:
+    def __init__(self, name: str, login: LoginFn, pool_maxsize: int | None = None):
+        self.name = name
+        self._login = login
+        self._pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._token: str | None = None
+        self.login_count = 0
+
+    def _new_session(self) -> requests.Session:
+        session = TimeoutSession((config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT))
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=self._pool_maxsize, max_retries=retry_policy()
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def acquire(self) -> tuple[requests.Session, str | None]:
+        """Kembalikan session yang sudah login (login dulu kalau belum)."""
+        with self._lock:
+            if self._session is None:
+                session = self._new_session()
+                try:
+                    token = self._login(session)
+                except BaseException:
+                    session.close()
+                    raise
+                self._session, self._token = session, token
+                self.login_count += 1
+            return self._session, self._token
+
+    def invalidate(self, session: requests.Session | None = None):
+        """
+        Buang session aktif supaya request berikutnya login ulang.
+        Kalau `session` diberikan, hanya dibuang bila masih session yang sama
+        (thread lain mungkin sudah login ulang lebih dulu).
+        """
+        with self._lock:
+            if self._session is None:
+                return
+            if session is not None and session is not self._session:
+                return
+            self._session.close()
+            self._session, self._token = None, None
+
+    def call(
+        self,
+        send: SendFn,
+        is_expired: Callable[[requests.Response], bool],
+    ) -> requests.Response:
+        """Jalankan `send`; kalau sesi kedaluwarsa, login ulang dan coba sekali lagi."""
+        session, token = self.acquire()
+        resp = send(session, token)
+        if is_expired(resp):
+            self.invalidate(session)
+            session, token = self.acquire()
+            resp = send(session, token)
+        return resp
+
+
+_registry: dict[str, LoginSession] = {}
+_registry_lock = threading.Lock()
+
+
+def get_login_session(name: str, login: LoginFn) -> LoginSession:
+    """Ambil (atau buat sekali) `LoginSession` bersama untuk upstream `name`."""
+    with _registry_lock:
+        managed = _registry.get(name)
+        if managed is None:
+            managed = LoginSession(name, login)
+            _registry[name] = managed
+        return managed
@@ -0,0 +1,331 @@
+"""
+Sumber data SISS site status: login (token + varian Authorization yang
+diingat), ambil panelData per range waktu, lalu decode/normalisasi jadi
+DataFrame dashboard (Site Name, Region, Status, koordinat, tenantId).
+"""
+
+import json
+import urllib.parse
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+from . import config
+from .auth_scheme import FALLBACK_STATUSES, auth_header, siss_auth_memory, token_issuer, url_host
+from .cache import CacheResult, shared_cache
+from .compact import compact_frame
+from .metrics import span
+from .resilience import CircuitBreaker, upstream_breaker
+from .sessions import get_login_session
+from .siss_chunks import ChunkTiming, combine_results, fetch_chunks, merge_chunk_frames, split_range
+from .siss_stream import INVALID_JSON, KEY_MISSING, NOT_A_LIST, decode_siss_stream
+from .timeutil import WIB, now_wib
+
+LOGIN_URL_SISS = "https://siss-service.smartsol.id/Auth/login"
+REPORT_URL_SISS_BASE = (
+    "https://siss-service.smartsol.id/"
+    "v1/panels/59b7e0f9-2f83-45cb-bde4-a6f4d890022c/panelData"
+)
+
+
+def build_siss_url(start_dt: datetime, end_dt: datetime) -> str:
+    """Bangun URL SISS dengan range waktu (WIB) yang diinginkan."""
+    # Pastikan sudah ada timezone
+    if start_dt.tzinfo is None:
+        start_dt = start_dt.replace(tzinfo=WIB)
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=WIB)
+
+    def to_ms(dt: datetime) -> int:
+        # timestamp dalam milidetik
+        return int(dt.timestamp() * 1000)
+
+    payload = {
+        "beginTs": to_ms(start_dt),
+        "endTs": to_ms(end_dt),
+    }
+    encoded = urllib.parse.quote(json.dumps(payload))
+    return f"{REPORT_URL_SISS_BASE}?&requestOnDemand={encoded}"
+
+
+def extract_auth_token(login_response) -> str | None:
+    """Cari field yang mengandung kata 'token' di JSON hasil login."""
+    try:
+        data = login_response.json()
+    except Exception:
+        return None
+
+    if not isinstance(data, (dict, list)):
+        return None
+
+    stack = [data]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            for k, v in cur.items():
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+                elif isinstance(v, str) and "token" in k.lower():
+                    return v
+        elif isinstance(cur, list):
+            for v in cur:
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+    return None
+
+
+SISS_COMMON_HEADERS = {
+    "Accept": "application/json, text/plain, */*",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Origin": "https://mitratel-siss.smartsol.id",
+    "Referer": "https://mitratel-siss.smartsol.id/",
+}
+
+
+def login_siss(session: requests.Session) -> str | None:
+    """Login ke SISS, kembalikan token (kalau ada) untuk header Authorization."""
+    login_data = {"username": config.LOGIN_USERNAME_1, "password": config.LOGIN_PASSWORD_1}
+    login_headers = {**SISS_COMMON_HEADERS, "Content-Type": "application/json"}
+
+    with span("login", source="siss"):
+        login_response = session.post(
+            LOGIN_URL_SISS,
+            json=login_data,
+            headers=login_headers,
+        )
+    if login_response.status_code != 200:
+        raise RuntimeError(
+            f"Login gagal ke SISS (status {login_response.status_code})."
+        )
+
+    return extract_auth_token(login_response)
+
+
+def siss_session_expired(resp: requests.Response) -> bool:
+    return resp.status_code == 401 or "login" in resp.url.lower()
+
+
+def siss_report_response(
+    start_dt: datetime, end_dt: datetime, stream: bool = False
+) -> requests.Response:
+    """GET panelData SISS (dengan login & varian Authorization yang diingat)."""
+    if not config.LOGIN_USERNAME_1 or not config.LOGIN_PASSWORD_1:
+        raise RuntimeError(
+            "USERNAME_1/PASSWORD_1 tidak ditemukan (LOGIN_USERNAME_1 / LOGIN_PASSWORD_1)."
+        )
+
+    # Bangun URL dengan range waktu
+    report_url = build_siss_url(start_dt, end_dt)
+
+    base_report_headers = {**SISS_COMMON_HEADERS, "Accept": "application/json"}
+
+    first_call = True
+
+    def send(session: requests.Session, auth_token: str | None) -> requests.Response:
+        nonlocal first_call
+        issuer = token_issuer(auth_token, url_host(LOGIN_URL_SISS))
+        variants = siss_auth_memory.ordered_variants(issuer, auth_token)
+        learned = siss_auth_memory.learned(issuer)
+
+        used = 0
+        winner = None
+        for variant in variants:
+            headers = {**base_report_headers, **auth_header(variant, auth_token)}
+            # Mode stream: span ini hanya sampai header; body diukur saat di-decode
+            with span("report_get", source="siss", stream=stream) as s:
+                resp = session.get(report_url, headers=headers, stream=stream)
+                if not stream:
+                    s.bytes = len(resp.content)
+            used += 1
+            if resp.status_code == 200:
+                winner = variant
+                break
+            if resp.status_code not in FALLBACK_STATUSES:
+                break
+            # Varian yang sudah terbukti jalan kena 401: kemungkinan besar token
+            # kedaluwarsa, jadi login ulang dulu sebelum mencoba varian lain.
+            if first_call and variant == learned and resp.status_code == 401:
+                break
+            # Baru ditutup kalau memang lanjut ke varian berikutnya; response
+            # yang dikembalikan masih dibaca pemanggil (cuplikan error)
+            if variant != variants[-1]:
+                resp.close()
+
+        first_call = False
+        siss_auth_memory.record(issuer, winner, used, auth_token)
+        return resp
+
+    managed = get_login_session("siss", login_siss)
+    resp = managed.call(send, siss_session_expired)
+    if resp.status_code == 200:
+        return resp
+
+    snippet = (resp.text or "")[:200]
+    raise RuntimeError(
+        f"Gagal mengambil data SISS (status {resp.status_code}). "
+        f"Cuplikan response: {snippet}"
+    )
+
+
+def fetch_siss_raw(start_dt: datetime, end_dt: datetime) -> str:
+    return siss_report_response(start_dt, end_dt).text
+
+
+# Kolom mentah SISS yang dipakai dashboard (sebelum di-rename)
+SISS_SOURCE_COLUMNS = ("name", "region", "status", "longitude", "latitude", "tenantId")
+
+
+def fetch_siss_df_stream(start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
+    """
+    Download panelData per potongan dan decode langsung ke buffer kolom,
+    tanpa pernah menyimpan seluruh response sebagai string/objek Python.
+    """
+    return decode_siss_response(siss_report_response(start_dt, end_dt, stream=True))
+
+
+def decode_siss_response(
+    resp: requests.Response, breaker: CircuitBreaker | None = None
+) -> pd.DataFrame:
+    """
+    Decode response panelData yang di-stream. Gagal baca body (koneksi putus
+    di tengah) dicatat ke `breaker` kalau ada; JSON rusak tidak, karena itu
+    bukan gangguan jaringan.
+    """
+    try:
+        with span("download_decode", source="siss") as s:
+            s.bytes = 0
+
+            def counted():
+                try:
+                    for chunk in resp.iter_content(chunk_size=config.SISS_STREAM_CHUNK_BYTES):
+                        s.bytes += len(chunk)
+                        yield chunk
+                except requests.RequestException as e:
+                    if breaker is not None:
+                        breaker.record_failure(e)
+                    raise
+
+            columns, row_count = decode_siss_stream(counted(), keep=SISS_SOURCE_COLUMNS)
+    finally:
+        resp.close()
+
+    with span("dataframe", source="siss"):
+        df = pd.DataFrame(columns, index=pd.RangeIndex(row_count))
+        columns.clear()
+        return normalize_siss_df(df)
+
+
+def parse_siss_to_df(raw_text: str) -> pd.DataFrame:
+    try:
+        with span("parse", source="siss"):
+            data = json.loads(raw_text)
+    except json.JSONDecodeError:
+        raise RuntimeError(INVALID_JSON)
+
+    if not isinstance(data, dict) or "responseDataValue" not in data:
+        raise RuntimeError(KEY_MISSING)
+
+    items = data["responseDataValue"]
+    if not isinstance(items, list):
+        raise RuntimeError(NOT_A_LIST)
+
+    with span("dataframe", source="siss"):
+        return normalize_siss_df(pd.DataFrame(items))
+
+
+def normalize_siss_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename kolom, filter status yang relevan, dan pilih kolom dashboard."""
+    rename_map = {}
+    if "name" in df.columns:
+        rename_map["name"] = "Site Name"
+    if "region" in df.columns:
+        rename_map["region"] = "Region"
+    if "status" in df.columns:
+        rename_map["status"] = "Status"
+    df = df.rename(columns=rename_map)
+
+    # Filter hanya NORMAL & NOT INSTALLED dari sistem,
+    # lalu tampilkan NOT INSTALLED sebagai CRITICAL di dashboard
+        # Filter status yang relevan dari sistem,
+    # dan satukan NOT INSTALLED / CRITICAL jadi "CRITICAL" di dashboard
+    if "Status" in df.columns:
+        valid_status = ["NORMAL", "NOT INSTALLED", "CRITICAL"]
+        df = df[df["Status"].isin(valid_status)].copy()
+        df["Status"] = df["Status"].replace(
+            {
+                "NOT INSTALLED": "CRITICAL",
+                "Critical": "CRITICAL",      # kalau ada variasi huruf besar/kecil
+                "critical": "CRITICAL",
+            }
+        )
+
+    cols = [
+        c
+        for c in ["Site Name", "Region", "Status", "longitude", "latitude", "tenantId"]
+        if c in df.columns
+    ]
+    if cols:
+        df = df[cols]
+
+    return df
+
+
+def fetch_siss_df(start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
+    """
+    Fetch + decode satu window SISS. Circuit breaker upstream SISS hanya
+    membungkus langkah jaringan (request & body), bukan decode/parse.
+    """
+    breaker = upstream_breaker("siss")
+    if config.SISS_STREAMING:
+        resp = breaker.call(lambda: siss_report_response(start_dt, end_dt, stream=True))
+        return decode_siss_response(resp, breaker)
+    return parse_siss_to_df(breaker.call(lambda: fetch_siss_raw(start_dt, end_dt)))
+
+
+def load_siss_df(start_dt: datetime, end_dt: datetime) -> CacheResult:
+    """Fetch + parse SISS satu window lewat cache bersama, key = endpoint + range waktu."""
+    begin_ts = int(start_dt.timestamp() * 1000)
+    end_ts = int(end_dt.timestamp() * 1000)
+    return shared_cache.get_or_fetch(
+        ("siss", REPORT_URL_SISS_BASE, begin_ts, end_ts),
+        lambda: compact_frame(fetch_siss_df(start_dt, end_dt)),
+    )
+
+
+def load_siss_df_chunked(
+    start_dt: datetime, end_dt: datetime, mode: str
+) -> tuple[CacheResult, list[ChunkTiming]]:
+    """
+    Ambil SISS per window harian/mingguan secara paralel (session login yang
+    sama), lalu gabungkan dan buang duplikat Site Name/tenantId.
+    """
+    windows = split_range(start_dt, end_dt, mode)
+    results, timings = fetch_chunks(windows, load_siss_df, config.SISS_CHUNK_WORKERS)
+    # concat kategori yang berbeda antar window jadi object, ringkas ulang
+    merged = compact_frame(merge_chunk_frames([r.value for r in results]))
+    return combine_results(results, merged), timings
+
+
+def siss_range(start_date, end_date) -> tuple[datetime, datetime, str]:
+    """Tanggal sidebar -> (awal WIB 00:00, akhir WIB 23:59:59, label range)."""
+    # Pastikan ada tanggal (fallback ke hari ini kalau None)
+    if start_date is None or end_date is None:
+        today = now_wib().date()
+        start_date = today
+        end_date = today
+
+    # Kalau user kebalik (end < start), kita tukar
+    if end_date < start_date:
+        start_date, end_date = end_date, start_date
+
+    # Konversi ke datetime WIB untuk beginTs & endTs
+    start_dt = datetime.combine(start_date, datetime.min.time(), tzinfo=WIB)
+    end_dt = datetime.combine(end_date, datetime.max.time(), tzinfo=WIB)
+
+    range_str = f"{start_date.strftime('%Y-%m-%d')} s.d. {end_date.strftime('%Y-%m-%d')}"
+    return start_dt, end_dt, range_str
@@ -0,0 +1,111 @@
+"""
+Pengambilan SISS per potongan waktu (harian / mingguan).
+
+Range panjang dipecah jadi beberapa window, tiap window diambil lewat cache
+bersama (jadi window yang sama bisa dipakai ulang oleh range lain) secara
+paralel di thread pool terbatas, lalu hasilnya digabung dan diduplikasi.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+import pandas as pd
+
+from .cache import CacheResult
+
+CHUNK_MODES = {"day": timedelta(days=1), "week": timedelta(days=7)}
+DEDUP_KEYS = ("Site Name", "tenantId")
+
+
+@dataclass
+class ChunkTiming:
+    start: datetime
+    end: datetime
+    seconds: float
+    rows: int
+    from_cache: bool
+
+
+def split_range(start_dt: datetime, end_dt: datetime, mode: str) -> list[tuple[datetime, datetime]]:
+    """Pecah [start_dt, end_dt] jadi window berurutan sepanjang `mode`."""
+    step = CHUNK_MODES.get(mode)
+    if step is None or end_dt <= start_dt:
+        return [(start_dt, end_dt)]
+
+    windows = []
+    cur = start_dt
+    while cur <= end_dt:
+        window_end = min(cur + step - timedelta(microseconds=1), end_dt)
+        windows.append((cur, window_end))
+        cur = cur + step
+    return windows
+
+
+def fetch_chunks(
+    windows: list[tuple[datetime, datetime]],
+    fetch_window: Callable[[datetime, datetime], CacheResult],
+    max_workers: int,
+) -> tuple[list[CacheResult], list[ChunkTiming]]:
+    """Ambil semua window secara paralel; urutan hasil mengikuti urutan window."""
+
+    def run(window):
+        t0 = time.perf_counter()
+        result = fetch_window(*window)
+        timing = ChunkTiming(
+            start=window[0],
+            end=window[1],
+            seconds=time.perf_counter() - t0,
+            rows=len(result.value),
+            from_cache=result.from_cache,
+        )
+        return result, timing
+
+    workers = max(1, min(max_workers, len(windows)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="siss-chunk") as pool:
+        pairs = list(pool.map(run, windows))
+
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def merge_chunk_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Gabungkan hasil per window. Site yang muncul di beberapa window cukup
+    diambil sekali, pakai baris dari window paling akhir (status terbaru).
+    """
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    keys = [k for k in DEDUP_KEYS if k in merged.columns]
+    if keys:
+        merged = merged.drop_duplicates(subset=keys, keep="last")
+    return merged.reset_index(drop=True)
+
+
+def combine_results(results: list[CacheResult], merged: pd.DataFrame) -> CacheResult:
+    """Satu CacheResult ringkasan: umur = window tertua, dari cache kalau semua dari cache."""
+    oldest = min(r.fetched_at for r in results)
+    return CacheResult(
+        value=merged,
+        fetched_at=oldest,
+        from_cache=all(r.from_cache for r in results),
+        age=max(r.age for r in results),
+    )
+
+
+def timings_to_df(timings: list[ChunkTiming]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "Mulai (WIB)": t.start.strftime("%Y-%m-%d %H:%M"),
+                "Akhir (WIB)": t.end.strftime("%Y-%m-%d %H:%M"),
+                "Durasi (detik)": round(t.seconds, 2),
+                "Jumlah Baris": t.rows,
+                "Dari Cache": "Ya" if t.from_cache else "Tidak",
+            }
+            for t in timings
+        ]
+    )
@@ -0,0 +1,214 @@
+"""
+Decoder JSON bertahap untuk response panelData SISS.
+
+Response SISS berbentuk `{"...": ..., "responseDataValue": [ {...}, ... ]}`.
+Alih-alih menyimpan bytes, string dan seluruh objek Python sekaligus,
+`SissStreamDecoder` menerima potongan bytes satu per satu, hanya men-decode
+item di dalam array `responseDataValue`, dan langsung memasukkan nilainya ke
+buffer per kolom. Field top-level lain dilewati tanpa disimpan.
+"""
+
+import codecs
+import json
+from typing import Iterable
+
+TARGET_KEY = "responseDataValue"
+# Pesan error sama dengan siss.parse_siss_to_df, supaya mode stream & non-stream
+# gagal dengan cara yang sama
+INVALID_JSON = "Respon SISS bukan JSON valid."
+KEY_MISSING = f"Field '{TARGET_KEY}' tidak ditemukan di JSON SISS."
+NOT_A_LIST = f"'{TARGET_KEY}' bukan list."
+_WS = " \t\n\r"
+# Karakter awal nilai JSON yang valid (selain object)
+_JSON_START = '["-0123456789tfn'
+_MISSING = float("nan")  # sama seperti pd.DataFrame(list_of_dict) untuk key yang tidak ada
+
+
+class SissStreamError(RuntimeError):
+    pass
+
+
+class _NeedMore(Exception):
+    pass
+
+
+class SissStreamDecoder:
+    def __init__(self, keep: Iterable[str] | None = None):
+        self.keep = set(keep) if keep is not None else None
+        self.columns: dict[str, list] = {}
+        self.row_count = 0
+        self.found_key = False
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        # seek_object -> seek_key -> after_key -> skip_value -> next_key
+        # -> array_start -> array_open -> item / after_item -> done
+        # (dokumen yang bukan object: seek_object -> non_object)
+        self._state = "seek_object"
+        self._pending_key: str | None = None
+
+    # ---------------- input ----------------
+
+    def feed(self, chunk: bytes):
+        if self.done:
+            return
+        self._buf = self._buf[self._pos:] + self._utf8.decode(chunk)
+        self._pos = 0
+        self._run()
+
+    def close(self):
+        if not self.done:
+            self._buf = self._buf[self._pos:] + self._utf8.decode(b"", final=True)
+            self._pos = 0
+            self._eof = True
+            self._run()
+        # Body terpotong (sebelum maupun sesudah key ditemukan) = JSON tidak valid
+        if not self.done:
+            raise SissStreamError(INVALID_JSON)
+
+    # ---------------- scanning helpers ----------------
+
+    def _skip_ws(self) -> str:
+        buf, pos = self._buf, self._pos
+        n = len(buf)
+        while pos < n and buf[pos] in _WS:
+            pos += 1
+        self._pos = pos
+        if pos >= n:
+            if self._eof:
+                raise SissStreamError(INVALID_JSON)
+            raise _NeedMore
+        return buf[pos]
+
+    def _decode_value(self):
+        """Decode satu nilai JSON lengkap mulai dari posisi sekarang."""
+        self._skip_ws()
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise SissStreamError(INVALID_JSON)
+            raise _NeedMore
+        # Angka/literal di ujung buffer bisa saja masih terpotong ("12" + "34")
+        rest = end
+        while rest < len(self._buf) and self._buf[rest] in _WS:
+            rest += 1
+        if rest >= len(self._buf) and not self._eof:
+            raise _NeedMore
+        self._pos = end
+        return value
+
+    def _expect(self, chars: str) -> str:
+        c = self._skip_ws()
+        if c not in chars:
+            raise SissStreamError(INVALID_JSON)
+        self._pos += 1
+        return c
+
+    def _add_item(self, item):
+        if not isinstance(item, dict):
+            raise SissStreamError(f"Item '{TARGET_KEY}' bukan object.")
+        n = self.row_count
+        columns = self.columns
+        for key, value in item.items():
+            if self.keep is not None and key not in self.keep:
+                continue
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = [_MISSING] * n
+            col.append(value)
+        n += 1
+        for col in columns.values():
+            if len(col) < n:
+                col.append(_MISSING)
+        self.row_count = n
+
+    # ---------------- state machine ----------------
+
+    def _run(self):
+        try:
+            while not self.done:
+                self._step()
+        except _NeedMore:
+            pass
+
+    def _step(self):
+        state = self._state
+        if state == "seek_object":
+            c = self._skip_ws()
+            if c == "{":
+                self._pos += 1
+                self._state = "seek_key"
+            elif c in _JSON_START:
+                self._state = "non_object"
+            else:
+                # Halaman HTML / login, dsb.
+                raise SissStreamError(INVALID_JSON)
+        elif state == "non_object":
+            # JSON valid tapi bukan object: key pasti tidak ada (seperti json.loads)
+            self._decode_value()
+            raise SissStreamError(KEY_MISSING)
+        elif state == "seek_key":
+            if self._skip_ws() == "}":
+                raise SissStreamError(KEY_MISSING)
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise SissStreamError(INVALID_JSON)
+            self._pending_key = key
+            self._state = "after_key"
+        elif state == "after_key":
+            self._expect(":")
+            if self._pending_key == TARGET_KEY:
+                self.found_key = True
+                self._state = "array_start"
+            else:
+                self._state = "skip_value"
+        elif state == "skip_value":
+            self._decode_value()
+            self._state = "next_key"
+        elif state == "next_key":
+            self._expect(",}")
+            if self._buf[self._pos - 1] == "}":
+                raise SissStreamError(KEY_MISSING)
+            self._state = "seek_key"
+        elif state == "array_start":
+            if self._skip_ws() != "[":
+                raise SissStreamError(NOT_A_LIST)
+            self._pos += 1
+            self._state = "array_open"
+        elif state == "array_open":
+            if self._skip_ws() == "]":
+                self._pos += 1
+                self._finish()
+            else:
+                self._state = "item"
+        elif state == "item":
+            self._add_item(self._decode_value())
+            self._state = "after_item"
+        elif state == "after_item":
+            if self._expect(",]") == "]":
+                self._finish()
+            else:
+                self._state = "item"
+
+    def _finish(self):
+        # Sisa dokumen setelah array tidak dibaca lagi
+        self.done = True
+        self._buf = ""
+        self._pos = 0
+
+
+def decode_siss_stream(
+    chunks: Iterable[bytes], keep: Iterable[str] | None = None
+) -> tuple[dict[str, list], int]:
+    """Decode potongan bytes response SISS jadi (kolom -> list nilai, jumlah baris)."""
+    decoder = SissStreamDecoder(keep)
+    for chunk in chunks:
+        decoder.feed(chunk)
+        if decoder.done:
+            break
+    decoder.close()
+    return decoder.columns, decoder.row_count
@@ -0,0 +1,185 @@
+"""
+Penyimpanan snapshot lokal (Parquet) untuk hasil refresh tower & SISS.
+
+Setiap refresh yang berhasil disimpan sebagai file bertimestamp di
+`<SNAPSHOT_DIR>/<kind>/`, sehingga dashboard bisa langsung menampilkan data
+terakhir setelah reload browser / restart server. Snapshot lama dibuang
+berdasarkan umur dan total ukuran folder (snapshot terbaru per jenis selalu
+dipertahankan).
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import pandas as pd
+
+from . import config
+
+SUFFIX = ".parquet"
+META_KEY = b"mitratel_meta"
+
+
+@dataclass
+class SnapshotInfo:
+    kind: str
+    path: str
+    taken_at: float                  # epoch detik
+    size: int
+    meta: dict = field(default_factory=dict)
+
+
+def _stamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%dT%H%M%S_%fZ")
+
+
+def _parse_stamp(name: str) -> float | None:
+    stem = name[: -len(SUFFIX)]
+    try:
+        return datetime.strptime(stem.split("_", 1)[1], "%Y%m%dT%H%M%S_%fZ").replace(
+            tzinfo=timezone.utc
+        ).timestamp()
+    except (IndexError, ValueError):
+        return None
+
+
+def _to_table(df: pd.DataFrame, meta: dict):
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Kolom object campuran (mis. angka & teks) disimpan sebagai teks
+        fixed = df.copy()
+        for col in fixed.columns:
+            if fixed[col].dtype == object:
+                fixed[col] = fixed[col].map(lambda v: v if v is None else str(v))
+        table = pa.Table.from_pandas(fixed, preserve_index=False)
+
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[META_KEY] = json.dumps(meta).encode()
+    return table.replace_schema_metadata(schema_meta)
+
+
+@lru_cache(maxsize=8)
+def _read_cached(path: str, mtime: float) -> tuple[pd.DataFrame, dict]:
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    raw_meta = (table.schema.metadata or {}).get(META_KEY)
+    meta = json.loads(raw_meta) if raw_meta else {}
+    return table.to_pandas(), meta
+
+
+class SnapshotStore:
+    def __init__(self, root: str, max_age_days: float, max_total_mb: float):
+        self.root = root
+        self.max_age_seconds = max_age_days * 86400
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    def _dir(self, kind: str) -> str:
+        return os.path.join(self.root, kind)
+
+    def save(self, kind: str, df: pd.DataFrame, meta: dict | None = None,
+             taken_at: float | None = None) -> SnapshotInfo:
+        """Tulis snapshot baru (atomik: file sementara lalu rename)."""
+        import pyarrow.parquet as pq
+
+        taken_at = taken_at or time.time()
+        meta = dict(meta or {})
+        folder = self._dir(kind)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{kind}_{_stamp(taken_at)}{SUFFIX}")
+        tmp = f"{path}.tmp"
+        pq.write_table(_to_table(df, meta), tmp, compression="zstd")
+        os.replace(tmp, path)
+
+        self.evict()
+        return SnapshotInfo(kind, path, taken_at, os.path.getsize(path), meta)
+
+    def list(self, kind: str | None = None) -> list[SnapshotInfo]:
+        """Semua snapshot (urut dari yang paling lama)."""
+        kinds = [kind] if kind else (
+            sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []
+        )
+        infos = []
+        for k in kinds:
+            folder = self._dir(k)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not name.endswith(SUFFIX):
+                    continue
+                ts = _parse_stamp(name)
+                if ts is None:
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                infos.append(SnapshotInfo(k, path, ts, size))
+        infos.sort(key=lambda i: i.taken_at)
+        return infos
+
+    def latest(self, kind: str) -> SnapshotInfo | None:
+        infos = self.list(kind)
+        return infos[-1] if infos else None
+
+    def load(self, info: SnapshotInfo) -> pd.DataFrame:
+        """Baca snapshot (di-cache per path+mtime; jangan dimodifikasi in-place)."""
+        df, meta = _read_cached(info.path, os.path.getmtime(info.path))
+        info.meta = meta
+        return df
+
+    def load_latest(self, kind: str) -> tuple[pd.DataFrame, SnapshotInfo] | None:
+        info = self.latest(kind)
+        if info is None:
+            return None
+        try:
+            return self.load(info), info
+        except (OSError, ValueError):
+            return None
+
+    def evict(self):
+        """Hapus snapshot yang terlalu tua / melebihi total ukuran."""
+        with self._lock:
+            infos = self.list()
+            newest = {}
+            for info in infos:
+                newest[info.kind] = info.path
+
+            now = time.time()
+            keep = []
+            for info in infos:
+                too_old = now - info.taken_at > self.max_age_seconds
+                if too_old and info.path not in newest.values():
+                    self._remove(info)
+                else:
+                    keep.append(info)
+
+            total = sum(i.size for i in keep)
+            for info in keep:  # dari yang paling lama
+                if total <= self.max_total_bytes:
+                    break
+                if info.path in newest.values():
+                    continue
+                self._remove(info)
+                total -= info.size
+
+    @staticmethod
+    def _remove(info: SnapshotInfo):
+        try:
+            os.remove(info.path)
+        except OSError:
+            pass
+
+
+snapshot_store = SnapshotStore(
+    config.SNAPSHOT_DIR, config.SNAPSHOT_MAX_AGE_DAYS, config.SNAPSHOT_MAX_TOTAL_MB
+)
@@ -0,0 +1,32 @@
+"""Helper waktu WIB & format durasi (dipakai dashboard, CLI dan poller)."""
+
+from datetime import datetime, timedelta, timezone
+
+WIB = timezone(timedelta(hours=7))
+
+
+def now_wib() -> datetime:
+    """Waktu sekarang dalam zona WIB (UTC+7)."""
+    return datetime.now(timezone.utc).astimezone(WIB)
+
+
+def format_duration(delta: timedelta) -> str:
+    """Format timedelta jadi string 'X jam Y menit Z detik'."""
+    total_seconds = int(delta.total_seconds())
+    hours, rem = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+
+    parts = []
+    if hours:
+        parts.append(f"{hours} jam")
+    if minutes:
+        parts.append(f"{minutes} menit")
+    if seconds or not parts:
+        parts.append(f"{seconds} detik")
+
+    return " ".join(parts)
+
+
+def epoch_to_wib(ts: float) -> datetime:
+    """Konversi epoch detik ke datetime WIB."""
+    return datetime.fromtimestamp(ts, tz=WIB)
@@ -0,0 +1,75 @@
+"""
+Sumber data tower online/offline: login ke web report internal, ambil
+halaman report, lalu parse tabelnya jadi DataFrame.
+"""
+
+import pandas as pd
+import requests
+
+from . import config
+from .cache import CacheResult, shared_cache
+from .compact import compact_frame
+from .metrics import span
+from .report_parser import extract_report_table
+from .resilience import upstream_breaker
+from .sessions import get_login_session
+
+LOGIN_URL_REPORT = "https://maiviewmitratel.id/Auth/login"
+REPORT_URL_REPORT = "https://maiviewmitratel.id/get-report"
+
+
+def login_report(session: requests.Session) -> str | None:
+    """Login ke server report tower; cookie sesi tersimpan di `session`."""
+    login_data = {"username": config.LOGIN_USERNAME, "password": config.LOGIN_PASSWORD}
+
+    with span("login", source="tower"):
+        login_response = session.post(LOGIN_URL_REPORT, data=login_data)
+    if login_response.status_code != 200 or "login" in login_response.url.lower():
+        raise RuntimeError("Login gagal ke server report tower.")
+    return None
+
+
+def report_session_expired(resp: requests.Response) -> bool:
+    """Sesi habis kalau di-redirect ke halaman login atau dapat 401."""
+    return resp.status_code == 401 or "login" in resp.url.lower()
+
+
+def fetch_report_html() -> str:
+    if not config.LOGIN_USERNAME or not config.LOGIN_PASSWORD:
+        raise RuntimeError(
+            "USERNAME/PASSWORD tidak ditemukan (LOGIN_USERNAME / LOGIN_PASSWORD)."
+        )
+
+    def get_report(session: requests.Session, _token) -> requests.Response:
+        with span("report_get", source="tower") as s:
+            resp = session.get(REPORT_URL_REPORT)
+            s.bytes = len(resp.content)
+        return resp
+
+    managed = get_login_session("report", login_report)
+    report_response = managed.call(get_report, report_session_expired)
+    if report_response.status_code != 200 or report_session_expired(report_response):
+        raise RuntimeError("Gagal mengambil halaman report tower.")
+
+    return report_response.text
+
+
+def parse_report_to_df(html: str, parser: str | None = None) -> pd.DataFrame:
+    with span("parse", source="tower"):
+        headers, rows = extract_report_table(html, parser or config.REPORT_PARSER)
+
+    with span("dataframe", source="tower"):
+        df = pd.DataFrame(rows, columns=headers)
+        if "#" in df.columns:
+            df = df.drop(columns=["#"])
+
+    return df
+
+
+def load_tower_df() -> CacheResult:
+    """Fetch + parse report tower lewat cache bersama (semua sesi) dan circuit breaker."""
+    breaker = upstream_breaker("tower")
+    return shared_cache.get_or_fetch(
+        ("tower", REPORT_URL_REPORT),
+        lambda: compact_frame(parse_report_to_df(breaker.call(fetch_report_html))),
+    )
@@ -0,0 +1,108 @@
+"""
+Cache hasil filter & agregasi per versi dataset.
+
+Versi dataset adalah fingerprint isi DataFrame, dihitung sekali per objek
+frame (hasil refresh/snapshot) lalu diingat. Hasil turunan seperti frame
+terfilter, value_counts dan data grafik disimpan dengan key
+(versi, operasi, parameter) sehingga rerun berikutnya — dari sesi mana pun
+yang memegang data yang sama — tidak menghitung ulang.
+
+Hasil dari cache dipakai bersama: perlakukan sebagai read-only.
+
+Tabel besar ditampilkan per halaman (page_slice): urutan sort dihitung
+sekali per versi dataset, lalu tiap rerun hanya memotong posisi halaman.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .exports import frame_fingerprint
+
+_versions: dict[int, tuple[weakref.ref, str]] = {}
+_versions_lock = threading.Lock()
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Fingerprint isi `df`, dihitung sekali per objek DataFrame."""
+    key = id(df)
+    with _versions_lock:
+        entry = _versions.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    version = frame_fingerprint(df)
+
+    def _forget(_ref, key=key):
+        with _versions_lock:
+            current = _versions.get(key)
+            if current is not None and current[0] is _ref:
+                del _versions[key]
+
+    with _versions_lock:
+        _versions[key] = (weakref.ref(df, _forget), version)
+    return version
+
+
+class ViewCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+
+view_cache = ViewCache(config.VIEW_CACHE_ENTRIES)
+
+
+def cached_view(df: pd.DataFrame, op: str, params: Hashable, compute: Callable[[], Any]) -> Any:
+    """Ambil/hitung hasil turunan `df` untuk operasi `op` dengan parameter `params`."""
+    return view_cache.get_or_compute((dataset_version(df), op, params), compute)
+
+
+def status_counts(df: pd.DataFrame, count_label: str) -> tuple[pd.DataFrame, pd.Series]:
+    """Tabel jumlah per Status (kolom: Status, <count_label>) + Series untuk bar chart."""
+    counts = df["Status"].value_counts().reset_index()
+    counts.columns = ["Status", count_label]
+    return counts, counts.set_index("Status")[count_label]
+
+
+def sorted_positions(df: pd.DataFrame, column: Hashable, descending: bool) -> np.ndarray:
+    """Posisi baris `df` terurut menurut `column` (kosong di akhir), di-cache per versi dataset."""
+    def compute():
+        values = df[column].reset_index(drop=True)
+        ordered = values.sort_values(ascending=not descending, kind="stable", na_position="last")
+        return ordered.index.to_numpy()
+
+    return cached_view(df, "sort", (column, descending), compute)
+
+
+def page_slice(df: pd.DataFrame, page: int, page_size: int,
+               sort_by: Hashable | None = None, descending: bool = False) -> pd.DataFrame:
+    """Baris untuk halaman `page` (mulai 1); hanya potongan ini yang dikirim ke browser."""
+    start = (page - 1) * page_size
+    if sort_by is None:
+        return df.iloc[start:start + page_size]
+    return df.iloc[sorted_positions(df, sort_by, descending)[start:start + page_size]]
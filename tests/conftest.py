@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Singleton mitratel (riwayat, snapshot, memori auth) dibuat saat import:
+# arahkan ke direktori sementara sebelum modul apa pun diimpor.
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="mitratel-test-")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,91 @@
+import http.client
+import json
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mitratel import api
+from mitratel.api import encode_frame, make_server
+from mitratel.compact import compact_frame
+from mitratel.snapshots import snapshot_store
+
+
+def _frame():
+    return compact_frame(pd.DataFrame({
+        "Site Name": ["A", "B"],
+        "longitude": [129.838654, 106.1],
+        "latitude": [-6.2, 1.23456],
+    }))
+
+
+def test_json_coordinates_have_no_float32_noise():
+    df = _frame()
+    assert df["longitude"].dtype == "float32"
+    rows = json.loads(encode_frame(df, "json"))
+    assert rows[0]["longitude"] == 129.83865
+    assert rows[1]["latitude"] == 1.23456
+
+
+def test_ndjson_one_record_per_line():
+    body = encode_frame(_frame(), "ndjson").decode()
+    lines = body.splitlines()
+    assert body.endswith("\n") and len(lines) == 2
+    assert json.loads(lines[0])["latitude"] == -6.2
+
+
+def test_arrow_keeps_compact_types():
+    table = pa.ipc.open_stream(encode_frame(_frame(), "arrow")).read_all()
+    assert table.num_rows == 2
+    assert table.schema.field("longitude").type == pa.float32()
+
+
+@pytest.fixture(scope="module")
+def server():
+    snapshot_store.save("tower", compact_frame(pd.DataFrame({
+        "Site ID": ["ID1", "ID2"], "Site Name": ["SITE-1", "SITE-2"],
+        "Region": ["JABAR", "JATIM"], "Status": ["Online", "Offline"],
+    })), {})
+    server = make_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def request(address, method: str, path: str):
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        conn.request(method, path)
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+    finally:
+        conn.close()
+
+
+def test_snapshots_do_not_expose_server_paths(server):
+    status, _, body = request(server, "GET", "/v1/snapshots")
+    info = json.loads(body)["tower"]
+    assert status == 200
+    assert "/" not in info["file"] and info["file"].endswith(".parquet")
+
+
+def test_head_returns_headers_without_body(server):
+    _, get_headers, get_body = request(server, "GET", "/v1/tower?format=json")
+    status, headers, body = request(server, "HEAD", "/v1/tower?format=json")
+    assert status == 200 and body == b""
+    assert headers["Content-Length"] == str(len(get_body))
+    assert headers["ETag"] == get_headers["ETag"]
+
+
+def test_unexpected_error_returns_json_500(server, monkeypatch):
+    def broken(df, query):
+        raise KeyError("Status")
+
+    monkeypatch.setattr(api, "search_frame", broken)
+    status, headers, body = request(server, "GET", "/v1/tower?q=boom")
+    assert status == 500
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body) == {"error": "kesalahan internal: KeyError"}
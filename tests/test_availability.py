@@ -0,0 +1,96 @@
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from mitratel.availability import (
+    DAY_SECONDS, day_bounds, day_number, month_spans, site_availability, split_daily,
+)
+from mitratel.history import StatusHistoryStore
+
+DAY = day_number(date(2025, 1, 15))
+MIDNIGHT = day_bounds(DAY, DAY)[0]  # 15 Jan 2025 00:00 WIB
+
+
+def intervals(*rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["site", "status", "start_ts", "end_ts"])
+
+
+def as_rows(df: pd.DataFrame) -> list:
+    return df.sort_values(["site", "day", "status"])[["site", "day", "status", "seconds"]].values.tolist()
+
+
+def test_split_daily_cuts_at_wib_midnight():
+    # 22:00 WIB tanggal 15 s/d 02:00 WIB tanggal 17
+    iv = intervals(("s1", "CRITICAL", MIDNIGHT + 22 * 3600, MIDNIGHT + 2 * DAY_SECONDS + 2 * 3600))
+    assert as_rows(split_daily(iv)) == [
+        ["s1", DAY, "CRITICAL", 7200.0],
+        ["s1", DAY + 1, "CRITICAL", float(DAY_SECONDS)],
+        ["s1", DAY + 2, "CRITICAL", 7200.0],
+    ]
+
+
+def test_split_daily_end_at_midnight_and_empty_intervals():
+    iv = intervals(
+        ("s1", "NORMAL", MIDNIGHT + 3600, MIDNIGHT + DAY_SECONDS),   # berakhir tepat tengah malam
+        ("s1", "NORMAL", MIDNIGHT + 100, MIDNIGHT + 200),           # dijumlah ke bucket yang sama
+        ("s2", "CRITICAL", MIDNIGHT + 50, MIDNIGHT + 50),           # durasi nol dibuang
+    )
+    assert as_rows(split_daily(iv)) == [["s1", DAY, "NORMAL", DAY_SECONDS - 3600.0 + 100.0]]
+    assert split_daily(iv.iloc[2:]).empty
+
+
+@pytest.mark.parametrize("start, end, months, edges", [
+    (date(2025, 1, 15), date(2025, 3, 10), [date(2025, 2, 1)],
+     [(date(2025, 1, 15), date(2025, 1, 31)), (date(2025, 3, 1), date(2025, 3, 10))]),
+    (date(2024, 2, 1), date(2024, 3, 31), [date(2024, 2, 1), date(2024, 3, 1)], []),
+    (date(2025, 4, 3), date(2025, 4, 3), [], [(date(2025, 4, 3), date(2025, 4, 3))]),
+    (date(2024, 12, 1), date(2025, 1, 30), [date(2024, 12, 1)],
+     [(date(2025, 1, 1), date(2025, 1, 30))]),
+])
+def test_month_spans(start, end, months, edges):
+    got_months, got_edges = month_spans(day_number(start), day_number(end))
+    assert got_months == [day_number(d) for d in months]
+    assert got_edges == [(day_number(a), day_number(b)) for a, b in edges]
+
+
+def snapshot(statuses: dict[str, str]) -> pd.DataFrame:
+    return pd.DataFrame({"Site Name": list(statuses), "Status": list(statuses.values())})
+
+
+def test_site_availability_combines_closed_and_ongoing(tmp_path):
+    store = StatusHistoryStore(str(tmp_path / "history.sqlite3"))
+    store.record("tower", snapshot({"s1": "Online", "s2": "Online"}), "Site Name", "Status", now=MIDNIGHT)
+    store.record("tower", snapshot({"s1": "Offline", "s2": "Online"}), "Site Name", "Status",
+                 now=MIDNIGHT + 3600)
+    store.record("tower", snapshot({"s1": "Online", "s2": "Online"}), "Site Name", "Status",
+                 now=MIDNIGHT + 5400)
+
+    sla = site_availability(store, "tower", ("Offline",), DAY, DAY, now=MIDNIGHT + 7200)
+    assert sla.values.tolist() == [
+        ["s1", 5400.0, 1800.0, 7200.0, 75.0],
+        ["s2", 7200.0, 0.0, 7200.0, 100.0],
+    ]
+    # Hari sebelumnya belum teramati
+    assert site_availability(store, "tower", ("Offline",), DAY - 1, DAY - 1, now=MIDNIGHT + 7200).empty
+
+
+def test_backfill_rebuilds_buckets_once(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = StatusHistoryStore(path)
+    store.record("tower", snapshot({"s1": "Online"}), "Site Name", "Status", now=MIDNIGHT)
+    store.record("tower", snapshot({"s1": "Offline"}), "Site Name", "Status", now=MIDNIGHT + 3600)
+
+    # Database lama: transisi ada, bucket belum
+    with sqlite3.connect(path) as conn:
+        for table in ("daily_status", "daily_network", "monthly_status"):
+            conn.execute(f"DELETE FROM {table}")
+
+    for _ in range(2):  # dua proses yang membuka database yang sama
+        StatusHistoryStore(path)._conn()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT site, day, status, seconds FROM daily_status").fetchall() == [
+            ("s1", DAY, "Online", 3600.0)
+        ]
+        assert conn.execute("SELECT SUM(seconds) FROM monthly_status").fetchone() == (3600.0,)
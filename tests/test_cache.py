@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from mitratel.cache import FetchCache
+
+
+def test_fresh_entry_served_from_cache():
+    cache = FetchCache(ttl=60, max_entries=4)
+    first = cache.get_or_fetch("a", lambda: 1)
+    second = cache.get_or_fetch("a", lambda: 2)
+    assert (first.value, first.from_cache) == (1, False)
+    assert (second.value, second.from_cache) == (1, True)
+
+
+def test_expired_entries_are_evicted():
+    cache = FetchCache(ttl=0.05, max_entries=4)
+    cache.get_or_fetch("a", lambda: 1)
+    time.sleep(0.06)
+    cache.get_or_fetch("b", lambda: 2)
+    assert len(cache) == 1
+    assert cache.get_or_fetch("a", lambda: 3).value == 3
+
+
+def test_entry_count_is_capped_oldest_first():
+    cache = FetchCache(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_fetch(key, lambda key=key: key)
+    assert len(cache) == 2
+    assert cache.get_or_fetch("a", lambda: "baru").from_cache is False
+    assert cache.get_or_fetch("c", lambda: "baru").from_cache is True
+
+
+def test_concurrent_callers_share_one_fetch():
+    cache = FetchCache(ttl=60, max_entries=4)
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(1)
+        return "v"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(r.from_cache for r in results) == [False, True, True, True, True]
+
+
+def test_errors_are_not_cached():
+    cache = FetchCache(ttl=60, max_entries=4)
+
+    def boom():
+        raise RuntimeError("upstream mati")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("k", boom)
+    assert cache.get_or_fetch("k", lambda: 1).value == 1
@@ -0,0 +1,38 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from mitratel import collect
+from mitratel.history import StatusHistoryStore
+from mitratel.siss import siss_range
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = StatusHistoryStore(str(tmp_path / "history.sqlite3"))
+    monkeypatch.setattr(collect, "history_store", store)
+    return store
+
+
+def frame(status: str) -> pd.DataFrame:
+    return pd.DataFrame({"Site Name": ["s1"], "Status": [status]})
+
+
+def test_siss_history_only_records_the_poller_range(store):
+    canonical = collect.history_siss_range()
+    other = siss_range(date(2025, 1, 1), date(2025, 1, 2))[2]
+
+    collect.update_status_history("siss", frame("NORMAL"), range_str=canonical)
+    # Sesi lain dengan range berbeda: tidak boleh memunculkan transisi palsu
+    assert collect.update_status_history("siss", frame("CRITICAL"), range_str=other) == 0
+    assert collect.update_status_history("siss", frame("CRITICAL")) == 0
+    assert store.count_transitions("siss") == 0
+    assert store.open_intervals("siss")["status"].tolist() == ["NORMAL"]
+
+    assert collect.update_status_history("siss", frame("CRITICAL"), range_str=canonical) == 1
+
+
+def test_tower_history_has_no_range(store):
+    collect.update_status_history("tower", frame("Online"))
+    assert collect.update_status_history("tower", frame("Offline")) == 1
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from mitratel.compact import compact_frame
+from mitratel.delta import compute_delta, site_key_column
+
+
+def frame(rows: list[tuple[str, str]]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["Site Name", "Status"])
+
+
+def test_added_removed_and_changed_keys():
+    prev = frame([("s1", "NORMAL"), ("s2", "NORMAL"), ("s3", "CRITICAL")])
+    new = frame([("s1", "CRITICAL"), ("s3", "CRITICAL"), ("s4", "NORMAL")])
+    delta = compute_delta(prev, new, "Site Name")
+
+    assert delta.summary() == {"added": 1, "removed": 1, "changed": 1}
+    assert delta.added["Site Name"].tolist() == ["s4"]
+    assert delta.removed["Site Name"].tolist() == ["s2"]
+    assert delta.changed.values.tolist() == [["s1", "NORMAL", "CRITICAL"]]
+    assert delta.touched_rows(new)["Site Name"].tolist() == ["s1", "s4"]
+
+
+def test_identical_frames_give_empty_delta():
+    df = frame([("s1", "NORMAL"), ("s2", "CRITICAL")])
+    delta = compute_delta(df, df.copy(), "Site Name")
+    assert delta.is_empty
+    assert delta.touched_rows(df).empty
+
+
+def test_compact_and_plain_frames_compare_by_value():
+    # Snapshot lama (kolom kategori/Arrow) vs hasil fetch baru (object)
+    prev = compact_frame(frame([("s1", "NORMAL"), ("s2", "NORMAL")]))
+    new = frame([("s1", "NORMAL"), ("s2", "CRITICAL")])
+    delta = compute_delta(prev, new, "Site Name")
+    assert delta.summary() == {"added": 0, "removed": 0, "changed": 1}
+    assert delta.changed["Site Name"].tolist() == ["s2"]
+
+
+def test_duplicate_and_missing_keys_use_last_row():
+    prev = frame([("s1", "NORMAL"), ("s1", "CRITICAL"), (None, "NORMAL")])
+    new = frame([("s1", "CRITICAL")])
+    assert compute_delta(prev, new, "Site Name").is_empty
+
+
+def test_site_key_column_prefers_id():
+    df = pd.DataFrame(columns=["Site Name", "Site ID", "Status"])
+    assert site_key_column(df) == "Site ID"
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from mitratel.history import StatusHistoryStore
+
+
+def frame(statuses: dict[str, str]) -> pd.DataFrame:
+    return pd.DataFrame({"Site Name": list(statuses), "Status": list(statuses.values())})
+
+
+def current(store: StatusHistoryStore, source: str = "siss") -> dict[str, str]:
+    rows = store._conn().execute(
+        "SELECT site, status FROM site_state WHERE source = ?", (source,)
+    ).fetchall()
+    return dict(rows)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "history.sqlite3")
+
+
+def test_record_logs_transition_with_duration(db_path):
+    store = StatusHistoryStore(db_path)
+    assert store.record("siss", frame({"s1": "NORMAL", "s2": "NORMAL"}), "Site Name", "Status",
+                        now=100.0, version="v1") == 0
+    assert store.record("siss", frame({"s1": "CRITICAL", "s2": "NORMAL"}), "Site Name", "Status",
+                        now=160.0, version="v2") == 1
+    log = store.query_transitions("siss")
+    assert log[["site", "from_status", "to_status", "duration_s"]].values.tolist() == [
+        ["s1", "NORMAL", "CRITICAL", 60.0]
+    ]
+    assert current(store) == {"s1": "CRITICAL", "s2": "NORMAL"}
+
+
+def test_incremental_processes_only_touched_rows(db_path):
+    store = StatusHistoryStore(db_path)
+    store.record("siss", frame({"s1": "NORMAL", "s2": "NORMAL"}), "Site Name", "Status",
+                 now=100.0, version="v1")
+    new = frame({"s1": "CRITICAL", "s2": "NORMAL"})
+    touched = new[new["Site Name"] == "s1"]
+    assert store.record_incremental("siss", new, touched, "Site Name", "Status",
+                                    "v2", "v1", now=160.0) == 1
+    assert current(store) == {"s1": "CRITICAL", "s2": "NORMAL"}
+    # Tanpa baris berubah: tidak ada transisi, tapi versi tetap maju ke v3
+    assert store.record_incremental("siss", new, new.iloc[:0], "Site Name", "Status",
+                                    "v3", "v2", now=220.0) == 0
+    assert store._recorded_version(store._conn(), "siss") == "v3"
+
+
+def test_incremental_falls_back_when_base_is_stale(db_path):
+    store = StatusHistoryStore(db_path)
+    store.record("siss", frame({"s1": "NORMAL", "s2": "NORMAL"}), "Site Name", "Status",
+                 now=100.0, version="v1")
+    new = frame({"s1": "NORMAL", "s2": "CRITICAL"})
+    # Delta dihitung dari base lain: touched kosong, tapi s2 tetap harus tercatat
+    assert store.record_incremental("siss", new, new.iloc[:0], "Site Name", "Status",
+                                    "v3", "v0", now=160.0) == 1
+    assert current(store) == {"s1": "NORMAL", "s2": "CRITICAL"}
+
+
+def test_incremental_sees_versions_recorded_by_other_writers(db_path):
+    # Dua store = dua proses yang menulis database yang sama
+    a, b = StatusHistoryStore(db_path), StatusHistoryStore(db_path)
+    a.record("siss", frame({"s1": "NORMAL"}), "Site Name", "Status", now=100.0, version="v1")
+    b.record("siss", frame({"s1": "CRITICAL"}), "Site Name", "Status", now=160.0, version="v2")
+
+    # A masih mengira v1 yang terakhir: delta v1 -> v3 tidak menyentuh s1
+    v3 = frame({"s1": "NORMAL"})
+    a.record_incremental("siss", v3, v3.iloc[:0], "Site Name", "Status", "v3", "v1", now=220.0)
+
+    assert current(a) == {"s1": "NORMAL"}
+    log = a.query_transitions("siss")
+    assert log[["from_status", "to_status"]].values.tolist()[0] == ["CRITICAL", "NORMAL"]
@@ -0,0 +1,42 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from mitratel.map_layers import (
+    CLUSTER_LAYER_COLUMNS, CLUSTER_LEVELS, build_pin_frame, cluster_level, pins_in_cell,
+)
+
+
+def pins(n: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return build_pin_frame(pd.DataFrame({
+        "Site Name": [f"S{i}" for i in range(n)],
+        "Status": rng.choice(["NORMAL", "CRITICAL", "NOT INSTALLED"], n),
+        "longitude": rng.uniform(95, 141, n).astype("float32"),
+        "latitude": rng.uniform(-11, 6, n).astype("float32"),
+    }))
+
+
+def test_cluster_level_counts_every_pin_once():
+    p = pins()
+    for zoom in CLUSTER_LEVELS:
+        cells = cluster_level(p, zoom)
+        assert cells["total"].sum() == len(p)
+        assert cells["critical"].sum() == (p["Status"] == "CRITICAL").sum()
+        assert not cells.duplicated(["ix", "iy"]).any()
+
+
+def test_layer_payload_is_limited_to_layer_columns():
+    cells = cluster_level(pins(), 5)
+    records = json.loads(cells[CLUSTER_LAYER_COLUMNS].to_json(orient="records"))
+    assert {key for row in records for key in row} == set(CLUSTER_LAYER_COLUMNS)
+
+
+def test_drill_down_returns_the_cell_pins():
+    p = pins()
+    cells = cluster_level(p, 6)
+    for cell in cells.itertuples():
+        sub = pins_in_cell(p, CLUSTER_LEVELS[6], cell.ix, cell.iy)
+        assert len(sub) == cell.total
+        assert (sub["Status"] == "CRITICAL").sum() == cell.critical
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from mitratel import report_parser
+from mitratel.report_parser import TableNotFound, extract_report_table
+from mitratel.tower import parse_report_to_df
+
+# Sel berisi <span>/<b>, entitas, whitespace, sel kosong, dan tabel kedua yang
+# harus diabaikan; semuanya well-formed.
+REPORT_HTML = """<!DOCTYPE html>
+<html><head><title>Report</title></head><body>
+<div class="card">
+<table class="table">
+  <thead>
+    <tr><th>#</th><th>Site ID</th><th>Site <span>Name</span></th><th>Status</th><th>Last Update</th></tr>
+  </thead>
+  <tbody>
+    <tr><td>1</td><td>JKT-001</td><td><span class="nm">Menara &amp; Tower</span> A</td>
+        <td><span class="badge bg-danger"> CRITICAL </span></td><td>2026-10-01 08:00</td></tr>
+    <tr><td>2</td><td>JKT-002</td><td>  Site <b>B</b>  </td><td><span class="badge"></span></td><td></td></tr>
+    <tr><td>3</td><td></td><td>Site C</td><td>NORMAL</td><td>2026-10-01 08:05</td></tr>
+  </tbody>
+</table>
+<table><thead><tr><th>lain</th></tr></thead><tbody><tr><td>x</td></tr></tbody></table>
+</div></body></html>
+"""
+
+EXPECTED = pd.DataFrame(
+    [
+        ["JKT-001", "Menara & Tower A", "CRITICAL", "2026-10-01 08:00"],
+        ["JKT-002", "Site B", "", ""],
+        ["", "Site C", "NORMAL", "2026-10-01 08:05"],
+    ],
+    columns=["Site ID", "Site Name", "Status", "Last Update"],
+)
+
+
+@pytest.mark.parametrize("parser", ["bs4", "lxml", "stream"])
+def test_parsers_return_same_frame(parser):
+    pd.testing.assert_frame_equal(parse_report_to_df(REPORT_HTML, parser), EXPECTED)
+
+
+def test_stream_parser_across_small_chunks(monkeypatch):
+    monkeypatch.setattr(report_parser, "FEED_CHUNK_SIZE", 7)
+    pd.testing.assert_frame_equal(parse_report_to_df(REPORT_HTML, "stream"), EXPECTED)
+
+
+@pytest.mark.parametrize("parser", ["bs4", "lxml", "stream"])
+def test_missing_table_raises(parser):
+    with pytest.raises(TableNotFound):
+        extract_report_table("<html><body><p>login</p></body></html>", parser)
@@ -0,0 +1,127 @@
+import pytest
+import requests
+
+from mitratel import config, resilience, siss
+from mitratel.resilience import (
+    CLOSED, HALF_OPEN, OPEN, RETRY_STATUSES, CircuitBreaker, CircuitOpenError, retry_policy,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "time", clock)
+    return clock
+
+
+def fail():
+    raise ConnectionError("upstream down")
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker("siss", failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    state = breaker.state()
+    assert (state.state, state.failures, state.retry_at) == (OPEN, 2, 1060.0)
+
+    # Selama open: ditolak tanpa memanggil upstream
+    called = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: called.append(1))
+    assert not called
+
+    # Setelah reset_timeout: satu request percobaan (half-open) boleh lewat
+    clock.now += 60
+    seen = []
+    assert breaker.call(lambda: seen.append(breaker.state().state) or "ok") == "ok"
+    assert seen == [HALF_OPEN]
+    state = breaker.state()
+    assert (state.state, state.failures, state.last_error) == (CLOSED, 0, None)
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("tower", failure_threshold=1, reset_timeout=30)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state().state == OPEN
+    assert breaker.state().retry_at == clock.now + 30
+
+
+def test_only_one_trial_while_half_open(clock):
+    breaker = CircuitBreaker("tower", failure_threshold=1, reset_timeout=30)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    clock.now += 30
+
+    def trial():
+        # Request lain selama percobaan berjalan tetap ditolak
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+        return "ok"
+
+    assert breaker.call(trial) == "ok"
+
+
+def test_retry_policy_retries_idempotent_requests_with_jitter():
+    retry = retry_policy()
+    assert retry.total == config.HTTP_RETRIES
+    assert retry.allowed_methods == frozenset({"GET", "HEAD"})
+    assert set(retry.status_forcelist) == set(RETRY_STATUSES)
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("GET", 404)
+    assert retry.backoff_jitter == config.HTTP_BACKOFF_SECONDS
+    assert retry.raise_on_status is False
+
+
+class StreamedResponse:
+    def __init__(self, chunks, error=None):
+        self.chunks, self.error = chunks, error
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+        if self.error:
+            raise self.error
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def siss_breaker(monkeypatch):
+    breaker = CircuitBreaker("siss", failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(siss, "upstream_breaker", lambda name: breaker)
+    return breaker
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_malformed_json_does_not_trip_breaker(monkeypatch, siss_breaker, streaming):
+    monkeypatch.setattr(config, "SISS_STREAMING", streaming)
+    monkeypatch.setattr(siss, "siss_report_response",
+                        lambda *a, **k: StreamedResponse([b"<html>login</html>"]))
+    monkeypatch.setattr(siss, "fetch_siss_raw", lambda *a: "<html>login</html>")
+    with pytest.raises(RuntimeError):
+        siss.fetch_siss_df(None, None)
+    assert siss_breaker.state().state == CLOSED
+
+
+def test_broken_stream_counts_as_upstream_failure(monkeypatch, siss_breaker):
+    monkeypatch.setattr(config, "SISS_STREAMING", True)
+    body = StreamedResponse([b'{"responseDataValue": ['], requests.ConnectionError("reset"))
+    monkeypatch.setattr(siss, "siss_report_response", lambda *a, **k: body)
+    with pytest.raises(requests.ConnectionError):
+        siss.fetch_siss_df(None, None)
+    assert siss_breaker.state().state == OPEN
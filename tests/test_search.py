@@ -0,0 +1,44 @@
+import pandas as pd
+
+from mitratel.compact import compact_frame
+from mitratel.search import FacetQuery, dataset_index, search_columns, search_frame
+
+
+def tower() -> pd.DataFrame:
+    return compact_frame(pd.DataFrame({
+        "Site ID": ["ID0000001", "ID0000002", "ID0000003"],
+        "Site Name": ["SITE-00001", "SITE-00002", "BTS-SITE-00001X"],
+        "Region": ["JABAR", "JATIM", "JABAR"],
+        "Status": ["Online", "Offline", "Online"],
+    }))
+
+
+def test_tower_search_covers_name_and_id():
+    df = tower()
+    assert search_columns(df) == ["Site Name", "Site ID"]
+    assert dataset_index(df).search_cols == ["Site Name", "Site ID"]
+
+
+def test_name_lookup_prefix_first_then_substring():
+    df = tower()
+    hits = search_frame(df, FacetQuery(text="site-00001"))
+    assert hits["Site Name"].tolist() == ["SITE-00001", "BTS-SITE-00001X"]
+
+
+def test_id_lookup_without_duplicate_rows():
+    df = tower()
+    hits = search_frame(df, FacetQuery(text="id000000"))
+    assert hits["Site ID"].tolist() == ["ID0000001", "ID0000002", "ID0000003"]
+
+
+def test_text_combines_with_facets():
+    df = tower()
+    hits = search_frame(df, FacetQuery(status="Online", regions=("JABAR",), text="00001"))
+    assert hits["Site Name"].tolist() == ["SITE-00001", "BTS-SITE-00001X"]
+    assert search_frame(df, FacetQuery(status="Offline", text="00001")).empty
+
+
+def test_siss_searches_name_only():
+    df = pd.DataFrame({"Site Name": ["A1", "B2"], "Status": ["NORMAL", "CRITICAL"], "tenantId": [1, 2]})
+    assert search_columns(df) == ["Site Name"]
+    assert search_frame(df, FacetQuery(text="b")).index.tolist() == [1]
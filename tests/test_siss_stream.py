@@ -0,0 +1,75 @@
+import json
+
+import pandas as pd
+import pytest
+
+from mitratel.siss import SISS_SOURCE_COLUMNS, normalize_siss_df, parse_siss_to_df
+from mitratel.siss_stream import decode_siss_stream
+
+ITEMS = [
+    {"id": 1, "name": "SITE \"A\" – Jakarta", "region": "JABODETABEK", "status": "NORMAL",
+     "longitude": 106.8272, "latitude": -6.1754, "tenantId": 12, "extra": {"x": [1, 2]}},
+    {"id": 2, "name": "Site B, Médan", "region": "SUMBAGUT", "status": "NOT INSTALLED",
+     "longitude": 98.6722, "latitude": 3.5952, "tenantId": 7},
+    # Field hilang & nilai null: kolom diisi NaN seperti pd.DataFrame(list_of_dict)
+    {"id": 3, "name": "ᐊ site-003 \\ back", "status": "CRITICAL", "latitude": None, "tenantId": 1234567},
+    {"id": 4, "name": "SITE-D", "region": "JATIM", "status": "MAINTENANCE",
+     "longitude": 112.75, "latitude": -7.25, "tenantId": 3},
+]
+BODY = json.dumps(
+    {"responseCode": 200, "meta": {"note": "a \"responseDataValue\": [] decoy", "pages": [1, 2]},
+     "responseDataValue": ITEMS, "trailer": "ignored"},
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def stream_frame(chunks) -> pd.DataFrame:
+    columns, n = decode_siss_stream(chunks, keep=SISS_SOURCE_COLUMNS)
+    return normalize_siss_df(pd.DataFrame(columns, index=pd.RangeIndex(n)))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+def test_stream_matches_full_parse_at_any_chunk_size(size):
+    expected = parse_siss_to_df(BODY.decode("utf-8"))
+    pd.testing.assert_frame_equal(stream_frame(chunked(BODY, size)), expected)
+
+
+def test_chunks_split_inside_strings_and_multibyte_chars():
+    expected = parse_siss_to_df(BODY.decode("utf-8"))
+    # Potong tepat di tengah nama (termasuk di dalam karakter UTF-8 multi-byte)
+    cuts = sorted({BODY.index("Jakarta".encode()) + 2, BODY.index("é".encode()) + 1,
+                   BODY.index("ᐊ".encode()) + 1, BODY.index(b'\\\\') + 1})
+    parts = [BODY[a:b] for a, b in zip([0, *cuts], [*cuts, len(BODY)])]
+    pd.testing.assert_frame_equal(stream_frame(parts), expected)
+
+
+def same_error(body: bytes, size: int = 5) -> str:
+    with pytest.raises(RuntimeError) as full:
+        parse_siss_to_df(body.decode("utf-8"))
+    with pytest.raises(RuntimeError) as streamed:
+        stream_frame(chunked(body, size))
+    assert str(streamed.value) == str(full.value)
+    return str(full.value)
+
+
+def test_truncated_body_is_invalid_json():
+    assert same_error(BODY[: len(BODY) // 2]) == "Respon SISS bukan JSON valid."
+    assert same_error(BODY[:20]) == "Respon SISS bukan JSON valid."
+
+
+def test_html_login_page_is_invalid_json():
+    page = b"<!DOCTYPE html><html><body><form action='/Auth/login'></form></body></html>"
+    assert same_error(page) == "Respon SISS bukan JSON valid."
+    assert same_error(b"") == "Respon SISS bukan JSON valid."
+
+
+def test_missing_key_and_wrong_type():
+    assert same_error(b'{"responseCode": 401, "message": "unauthorized"}') == (
+        "Field 'responseDataValue' tidak ditemukan di JSON SISS."
+    )
+    assert same_error(b'[{"name": "x"}]') == "Field 'responseDataValue' tidak ditemukan di JSON SISS."
+    assert same_error(b'{"responseDataValue": {"name": "x"}}') == "'responseDataValue' bukan list."